@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Stress-test concurrent `zk new` processes appending to the daily note.
+
+Fires many `zk new TITLE --vim` processes in parallel against a fresh vault,
+checks that every link landed in the daily note exactly once and reports
+throughput.
+
+Usage:
+    python scripts/bench_append.py [--processes 200] [--concurrency 32]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def create(env: dict[str, str], title: str) -> int:
+    """Run one `zk new` process, returning its exit code."""
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "zettelkasten_cli.cli", "new", title, "--vim"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        return e.returncode
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as vault:
+        env = {**os.environ, "ZETTELKASTEN": vault, "PYTHONPATH": str(REPO)}
+        env.pop("ZETTELKASTEN_SOCKET", None)
+        titles = [f"Stress {i}" for i in range(args.processes)]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            codes = list(pool.map(lambda title: create(env, title), titles))
+        elapsed = time.perf_counter() - start
+
+        daily = (
+            Path(vault)
+            / "periodic-notes"
+            / "daily-notes"
+            / f"{datetime.now():%Y-%m-%d}.md"
+        )
+        counts = Counter(
+            line for line in daily.read_text().splitlines() if line.startswith("[[")
+        )
+
+    failed = sum(1 for code in codes if code != 0)
+    missing = [t for t in titles if counts[f"[[{t}]]"] == 0]
+    duplicated = [t for t in titles if counts[f"[[{t}]]"] > 1]
+
+    print(f"processes:   {args.processes} ({args.concurrency} at a time)")
+    print(f"elapsed:     {elapsed:.2f} s")
+    print(f"throughput:  {args.processes / elapsed:.1f} notes/s")
+    print(f"failed:      {failed}")
+    print(f"missing:     {len(missing)}")
+    print(f"duplicated:  {len(duplicated)}")
+
+    if failed or missing or duplicated:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
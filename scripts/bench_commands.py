@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Benchmark every CLI command on synthetic vaults of increasing size.
+
+For each vault size, generates a vault with `gen_vault.py` and runs each
+command as a fresh `zk` process several times, recording wall time, the
+child's peak RSS and (when strace is installed) its syscall counts. Results
+are printed as a table and can be written as JSON, and compared against an
+earlier JSON file to spot regressions between releases.
+
+Usage:
+    python scripts/bench_commands.py [--sizes 1000 10000 100000] [--runs 5]
+        [--json results.json] [--compare baseline.json] [--commands new day]
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from gen_vault import VaultSpec, generate
+
+REPO = Path(__file__).resolve().parent.parent
+
+# Command name -> arguments; {n} is replaced by a per-run counter. The index
+# is built once before timing, so `index` and the queries see a warm index.
+# Each `rename` run renames a different generated note, so keep runs times
+# commands below the vault size.
+COMMANDS = {
+    "rebuild": ["index", "--rebuild"],
+    "index": ["index"],
+    "new": ["new", "Bench note {n}", "--vim"],
+    "day": ["day"],
+    "week": ["week"],
+    "search": ["search", "kubernetes latency", "--vim"],
+    "find": ["find", "note 00042", "--vim"],
+    "links": ["links", "Note 000042", "--depth", "2", "--vim"],
+    "backlinks": ["backlinks", "Note 000042", "--vim"],
+    "stats": ["stats", "--json"],
+    "doctor": ["doctor", "--json"],
+    "tags": ["tags", "--json"],
+    "cal": ["cal", "--json"],
+    "inbox": ["inbox", "--vim"],
+    "export": ["export"],
+    "capture": ["capture", "Bench capture {n}"],
+    "rename": ["rename", "Note {n:06}", "Renamed {n}"],
+    "day-range": ["day", "--range", "2024-01-01..2024-12-31"],
+    "week-range": ["week", "--range", "2024-01-01..2024-12-31"],
+    "month-range": ["month", "--range", "2020-01..2029-12"],
+    "year-range": ["year", "--range", "2000..2099"],
+}
+
+# Commands that exit with status 1 when they find problems in the vault
+CHECKS = {"doctor"}
+
+# Slower than this ratio against the baseline counts as a regression
+REGRESSION = 1.2
+
+
+def run_once(
+    argv: list[str], env: dict[str, str], strace: str | None, check: bool = False
+) -> dict:
+    """
+    Run one `zk` process, returning its wall time, peak RSS and syscalls.
+
+    With `check`, an exit status of 1 (problems found) is not a failure.
+    """
+    cmd = [sys.executable, "-m", "zettelkasten_cli.cli", *argv]
+    with (
+        tempfile.NamedTemporaryFile("r", suffix=".strace") as trace,
+        tempfile.TemporaryFile("w+") as stderr,
+    ):
+        if strace:
+            cmd = [strace, "-f", "-c", "-o", trace.name, *cmd]
+
+        # wait4 rather than wait, to get the child's own resource usage
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL, stderr=stderr)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        if proc.returncode not in ((0, 1) if check else (0,)):
+            stderr.seek(0)
+            raise RuntimeError(f"{' '.join(argv)} failed: {stderr.read().strip()}")
+
+        return {
+            "wall_ms": round(wall * 1000, 2),
+            # ru_maxrss is in KiB on Linux and bytes on macOS
+            "max_rss_kb": usage.ru_maxrss // (1024 if sys.platform == "darwin" else 1),
+            "syscalls": _parse_strace(trace.read()) if strace else None,
+        }
+
+
+def _parse_strace(summary: str) -> dict[str, int]:
+    """Get per-syscall call counts from an `strace -c` summary."""
+    counts = {}
+    for line in summary.splitlines():
+        fields = line.split()
+        # % time, seconds, usecs/call, calls, [errors,] syscall
+        if len(fields) >= 5 and fields[3].isdigit():
+            counts[fields[-1]] = int(fields[3])
+    counts.pop("total", None)
+    return counts
+
+
+def bench_size(
+    size: int, commands: list[str], runs: int, strace: str | None
+) -> list[dict]:
+    """Benchmark the commands on one generated vault."""
+    results = []
+    counter = itertools.count()
+    with tempfile.TemporaryDirectory() as vault:
+        generate(Path(vault), VaultSpec(notes=size))
+        env = {
+            **os.environ,
+            "ZETTELKASTEN": vault,
+            "ZETTELKASTEN_EDITOR": "true",
+            "PYTHONPATH": str(REPO),
+        }
+        env.pop("ZETTELKASTEN_SOCKET", None)
+        run_once(["index"], env, None)
+
+        for name in commands:
+            samples = []
+            for _ in range(runs):
+                n = next(counter)
+                argv = [arg.format(n=n) for arg in COMMANDS[name]]
+                samples.append(run_once(argv, env, strace, name in CHECKS))
+
+            walls = [sample["wall_ms"] for sample in samples]
+            syscalls = samples[-1]["syscalls"]
+            result = {
+                "notes": size,
+                "command": name,
+                "runs": runs,
+                "wall_ms": {
+                    "min": min(walls),
+                    "median": statistics.median(walls),
+                    "max": max(walls),
+                },
+                "max_rss_kb": max(sample["max_rss_kb"] for sample in samples),
+                "syscalls": sum(syscalls.values()) if syscalls else None,
+                "top_syscalls": (
+                    dict(sorted(syscalls.items(), key=lambda kv: -kv[1])[:5])
+                    if syscalls
+                    else None
+                ),
+            }
+            results.append(result)
+            _print_row(result)
+    return results
+
+
+def _print_row(result: dict, baseline: dict | None = None) -> None:
+    wall = result["wall_ms"]
+    syscalls = result["syscalls"]
+    row = (
+        f"{result['notes']:>8}  {result['command']:<12} "
+        f"{wall['median']:>9.1f} {wall['min']:>9.1f} {wall['max']:>9.1f}  "
+        f"{result['max_rss_kb'] / 1024:>7.1f}  "
+        f"{syscalls if syscalls is not None else '-':>9}"
+    )
+    if baseline is not None:
+        ratio = wall["median"] / baseline["wall_ms"]["median"]
+        flag = "  REGRESSION" if ratio > REGRESSION else ""
+        row += f"  {ratio:>5.2f}x{flag}"
+    print(row, file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS)
+    )
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare with")
+    parser.add_argument("--no-strace", action="store_true", help="Skip syscall counts")
+    args = parser.parse_args()
+
+    strace = None if args.no_strace else shutil.which("strace")
+    if strace is None and not args.no_strace:
+        print("strace not found; syscall counts are skipped", file=sys.stderr)
+
+    print(
+        f"{'notes':>8}  {'command':<12} {'median ms':>9} {'min ms':>9} "
+        f"{'max ms':>9}  {'RSS MiB':>7}  {'syscalls':>9}",
+        file=sys.stderr,
+    )
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args.commands, args.runs, strace))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": _git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.compare:
+        baseline = {
+            (r["notes"], r["command"]): r
+            for r in json.loads(args.compare.read_text())["results"]
+        }
+        print(f"\nCompared with {args.compare}:", file=sys.stderr)
+        regressions = 0
+        for result in results:
+            old = baseline.get((result["notes"], result["command"]))
+            if old is None:
+                continue
+            _print_row(result, old)
+            regressions += result["wall_ms"]["median"] > (
+                old["wall_ms"]["median"] * REGRESSION
+            )
+        if regressions:
+            sys.exit(1)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    main()
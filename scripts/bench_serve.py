@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Compare `zk new --vim` latency in-process vs. through a `zk serve` daemon.
+
+Each request is a full `zk` process, as spawned by an editor integration.
+
+Usage:
+    python scripts/bench_serve.py [--requests 50]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def run_requests(env: dict[str, str], count: int, prefix: str) -> list[float]:
+    """Spawn `zk new TITLE --vim` count times, returning latencies in ms."""
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "zettelkasten_cli.cli",
+                "new",
+                f"{prefix} {i}",
+                "--vim",
+            ],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def wait_for(path: Path, timeout: float = 10.0) -> None:
+    """Wait until the daemon's socket appears."""
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"daemon did not create {path}")
+        time.sleep(0.05)
+
+
+def summarize(name: str, latencies: list[float]) -> None:
+    """Print latency statistics."""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{name:<12} mean {statistics.mean(ordered):7.1f} ms  "
+        f"median {statistics.median(ordered):7.1f} ms  p95 {p95:7.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as vault:
+        sock = Path(vault) / ".zk.sock"
+        env = {
+            **os.environ,
+            "ZETTELKASTEN": vault,
+            "ZETTELKASTEN_SOCKET": str(sock),
+            "PYTHONPATH": str(REPO),
+        }
+
+        in_process = run_requests(env, args.requests, "In process")
+
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "zettelkasten_cli.cli", "serve"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_for(sock)
+            served = run_requests(env, args.requests, "Served")
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    summarize("in-process", in_process)
+    summarize("daemon", served)
+
+
+if __name__ == "__main__":
+    main()
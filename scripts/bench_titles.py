@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Show that the vault-wide duplicate-title check stays O(1) as the vault grows.
+
+For each vault size, builds a synthetic vault and its index, then times the
+indexed title lookup used by `Note.create` against a naive `rglob` scan.
+
+Usage:
+    python scripts/bench_titles.py [--sizes 1000 10000 100000] [--lookups 1000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from zettelkasten_cli.config import Config, EditorConfig, PathConfig
+from zettelkasten_cli.models.note import Note, _check_vault_titles
+from zettelkasten_cli.services.index import open_index
+
+
+def build_vault(root: Path, size: int) -> list[str]:
+    """Create size empty notes spread over 100 folders, returning their titles."""
+    titles = [f"Note {i}" for i in range(size)]
+    for i, title in enumerate(titles):
+        folder = root / f"folder {i % 100}"
+        folder.mkdir(exist_ok=True)
+        (folder / f"{title}.md").touch()
+    return titles
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'notes':>8}  {'indexed check':>14}  {'rglob check':>12}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as vault:
+            root = Path(vault)
+            titles = build_vault(root, size)
+            config = Config(paths=PathConfig(root=root), editor=EditorConfig())
+
+            with open_index(config) as vault_index:
+                vault_index.refresh()
+                notes = [
+                    Note(title=f"New {random.choice(titles)}", config=config)
+                    for _ in range(args.lookups)
+                ]
+                start = time.perf_counter()
+                for note in notes:
+                    _check_vault_titles([note], vault_index)
+                indexed = (time.perf_counter() - start) / args.lookups
+
+            start = time.perf_counter()
+            any(root.rglob(f"{notes[0].title}.md"))
+            naive = time.perf_counter() - start
+
+        print(f"{size:>8}  {indexed * 1e6:>11.1f} us  {naive * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Generate a reproducible synthetic vault for benchmarks.
+
+Notes are spread over PARA-style folders with a configurable number of
+wikilinks each (some pointing at missing notes), plus a history of daily
+and weekly notes ending today. The same arguments and seed always produce
+the same vault (apart from the dates of the periodic notes).
+
+Usage:
+    python scripts/gen_vault.py DIR [--notes 10000] [--links 5] [--days 365]
+        [--weeks 52] [--daily-lines 20] [--seed 0]
+"""
+
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+FOLDERS = ("0 Inbox", "1 Projects", "2 Areas", "3 Resources", "4 Archive")
+FOLDER_WEIGHTS = (2, 2, 5, 1)
+DAILY_DIR = "periodic-notes/daily-notes"
+WEEKLY_DIR = "periodic-notes/weekly-notes"
+
+WORDS = [
+    "kubernetes",
+    "operator",
+    "cluster",
+    "network",
+    "storage",
+    "latency",
+    "cache",
+    "index",
+    "search",
+    "graph",
+    "link",
+    "note",
+    "daily",
+    "review",
+    "project",
+    "area",
+    "resource",
+    "archive",
+    "inbox",
+    "idea",
+    "question",
+    "answer",
+    "draft",
+    "summary",
+    "reference",
+    "quote",
+    "book",
+    "article",
+    "paper",
+    "talk",
+    "python",
+    "rust",
+    "linux",
+    "shell",
+    "editor",
+    "terminal",
+    "vim",
+    "neovim",
+    "git",
+    "commit",
+    "branch",
+]
+
+TEMPLATES = {
+    "zk/note.md": "# {{title}}\n\nCreated {{date}}\n\n",
+    "zk/daily.md": "# {{date}}\n\n[[{{yesterday}}]] | [[{{tomorrow}}]]\n\n",
+    "zk/weekly.md": "# {{week}}\n\n",
+}
+
+
+@dataclass(frozen=True)
+class VaultSpec:
+    """Shape of a synthetic vault."""
+
+    notes: int = 10_000
+    links: int = 5
+    days: int = 365
+    weeks: int = 52
+    daily_lines: int = 20
+    paragraphs: int = 3
+    seed: int = 0
+
+
+def _title(i: int) -> str:
+    return f"Note {i:06}"
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(20, 60))) + ".\n\n"
+
+
+def generate(root: Path, spec: VaultSpec) -> dict[str, int]:
+    """
+    Write a synthetic vault below root.
+
+    Returns:
+        Counts of the files written, by kind.
+    """
+    rng = random.Random(spec.seed)
+    root.mkdir(parents=True, exist_ok=True)
+    for folder in FOLDERS:
+        (root / folder).mkdir(exist_ok=True)
+    (root / ".obsidian").mkdir(exist_ok=True)
+    (root / ".obsidian" / "workspace.json").write_text("{}")
+    for rel, text in TEMPLATES.items():
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text(text)
+
+    made: set[Path] = set()
+    for i in range(spec.notes):
+        # A flat inbox with every tenth note; the rest in sub-folders of 1000
+        if i % 10 == 0:
+            path = root / FOLDERS[0] / f"{_title(i)}.md"
+        else:
+            folder = rng.choices(FOLDERS[1:], weights=FOLDER_WEIGHTS)[0]
+            path = root / folder / f"{i // 1000:03}" / f"{_title(i)}.md"
+            if path.parent not in made:
+                path.parent.mkdir(exist_ok=True)
+                made.add(path.parent)
+
+        lines = [f"# {_title(i)}\n\n"]
+        lines.extend(_paragraph(rng) for _ in range(spec.paragraphs))
+        for _ in range(spec.links):
+            # One link in twenty points at a note that does not exist
+            target = rng.randrange(spec.notes + spec.notes // 20)
+            lines.append(f"- [[{_title(target)}]]\n")
+        path.write_text("".join(lines))
+
+    today = date.today()
+    daily = root / DAILY_DIR
+    daily.mkdir(parents=True, exist_ok=True)
+    for n in range(spec.days):
+        day = today - timedelta(days=n)
+        lines = [f"# {day:%Y-%m-%d}\n\n"]
+        lines.extend(
+            f"- {_paragraph(rng).strip()} [[{_title(rng.randrange(spec.notes))}]]\n"
+            for _ in range(spec.daily_lines)
+        )
+        (daily / f"{day:%Y-%m-%d}.md").write_text("".join(lines))
+
+    weekly = root / WEEKLY_DIR
+    weekly.mkdir(parents=True, exist_ok=True)
+    monday = today - timedelta(days=today.weekday())
+    for n in range(spec.weeks):
+        week = monday - timedelta(weeks=n)
+        text = f"# {week:%Y-W%V}\n\n" + _paragraph(rng)
+        (weekly / f"{week:%Y-W%V}.md").write_text(text)
+
+    return {"notes": spec.notes, "daily": spec.days, "weekly": spec.weeks}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("root", type=Path)
+    defaults = VaultSpec()
+    parser.add_argument("--notes", type=int, default=defaults.notes)
+    parser.add_argument("--links", type=int, default=defaults.links)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--weeks", type=int, default=defaults.weeks)
+    parser.add_argument("--daily-lines", type=int, default=defaults.daily_lines)
+    parser.add_argument("--paragraphs", type=int, default=defaults.paragraphs)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    args = parser.parse_args()
+
+    spec = VaultSpec(
+        notes=args.notes,
+        links=args.links,
+        days=args.days,
+        weeks=args.weeks,
+        daily_lines=args.daily_lines,
+        paragraphs=args.paragraphs,
+        seed=args.seed,
+    )
+    counts = generate(args.root, spec)
+    print(", ".join(f"{count} {kind}" for kind, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 """Tests for zettelkasten-cli."""
 
 import os
+import shutil
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import patch
 
@@ -19,6 +22,27 @@ from zettelkasten_cli.main import app
 runner = CliRunner()
 
 
+@pytest.fixture
+def vault(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """An empty vault in tmp_path, as (root, config); CLI commands use it too."""
+    import zettelkasten_cli.config as config_module
+    from zettelkasten_cli.config import Config, EditorConfig, PathConfig
+
+    monkeypatch.setenv("ZETTELKASTEN", str(tmp_path))
+    monkeypatch.setattr(config_module, "_config", None)
+    return tmp_path, Config(paths=PathConfig(root=tmp_path), editor=EditorConfig())
+
+
+@pytest.fixture
+def vault_index(vault):
+    """The index of the `vault` fixture, opened but not yet refreshed."""
+    from zettelkasten_cli.services.index import open_index
+
+    _, config = vault
+    with open_index(config) as index:
+        yield index
+
+
 class TestVersion:
     """Test version."""
 
@@ -211,3 +235,2091 @@ class TestPeriodicNote:
             note.create()
             assert note.exists()
             assert note.note_path.read_text().startswith("#")
+
+
+class TestPeriodicRanges:
+    """Test monthly, quarterly and yearly notes and range creation."""
+
+    def test_note_names(self, vault):
+        """Each period should name its note after the period containing the day."""
+        from datetime import date
+
+        from zettelkasten_cli.models.periodic_note import Period, PeriodicNote
+
+        root, config = vault
+
+        def name(period, day):
+            note = PeriodicNote(period=period, config=config, day=day)
+            return note.get_current_date_str()
+
+        # The ISO week of 2024-12-30 belongs to 2025
+        assert name(Period.WEEKLY, date(2024, 12, 30)) == "2025-W01"
+        assert name(Period.MONTHLY, date(2026, 2, 14)) == "2026-02"
+        assert name(Period.QUARTERLY, date(2026, 8, 1)) == "2026-Q3"
+        assert name(Period.YEARLY, date(2026, 8, 1)) == "2026"
+        note = PeriodicNote(Period.QUARTERLY, config, day=date(2026, 11, 30))
+        assert note.get_offset_date_str(1) == "2027-Q1"
+        assert note.note_path == (
+            root / "periodic-notes" / "quarterly-notes" / "2026-Q4.md"
+        )
+
+    def test_parse_range(self):
+        """Ranges should accept ISO dates or note names and reject bad input."""
+        from datetime import date
+
+        from zettelkasten_cli.exceptions import PeriodError
+        from zettelkasten_cli.models.periodic_note import Period, parse_range
+
+        assert parse_range(Period.DAILY, "2026-01-01..2026-01-31") == (
+            date(2026, 1, 1),
+            date(2026, 1, 31),
+        )
+        assert parse_range(Period.WEEKLY, "2026-W01..2026-W02") == (
+            date(2025, 12, 29),
+            date(2026, 1, 5),
+        )
+        assert parse_range(Period.QUARTERLY, "2026-Q2..2026-Q3")[1] == date(2026, 7, 1)
+        for text in ("2026-01-01", "2026-02-01..2026-01-01", "2026-13-01..2026"):
+            with pytest.raises(PeriodError):
+                parse_range(Period.DAILY, text)
+
+        # Notes at the edge of the calendar have no neighbour to link to
+        for period, text in [
+            (Period.YEARLY, "9999..9999"),
+            (Period.MONTHLY, "9999-11..9999-12"),
+            (Period.DAILY, "0001-01-01..0001-01-02"),
+        ]:
+            with pytest.raises(PeriodError, match="no previous or next"):
+                parse_range(period, text)
+
+    def test_create_range_skips_existing(self, vault):
+        """Only missing notes should be created, from the template."""
+        from datetime import date
+
+        from zettelkasten_cli.models.periodic_note import Period, create_range
+
+        root, config = vault
+        monthly = root / "periodic-notes" / "monthly-notes"
+        monthly.mkdir(parents=True)
+        (monthly / "2026-02.md").write_text("keep me")
+        (root / "zk").mkdir()
+        (root / "zk" / "monthly.md").write_text("# {{date}}\n")
+
+        created, existing = create_range(
+            Period.MONTHLY, date(2026, 1, 15), date(2026, 4, 1), config
+        )
+
+        assert [path.name for path in created] == [
+            "2026-01.md",
+            "2026-03.md",
+            "2026-04.md",
+        ]
+        assert existing == 1
+        assert (monthly / "2026-02.md").read_text() == "keep me"
+        assert (monthly / "2026-03.md").read_text() == "# 2026-03\n"
+
+    def test_range_command(self, vault):
+        """`zk day --range` should create the notes and report the counts."""
+        root, _ = vault
+        with patch("zettelkasten_cli.output.is_interactive", return_value=True):
+            result = runner.invoke(app, ["day", "--range", "2026-02-27..2026-03-02"])
+            again = runner.invoke(app, ["day", "--range", "2026-02-27..2026-03-03"])
+        bad = runner.invoke(app, ["year", "--range", "2026"])
+
+        assert result.exit_code == 0
+        assert "Created 4 daily notes (0 already existed)" in result.output
+        assert "Created 1 daily notes (4 already existed)" in again.output
+        assert bad.exit_code == 1
+        daily_dir = root / "periodic-notes" / "daily-notes"
+        assert (daily_dir / "2026-02-28.md").exists()
+        assert not (daily_dir / "2026-02-29.md").exists()
+
+
+class TestVaultIndex:
+    """Test the persistent vault index."""
+
+    def test_refresh_indexes_notes_and_links(self, vault):
+        """Refresh should record notes and their outgoing wikilinks."""
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        (root / "3 Resources").mkdir()
+        (root / "3 Resources" / "Kubernetes.md").write_text(
+            "# Kubernetes\n\nSee [[Docker|containers]] and [[Helm#Charts]].\n"
+        )
+        (root / ".obsidian").mkdir()
+        (root / ".obsidian" / "ignored.md").write_text("[[Nope]]")
+
+        with open_index(config) as vault_index:
+            stats = vault_index.refresh()
+            note = vault_index.get(root / "3 Resources" / "Kubernetes.md")
+
+            assert stats.total == 1
+            assert stats.added == 1
+            assert note is not None
+            assert note.title == "Kubernetes"
+            assert vault_index.links_from(note.path) == ["Docker", "Helm"]
+            assert (root / ".zk" / "index.db").exists()
+
+    def test_refresh_is_incremental(self, vault):
+        """Unchanged notes should not be re-read; edits and deletes are picked up."""
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        (root / "a.md").write_text("[[b]]")
+        (root / "b.md").write_text("")
+
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+
+        with open_index(config) as vault_index:
+            assert len(vault_index) == 2
+            assert not vault_index.refresh().changed
+
+            (root / "a.md").write_text("[[c]] and more")
+            (root / "b.md").unlink()
+            stats = vault_index.refresh()
+
+            assert (stats.updated, stats.removed) == (1, 1)
+            assert vault_index.links_from(root / "a.md") == ["c"]
+            assert not vault_index.contains(root / "b.md")
+
+    def test_index_command(self, vault):
+        """The index command should build the index."""
+        root, _ = vault
+        (root / "a.md").write_text("# a\n")
+
+        result = runner.invoke(app, ["index"])
+
+        assert result.exit_code == 0
+        assert (root / ".zk" / "index.db").exists()
+
+
+class TestSearch:
+    """Test full-text search."""
+
+    def test_ranks_title_matches_first(self, vault, vault_index):
+        """Title matches should outrank body matches."""
+        root, _ = vault
+        (root / "Kubernetes.md").write_text("# Kubernetes\n\nOrchestration.\n")
+        (root / "Docker.md").write_text("# Docker\n\nRuns under kubernetes.\n")
+
+        vault_index.refresh()
+        results = vault_index.search("kubernetes")
+
+        assert [r.note.title for r in results] == ["Kubernetes", "Docker"]
+
+    def test_phrase_and_prefix_queries(self, vault, vault_index):
+        """Quoted phrases must match in order; trailing * matches prefixes."""
+        root, _ = vault
+        (root / "a.md").write_text("container orchestration platform")
+        (root / "b.md").write_text("orchestration of a container")
+
+        vault_index.refresh()
+
+        phrase = vault_index.search('"container orchestration"')
+        prefix = vault_index.search("orchestr*")
+
+        assert [r.note.title for r in phrase] == ["a"]
+        assert {r.note.title for r in prefix} == {"a", "b"}
+
+    def test_search_sees_changes(self, vault, vault_index):
+        """Edited and deleted notes should be reflected after a refresh."""
+        root, _ = vault
+        (root / "a.md").write_text("alpha")
+        (root / "b.md").write_text("alpha")
+
+        vault_index.refresh()
+        (root / "a.md").write_text("beta")
+        (root / "b.md").unlink()
+        vault_index.refresh()
+
+        assert vault_index.search("alpha") == []
+        assert [r.note.title for r in vault_index.search("beta")] == ["a"]
+
+    def test_operators_are_matched_literally(self, vault, vault_index):
+        """FTS5 syntax in the query should not raise."""
+        root, _ = vault
+        (root / "a.md").write_text("NOT AND OR")
+
+        vault_index.refresh()
+
+        assert len(vault_index.search('NOT "unbalanced ( *')) == 0
+        assert len(vault_index.search("NOT")) == 1
+
+    def test_search_command_vim_output(self, vault):
+        """Vim mode should print one path per line."""
+        root, _ = vault
+        (root / "Kubernetes.md").write_text("# Kubernetes\n")
+
+        result = runner.invoke(app, ["search", "kube*", "--vim"])
+
+        assert result.exit_code == 0
+        assert result.stdout.strip() == str(root / "Kubernetes.md")
+
+
+class TestLinkGraph:
+    """Test the link graph."""
+
+    def test_wikilink_parsing(self):
+        """Aliases, headings and embeds should resolve to the note name."""
+        from zettelkasten_cli.services.markdown import extract_wikilinks
+
+        text = "[[a|alias]] [[b#Heading]] ![[c]] [[a]] [[#local]]"
+        assert extract_wikilinks(text) == ["a", "b", "c"]
+
+    def test_links_and_backlinks(self, vault, vault_index):
+        """Links should resolve case-insensitively in both directions."""
+        root, _ = vault
+        (root / "daily.md").write_text("[[kubernetes|k8s]] [[Missing]]")
+        (root / "other.md").write_text("[[missing]]")
+        (root / "Kubernetes.md").write_text("[[Docker#Images]]")
+        (root / "Docker.md").write_text("")
+
+        from zettelkasten_cli.services.graph import Direction, neighbourhood
+
+        vault_index.refresh()
+
+        outgoing = neighbourhood(vault_index, "daily")
+        assert [(n.title, n.exists) for n in outgoing] == [
+            ("Kubernetes", True),
+            ("Missing", False),
+        ]
+        assert [n.title for n in vault_index.backlinks("KUBERNETES")] == ["daily"]
+
+        incoming = neighbourhood(
+            vault_index, "Docker", depth=2, direction=Direction.INCOMING
+        )
+        assert [(n.title, n.distance) for n in incoming] == [
+            ("Kubernetes", 1),
+            ("daily", 2),
+        ]
+
+        result = runner.invoke(app, ["links", "daily"])
+        assert "Missing (missing)" in result.output
+
+    def test_links_update_incrementally(self, vault, vault_index):
+        """Removing a link should drop the backlink after a refresh."""
+        root, _ = vault
+        (root / "a.md").write_text("[[b]]")
+
+        vault_index.refresh()
+        assert len(vault_index.backlinks("b")) == 1
+
+        (root / "a.md").write_text("no links")
+        vault_index.refresh()
+        assert vault_index.backlinks("b") == []
+
+    def test_backlinks_command_vim_output(self, vault):
+        """Vim mode should print the paths of linking notes."""
+        root, _ = vault
+        (root / "a.md").write_text("[[b]]")
+
+        result = runner.invoke(app, ["backlinks", "b", "--vim"])
+
+        assert result.exit_code == 0
+        assert result.stdout.strip() == str(root / "a.md")
+
+
+class TestStartup:
+    """Test the startup-optimized `zk new --vim` path."""
+
+    # Budget for importing everything the fast path needs, in microseconds.
+    # Leaves headroom for slow CI runners; pulling in typer alone exceeds it.
+    IMPORT_BUDGET_US = 100_000
+
+    def _run_fast_path(self, root: Path, title: str) -> tuple[str, dict[str, int]]:
+        """Run `zk new TITLE --vim` with -X importtime, returning stdout and timings."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "from zettelkasten_cli.cli import main; main()",
+                "new",
+                title,
+                "--vim",
+            ],
+            capture_output=True,
+            text=True,
+            env={
+                **os.environ,
+                "ZETTELKASTEN": str(root),
+                "PYTHONPATH": str(Path(__file__).parent.parent),
+            },
+            check=True,
+        )
+
+        # "import time: self [us] | cumulative | <indent>name"
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            _, total, name = line.split("|")
+            if not name.startswith("  "):
+                cumulative[name.strip()] = int(total)
+        return result.stdout, cumulative
+
+    def test_fast_path_args(self):
+        """Only exactly `new TITLE --vim` should take the fast path."""
+        from zettelkasten_cli.cli import _fast_new_title
+
+        assert _fast_new_title(["new", "Title", "--vim"]) == "Title"
+        assert _fast_new_title(["new", "--vim", "Title"]) == "Title"
+        assert _fast_new_title(["new", "Title"]) is None
+        assert _fast_new_title(["new", "--vim", "--help"]) is None
+        assert _fast_new_title(["day"]) is None
+
+    def test_vim_path_skips_heavy_imports(self, tmp_path: Path):
+        """The fast path should create the note without importing typer or rich."""
+        stdout, cumulative = self._run_fast_path(tmp_path, "Fast")
+
+        assert stdout.strip() == str(tmp_path / "0 Inbox" / "Fast.md")
+        for module in ("typer", "rich", "sqlite3"):
+            assert not any(
+                name == module or name.startswith(f"{module}.") for name in cumulative
+            ), f"{module} imported on the fast path"
+
+    def test_vim_path_import_budget(self, tmp_path: Path):
+        """Importing the fast path should stay within the time budget."""
+        # Best of three runs to smooth out noise from a busy machine
+        totals = []
+        for i in range(3):
+            _, cumulative = self._run_fast_path(tmp_path, f"Budget {i}")
+            totals.append(
+                sum(
+                    total
+                    for name, total in cumulative.items()
+                    if name.startswith("zettelkasten_cli")
+                )
+            )
+
+        assert min(totals) < self.IMPORT_BUDGET_US, f"import times: {totals}"
+
+
+class TestDaemon:
+    """Test the `zk serve` daemon and its client."""
+
+    def _serve(self, config, sock: Path):
+        """Start a daemon for a vault in a background thread."""
+        import threading
+
+        from zettelkasten_cli.services.daemon import DaemonServer
+
+        server = DaemonServer(config, sock)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def test_forwards_new_note(self, vault):
+        """The daemon should create notes for matching vaults only."""
+        from zettelkasten_cli.services.daemon_client import request
+
+        root, config = vault
+        sock = root / "zk.sock"
+        server = self._serve(config, sock)
+        try:
+            response = request(
+                {"command": "new", "title": "Served", "root": str(root)}, sock
+            )
+            other = request(
+                {"command": "new", "title": "Served", "root": "/elsewhere"}, sock
+            )
+            duplicate = request(
+                {"command": "new", "title": "Served", "root": str(root)}, sock
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert response == {
+            "ok": True,
+            "path": str(root / "0 Inbox" / "Served.md"),
+            "created": True,
+        }
+        assert other is None
+        assert duplicate["ok"] is False
+        assert duplicate["code"] == 1
+        assert not sock.exists()
+
+    def test_client_falls_back_without_daemon(self, vault):
+        """The entry point should run in-process when no daemon listens."""
+        from zettelkasten_cli.cli import _run_via_daemon
+
+        root, _ = vault
+        env = {"ZETTELKASTEN_SOCKET": str(root / "missing.sock")}
+        with patch.dict(os.environ, env):
+            assert _run_via_daemon(["new", "Title", "--vim"]) is None
+
+    def test_client_prints_daemon_path(self, vault, capsys):
+        """In vim mode the client should print the path the daemon returned."""
+        from zettelkasten_cli.cli import _run_via_daemon
+
+        root, config = vault
+        sock = root / "zk.sock"
+        server = self._serve(config, sock)
+        env = {"ZETTELKASTEN_SOCKET": str(sock)}
+        try:
+            with patch.dict(os.environ, env):
+                code = _run_via_daemon(["new", "--vim", "Via daemon"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert code == 0
+        assert capsys.readouterr().out.strip() == str(
+            root / "0 Inbox" / "Via daemon.md"
+        )
+
+    def test_client_falls_back_on_other_settings(self, vault):
+        """A client with other vault settings should run the command itself."""
+        from zettelkasten_cli.cli import _run_via_daemon
+
+        root, config = vault
+        sock = root / "zk.sock"
+        server = self._serve(config, sock)
+        env = {
+            "ZETTELKASTEN_SOCKET": str(sock),
+            "ZETTELKASTEN_INBOX_DIR": "Elsewhere",
+        }
+        try:
+            with patch.dict(os.environ, env):
+                code = _run_via_daemon(["new", "--vim", "Via daemon"])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert code is None
+        assert not (root / "0 Inbox").exists()
+
+    def _fake_daemon(self, sock: Path, reply: bytes | None):
+        """Accept one request on sock and answer with reply (None: hang up)."""
+        import socket
+        import threading
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(sock))
+        listener.listen(1)
+
+        def answer() -> None:
+            conn, _ = listener.accept()
+            with conn:
+                conn.recv(4096)
+                if reply is not None:
+                    conn.sendall(reply)
+            listener.close()
+
+        threading.Thread(target=answer, daemon=True).start()
+
+    @pytest.mark.parametrize("reply", [b"garbage\n", b"[1]\n", None])
+    def test_bad_answer_is_an_error(self, tmp_path: Path, reply: bytes | None):
+        """Once the request is sent, a bad answer must not cause a rerun."""
+        from zettelkasten_cli.exceptions import DaemonError
+        from zettelkasten_cli.services.daemon_client import request
+
+        sock = tmp_path / "zk.sock"
+        self._fake_daemon(sock, reply)
+
+        with pytest.raises(DaemonError):
+            request({"command": "day", "root": str(tmp_path)}, sock)
+
+    def test_timeout_after_sending_is_an_error(self, tmp_path: Path):
+        """A daemon that takes the request but never answers is an error."""
+        import socket
+
+        from zettelkasten_cli.exceptions import DaemonError
+        from zettelkasten_cli.services import daemon_client
+
+        sock = tmp_path / "zk.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(sock))
+            listener.listen(1)
+            with (
+                patch.object(daemon_client, "CLIENT_TIMEOUT", 0.1),
+                pytest.raises(DaemonError),
+            ):
+                daemon_client.request({"command": "day"}, sock)
+
+        # A socket file nobody listens on is left over from a dead daemon
+        assert daemon_client.request({"command": "day"}, sock) is None
+
+
+def _create_notes_in_child(root: str, titles: list[str], heading: str = "") -> int:
+    """Create notes in a child process, returning how many succeeded."""
+    from zettelkasten_cli.config import Config, EditorConfig, PathConfig
+    from zettelkasten_cli.models.note import Note
+
+    config = Config(
+        paths=PathConfig(root=Path(root), daily_heading=heading),
+        editor=EditorConfig(),
+    )
+    created = 0
+    for title in titles:
+        try:
+            Note(title=title, config=config).create()
+            created += 1
+        except NoteExistsError:
+            pass
+    return created
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires fcntl and fork")
+class TestConcurrentWrites:
+    """Test concurrency- and crash-safety of note writes."""
+
+    def _run_parallel(
+        self, root: Path, batches: list[list[str]], heading: str = ""
+    ) -> int:
+        """Create batches of notes in parallel processes."""
+        import multiprocessing
+
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(len(batches)) as pool:
+            results = pool.starmap(
+                _create_notes_in_child,
+                [(str(root), batch, heading) for batch in batches],
+            )
+        return sum(results)
+
+    def _daily_links(self, config) -> list[str]:
+        """Get all link lines in today's daily note."""
+        from zettelkasten_cli.models.periodic_note import daily
+
+        text = daily(config).note_path.read_text()
+        return [line for line in text.splitlines() if line.startswith("[[")]
+
+    def test_parallel_creators_link_every_note_once(self, vault):
+        """Every note created in parallel should be linked exactly once."""
+        root, config = vault
+        batches = [[f"Note {p}-{i}" for i in range(25)] for p in range(8)]
+
+        assert self._run_parallel(root, batches) == 200
+
+        links = self._daily_links(config)
+        expected = {f"[[{title}]]" for batch in batches for title in batch}
+        assert sorted(links) == sorted(expected)
+
+    def test_parallel_inserts_under_heading(self, vault):
+        """Links spliced into a section in parallel should all land there."""
+        from zettelkasten_cli.models.periodic_note import daily
+
+        root, config = vault
+        note = daily(config).note_path
+        note.parent.mkdir(parents=True)
+        note.write_text("# Day\n\n## Notes\n\n## Tasks\n- [ ] task\n")
+        batches = [[f"Note {p}-{i}" for i in range(10)] for p in range(4)]
+
+        assert self._run_parallel(root, batches, heading="## Notes") == 40
+
+        head, notes, tasks = note.read_text().split("\n## ")
+        assert (head, tasks) == ("# Day\n", "Tasks\n- [ ] task\n")
+        assert sorted(notes.splitlines()[1:]) == sorted(
+            f"[[{title}]]" for batch in batches for title in batch
+        )
+        assert sorted(p.name for p in note.parent.iterdir()) == [note.name]
+
+    def test_racing_same_title_creates_one_note(self, vault):
+        """Only one of several processes creating the same note should win."""
+        root, config = vault
+        assert self._run_parallel(root, [["Same"]] * 8) == 1
+        assert self._daily_links(config) == ["[[Same]]"]
+
+    def test_create_exclusive_leaves_no_temp_files(self, tmp_path: Path):
+        """Atomic creation should not overwrite or leave temp files behind."""
+        from zettelkasten_cli.services.fs import create_exclusive
+
+        target = tmp_path / "note.md"
+        assert create_exclusive(target, "first")
+        assert not create_exclusive(target, "second")
+        assert target.read_text() == "first"
+        assert [p.name for p in tmp_path.iterdir()] == ["note.md"]
+
+
+class TestBatchNotes:
+    """Test batch note creation."""
+
+    def test_batch_creates_notes_and_links(self, vault):
+        """Plain and NDJSON lines should become linked notes."""
+        from zettelkasten_cli.models.note import create_notes, parse_batch
+        from zettelkasten_cli.models.periodic_note import daily
+
+        _, config = vault
+        lines = ["First", "", '{"title": "Second", "body": "Meeting notes\\n"}']
+        paths = create_notes(parse_batch(lines, config), config)
+
+        assert [p.name for p in paths] == ["First.md", "Second.md"]
+        assert paths[1].read_text() == "# Second\n\nMeeting notes\n"
+        assert daily(config).note_path.read_text().endswith("\n[[First]]\n[[Second]]")
+
+    def test_batch_is_validated_up_front(self, vault):
+        """Invalid lines should be reported together and nothing written."""
+        from zettelkasten_cli.models.note import parse_batch
+
+        root, config = vault
+        with pytest.raises(NoteTitleError) as excinfo:
+            parse_batch(["ok", "bad.md", "{not json", "a" * 81], config)
+
+        message = str(excinfo.value)
+        assert "Line 2" in message
+        assert "Line 3" in message
+        assert "Line 4" in message
+        assert not (root / "0 Inbox").exists()
+
+    def test_batch_refuses_duplicates(self, vault):
+        """Repeated or existing titles should abort the whole batch."""
+        from zettelkasten_cli.models.note import create_notes, parse_batch
+
+        root, config = vault
+        (root / "0 Inbox").mkdir()
+        (root / "0 Inbox" / "Existing.md").write_text("")
+
+        with pytest.raises(NoteExistsError):
+            create_notes(parse_batch(["New", "New"], config), config)
+        with pytest.raises(NoteExistsError, match="Duplicate title in batch: new"):
+            create_notes(parse_batch(["New", "new"], config), config)
+        with pytest.raises(NoteExistsError):
+            create_notes(parse_batch(["Other", "Existing"], config), config)
+
+        assert [p.name for p in (root / "0 Inbox").iterdir()] == ["Existing.md"]
+
+    def test_batch_command_reads_stdin(self, vault):
+        """`zk new --batch -` should read titles from stdin."""
+        root, _ = vault
+        result = runner.invoke(
+            app, ["new", "--batch", "-", "--vim"], input="One\nTwo\n"
+        )
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            str(root / "0 Inbox" / "One.md"),
+            str(root / "0 Inbox" / "Two.md"),
+        ]
+
+
+class TestTemplates:
+    """Test the template engine."""
+
+    def test_render_substitutes_known_variables(self):
+        """Known variables are substituted, unknown ones left as written."""
+        from zettelkasten_cli.services.template import CompiledTemplate
+
+        template = CompiledTemplate("# {{ title }} {{date}} {{date:YYYY}} {{other}}")
+
+        assert template.variables == {"title", "date", "other"}
+        assert (
+            template.render({"title": "T", "date": "2026-01-01"})
+            == "# T 2026-01-01 {{date:YYYY}} {{other}}"
+        )
+
+    def test_template_cache_picks_up_changes(self, tmp_path: Path):
+        """Compiled templates are cached until the file changes."""
+        from zettelkasten_cli.services.template import load_template
+
+        path = tmp_path / "daily.md"
+        assert load_template(path) is None
+
+        path.write_text("v1 {{date}}")
+        first = load_template(path)
+        assert load_template(path) is first
+
+        path.write_text("version 2 {{date}}")
+        assert load_template(path).render({"date": "d"}) == "version 2 d"
+
+    def test_periodic_and_note_templates(self, vault):
+        """Daily and note templates should render their variables."""
+        from zettelkasten_cli.models.note import Note
+        from zettelkasten_cli.models.periodic_note import daily
+
+        root, config = vault
+        (root / "zk").mkdir()
+        (root / "zk" / "daily.md").write_text("{{yesterday}} < {{date}}\n")
+        (root / "zk" / "note.md").write_text("# {{title}}\nCreated {{date}}\n")
+
+        today = daily(config)
+        note = Note(title="Templated", config=config)
+
+        assert today.get_content() == (
+            f"{today.get_offset_date_str(-1)} < {today.get_current_date_str()}\n"
+        )
+        assert note.get_content() == (
+            f"# Templated\nCreated {today.get_current_date_str()}\n"
+        )
+
+
+class TestFind:
+    """Test fuzzy title finding."""
+
+    def test_ranks_close_titles_first(self, vault, vault_index):
+        """Typos and partial titles should still find the right note."""
+        root, _ = vault
+        for title in ("Kubernetes", "Kubernetes Operators", "Docker", "Kafka"):
+            (root / f"{title}.md").write_text("")
+
+        vault_index.refresh()
+
+        assert vault_index.find("kubernets")[0].note.title == "Kubernetes"
+        assert vault_index.find("operators")[0].note.title == "Kubernetes Operators"
+        assert vault_index.find("zzzz") == []
+
+    def test_renamed_notes_are_found_by_new_title(self, vault, vault_index):
+        """Trigrams should follow renames after a refresh."""
+        root, _ = vault
+        (root / "Old name.md").write_text("")
+
+        vault_index.refresh()
+        (root / "Old name.md").rename(root / "Brand new.md")
+        vault_index.refresh()
+
+        assert [r.note.title for r in vault_index.find("old name")] == ["Brand new"]
+        assert vault_index.find("brand")[0].note.title == "Brand new"
+
+    def test_find_command_json(self, vault):
+        """--json should output title, path and score."""
+        import json
+
+        root, _ = vault
+        (root / "Kubernetes.md").write_text("")
+
+        result = runner.invoke(app, ["find", "kube", "--json"])
+
+        assert result.exit_code == 0
+        [match] = json.loads(result.stdout)
+        assert match["title"] == "Kubernetes"
+        assert match["path"] == str(root / "Kubernetes.md")
+
+
+class TestVaultWideTitles:
+    """Test the vault-wide duplicate title check."""
+
+    def _build_index(self, config) -> None:
+        from zettelkasten_cli.services.index import open_index
+
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+
+    def test_refuses_title_existing_elsewhere(self, vault):
+        """A title anywhere in the vault should block creation, ignoring case."""
+        from zettelkasten_cli.models.note import Note
+
+        root, config = vault
+        (root / "3 Resources").mkdir()
+        (root / "3 Resources" / "Kubernetes.md").write_text("")
+        self._build_index(config)
+
+        with pytest.raises(NoteExistsError, match="3 Resources"):
+            Note(title="kubernetes", config=config).create()
+        assert not (root / "0 Inbox" / "kubernetes.md").exists()
+
+    def test_created_notes_are_indexed(self, vault):
+        """New notes should be added to the index so the next check sees them."""
+        from zettelkasten_cli.models.note import Note
+        from zettelkasten_cli.services.index import open_index
+
+        _, config = vault
+        self._build_index(config)
+
+        path = Note(title="Fresh", config=config).create()
+
+        with open_index(config) as vault_index:
+            assert vault_index.contains(path)
+            assert vault_index.backlinks("fresh")
+
+    def test_stale_entries_and_missing_index(self, vault):
+        """Deleted notes and vaults without an index should not block creation."""
+        from zettelkasten_cli.models.note import Note
+
+        root, config = vault
+        (root / "Gone.md").write_text("")
+        (root / "Elsewhere.md").write_text("")
+        self._build_index(config)
+        (root / "Gone.md").unlink()
+
+        Note(title="Gone", config=config).create()
+
+        config.paths.index_path.unlink()
+        Note(title="Elsewhere", config=config).create()
+
+    def test_sees_notes_added_after_indexing(self, vault):
+        """Notes created or renamed behind the index's back should still block."""
+        from zettelkasten_cli.models.note import Note
+
+        root, config = vault
+        (root / "3 Resources").mkdir()
+        (root / "3 Resources" / "Old.md").write_text("")
+        self._build_index(config)
+
+        (root / "3 Resources" / "Old.md").rename(root / "3 Resources" / "Renamed.md")
+        (root / "4 Archive" / "2025").mkdir(parents=True)
+        (root / "4 Archive" / "2025" / "Archived.md").write_text("")
+
+        for title, folder in [("renamed", "3 Resources"), ("ARCHIVED", "2025")]:
+            with pytest.raises(NoteExistsError, match=folder):
+                Note(title=title, config=config).create()
+        Note(title="Old", config=config).create()
+
+
+class _ScriptedBackend:
+    """Watcher backend that makes changes, then replays their events."""
+
+    def __init__(self, change, batches: list[list[Path]], idle) -> None:
+        self.change = change
+        self.batches = batches
+        self.idle = idle
+
+    def read(self, timeout: float | None) -> list[Path]:
+        if self.change is not None:
+            self.change()
+            self.change = None
+        if self.batches:
+            return self.batches.pop(0)
+        self.idle()
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+class TestWatcher:
+    """Test the filesystem watcher and incremental index updates."""
+
+    def test_debouncer_coalesces_bursts(self):
+        """Thousands of events should collapse into one batch of distinct paths."""
+        from zettelkasten_cli.services.watcher import Debouncer
+
+        now = [0.0]
+        debouncer = Debouncer(delay=0.2, max_delay=2.0, clock=lambda: now[0])
+        paths = [Path(f"/vault/Note {i % 1000}.md") for i in range(10_000)]
+
+        for start in range(0, len(paths), 100):
+            debouncer.add(paths[start : start + 100])
+            now[0] += 0.01
+            assert not debouncer.ready()
+
+        now[0] += 0.2
+        assert debouncer.ready()
+        assert len(debouncer.drain()) == 1000
+        assert debouncer.timeout() is None
+
+    def test_debouncer_flushes_steady_streams(self):
+        """A stream that never pauses should still flush after max_delay."""
+        from zettelkasten_cli.services.watcher import Debouncer
+
+        now = [0.0]
+        debouncer = Debouncer(delay=0.2, max_delay=2.0, clock=lambda: now[0])
+        while not debouncer.ready():
+            debouncer.add([Path("/vault/Busy.md")])
+            now[0] += 0.1
+
+        assert now[0] == pytest.approx(2.0, abs=0.15)
+
+    def test_apply_changes_handles_renames_and_deletions(self, vault):
+        """Moved and deleted directories should update every note below them."""
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        (root / "Projects").mkdir()
+        for i in range(3):
+            (root / "Projects" / f"Project {i}.md").write_text("[[Goal]]")
+        (root / "Old.md").write_text("")
+
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            (root / "Projects").rename(root / "Archive")
+            (root / "Old.md").rename(root / "New.md")
+            (root / ".obsidian").mkdir()
+
+            stats = vault_index.apply_changes(
+                [
+                    root / "Projects",
+                    root / "Archive",
+                    root / "Old.md",
+                    root / "New.md",
+                    root / ".obsidian" / "workspace.md",
+                ]
+            )
+
+            assert (stats.total, stats.added, stats.removed) == (4, 4, 4)
+            assert vault_index.contains(root / "Archive" / "Project 0.md")
+            assert not vault_index.contains(root / "Projects" / "Project 0.md")
+            assert len(vault_index.backlinks("Goal")) == 3
+            assert [n.title for n in vault_index.notes()] == [
+                "Project 0",
+                "Project 1",
+                "Project 2",
+                "New",
+            ]
+
+            shutil.rmtree(root / "Archive")
+            stats = vault_index.apply_changes([root / "Archive"])
+            assert stats.removed == 3
+            assert len(vault_index) == 1
+
+    def test_watcher_applies_bursts_in_one_batch(self, vault):
+        """A burst of thousands of events should be applied as a single update."""
+        from zettelkasten_cli.services.index import open_index
+        from zettelkasten_cli.services.watcher import Debouncer, Watcher
+
+        root, config = vault
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+
+        paths = [root / f"Note {i}.md" for i in range(2000)]
+
+        def write_notes():
+            for path in paths:
+                path.write_text("")
+
+        # Create + close-write per file, delivered in chunks
+        events = [path for path in paths for _ in range(2)]
+        batches = [events[i : i + 500] for i in range(0, len(events), 500)]
+
+        # Time stands still during the burst; once it is over, the first
+        # idle read lets the debounce delay pass and the second one stops
+        now = [0.0]
+
+        def idle():
+            if now[0]:
+                watcher.stop()
+            now[0] += 1.0
+
+        updates = []
+        watcher = Watcher(
+            config,
+            debouncer=Debouncer(delay=0.2, clock=lambda: now[0]),
+            on_update=updates.append,
+            backend=_ScriptedBackend(write_notes, batches, idle),
+        )
+        watcher.run()
+
+        [stats] = updates
+        assert (stats.total, stats.added) == (2000, 2000)
+        with open_index(config) as vault_index:
+            assert len(vault_index) == 2000
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux-only")
+    def test_inotify_backend_reports_changes(self, tmp_path: Path):
+        """inotify should report notes and directories, and follow new ones."""
+        from zettelkasten_cli.services.watcher import InotifyBackend
+
+        (tmp_path / "a").mkdir()
+        backend = InotifyBackend(tmp_path)
+        try:
+            (tmp_path / "a" / "One.md").write_text("")
+            (tmp_path / "a" / "image.png").write_text("")
+            (tmp_path / ".zk").mkdir()
+            (tmp_path / "b").mkdir()
+            assert set(backend.read(1.0)) == {tmp_path / "a" / "One.md", tmp_path / "b"}
+
+            (tmp_path / "b" / "Two.md").write_text("")
+            (tmp_path / "a" / "One.md").rename(tmp_path / "b" / "One.md")
+            changed = set()
+            while len(changed) < 3 and (batch := backend.read(1.0)):
+                changed.update(batch)
+            assert changed == {
+                tmp_path / "b" / "Two.md",
+                tmp_path / "a" / "One.md",
+                tmp_path / "b" / "One.md",
+            }
+        finally:
+            backend.close()
+
+    def test_polling_backend_reports_changes(self, tmp_path: Path):
+        """Polling should detect created, modified and deleted notes."""
+        from zettelkasten_cli.services.watcher import PollingBackend
+
+        (tmp_path / "Edited.md").write_text("")
+        (tmp_path / "Deleted.md").write_text("")
+        backend = PollingBackend(tmp_path, interval=0.0)
+
+        (tmp_path / "Edited.md").write_text("changed")
+        (tmp_path / "Deleted.md").unlink()
+        (tmp_path / "Created.md").write_text("")
+
+        assert set(backend.read(None)) == {
+            tmp_path / "Edited.md",
+            tmp_path / "Deleted.md",
+            tmp_path / "Created.md",
+        }
+        assert backend.read(None) == []
+
+    def test_embedded_watcher_keeps_index_current(self, vault):
+        """A background watcher should index notes written by other programs."""
+        import time
+
+        from zettelkasten_cli.services.index import open_index
+        from zettelkasten_cli.services.watcher import Debouncer, Watcher
+
+        root, config = vault
+        watcher = Watcher(
+            config, poll=True, interval=0.05, debouncer=Debouncer(delay=0.05)
+        )
+        watcher.start()
+        try:
+            time.sleep(0.2)
+            (root / "External.md").write_text("[[Target]]")
+
+            deadline = time.monotonic() + 5
+            with open_index(config) as vault_index:
+                while not vault_index.backlinks("target"):
+                    assert time.monotonic() < deadline
+                    time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+
+class TestScanner:
+    """Test the vault scanner and its ignore rules."""
+
+    def test_ignore_rules(self):
+        """Patterns should follow gitignore semantics."""
+        from zettelkasten_cli.services.scanner import IgnoreRules
+
+        rules = IgnoreRules(
+            [
+                "# comment",
+                "Archive/",
+                "/Drafts",
+                "*.excalidraw.md",
+                "Templates/**/old",
+                "!Archive/keep",
+            ]
+        )
+
+        assert rules.match("Archive", is_dir=True)
+        assert rules.match("Projects/Archive", is_dir=True)
+        assert not rules.match("Archive")  # Directory-only pattern
+        assert rules.match("Drafts", is_dir=True)
+        assert not rules.match("Projects/Drafts", is_dir=True)  # Anchored
+        assert rules.match("Diagrams/Flow.excalidraw.md")
+        assert rules.match("Templates/a/b/old", is_dir=True)
+        assert not rules.match("Archive/keep", is_dir=True)
+        assert not rules.match("Notes/Note.md")
+
+    def test_walk_skips_dot_dirs_and_ignored_paths(self, tmp_path: Path):
+        """Walking should skip dot-directories and .zkignore matches."""
+        from zettelkasten_cli.services.scanner import Scanner
+
+        for rel in (
+            "Note.md",
+            "Projects/Plan.md",
+            "Projects/Archive/Old.md",
+            "Drawing.excalidraw.md",
+            "image.png",
+            ".obsidian/workspace.md",
+            ".git/HEAD.md",
+            ".trash/Deleted.md",
+        ):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text(rel)
+        (tmp_path / ".zkignore").write_text("Archive/\n*.excalidraw.md\n")
+
+        scanner = Scanner(tmp_path)
+
+        assert sorted(rel for rel, _ in scanner.walk()) == [
+            "Note.md",
+            "Projects/Plan.md",
+        ]
+        assert [rel for rel, _ in scanner.walk("Projects")] == ["Projects/Plan.md"]
+        assert scanner.ignores("Projects/Archive/Old.md")
+        assert scanner.ignores(".obsidian/workspace.md")
+        assert not scanner.ignores("Projects/Plan.md")
+
+    def test_read_keeps_order_and_bounds_work(self, tmp_path: Path):
+        """Parallel reads should yield in input order, with None for missing files."""
+        from zettelkasten_cli.services.scanner import Scanner
+
+        for i in range(500):
+            (tmp_path / f"{i:03}.md").write_text(str(i))
+        scanner = Scanner(tmp_path)
+        entries = sorted(scanner.walk())
+        (tmp_path / "100.md").unlink()
+
+        results = list(
+            scanner.read(entries, parse=lambda rel, data: int(data), workers=4)
+        )
+
+        assert [rel for rel, _, _ in results] == [rel for rel, _ in entries]
+        assert results[100][2] is None
+        assert results[99][2] == 99 and results[499][2] == 499
+
+    def test_index_honours_ignore_file(self, vault):
+        """Ignored notes should be dropped from the index on the next refresh."""
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        (root / "Archive").mkdir()
+        (root / "Archive" / "Old.md").write_text("")
+        (root / "Note.md").write_text("")
+
+        with open_index(config) as vault_index:
+            assert vault_index.refresh().total == 2
+
+        (root / ".zkignore").write_text("Archive/\n")
+        with open_index(config) as vault_index:
+            stats = vault_index.refresh()
+            assert (stats.total, stats.removed) == (1, 1)
+            vault_index.apply_changes([root / "Archive" / "Old.md"])
+            assert len(vault_index) == 1
+
+
+class TestTrace:
+    """Test span timing and the --profile instrumentation."""
+
+    @pytest.fixture(autouse=True)
+    def _stop_tracing(self):
+        from zettelkasten_cli.services import trace
+
+        yield
+        trace._json_path = None
+        trace._enabled = False
+        trace._events.clear()
+
+    def test_disabled_spans_record_nothing(self):
+        """With tracing off, spans should be a shared no-op."""
+        from zettelkasten_cli.services import trace
+
+        @trace.traced("work")
+        def work():
+            return 42
+
+        assert trace.span("a") is trace.span("b")
+        with trace.span("a"):
+            assert work() == 42
+        assert trace._events == []
+
+    def test_report_nests_spans(self, capsys):
+        """The stderr report should list spans in order, indented by depth."""
+        from zettelkasten_cli.services import trace
+
+        trace.enable()
+        with trace.span("outer", note="x.md"), trace.span("inner"):
+            pass
+        trace.finish()
+
+        lines = capsys.readouterr().err.splitlines()
+        assert lines[0].startswith("zk trace:")
+        assert lines[1].endswith("  outer  note=x.md")
+        assert lines[2].endswith("    inner")
+        assert not trace.enabled()
+
+    def test_chrome_trace_and_cprofile(self, tmp_path: Path):
+        """ZK_TRACE=file.json and ZK_CPROFILE should write both files at exit."""
+        import json
+        import pstats
+
+        env = {
+            **os.environ,
+            "ZETTELKASTEN": str(tmp_path),
+            "ZK_TRACE": str(tmp_path / "trace.json"),
+            "ZK_CPROFILE": str(tmp_path / "zk.prof"),
+        }
+        subprocess.run(
+            [sys.executable, "-m", "zettelkasten_cli.cli", "new", "Traced", "--vim"],
+            env=env,
+            check=True,
+            capture_output=True,
+        )
+
+        events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+        names = {event["name"] for event in events}
+        assert {"zk", "config.load", "note.create", "periodic.append"} <= names
+        assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+        assert pstats.Stats(str(tmp_path / "zk.prof")).total_calls > 0
+
+    def test_profile_flag_prints_breakdown(self, tmp_path: Path):
+        """`zk --profile` should time the typer path, including editor spawn."""
+        env = {
+            **os.environ,
+            "ZETTELKASTEN": str(tmp_path),
+            "ZETTELKASTEN_EDITOR": "true",
+        }
+        env.pop("ZK_TRACE", None)
+        result = subprocess.run(
+            [sys.executable, "-m", "zettelkasten_cli.cli", "--profile", "day"],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+
+        assert "zk trace:" in result.stderr
+        for name in ("import main", "config.load", "template.load", "editor.open"):
+            assert name in result.stderr
+
+
+class TestRemoteEditor:
+    """Test opening notes in an already-running Neovim."""
+
+    def _editor(self, server: str | None):
+        from zettelkasten_cli.config import EditorConfig
+
+        return EditorConfig(command="nvim", nvim_server=server)
+
+    def test_server_from_environment(self):
+        """ZETTELKASTEN_NVIM_SERVER should win over $NVIM."""
+        from zettelkasten_cli.config import EditorConfig
+
+        with patch.dict(os.environ, {"NVIM": "/run/nvim.sock"}):
+            assert EditorConfig().nvim_server == "/run/nvim.sock"
+            os.environ["ZETTELKASTEN_NVIM_SERVER"] = "127.0.0.1:6666"
+            assert EditorConfig().nvim_server == "127.0.0.1:6666"
+        with patch.dict(os.environ, {}, clear=True):
+            assert EditorConfig().nvim_server is None
+
+    def test_opens_in_running_server(self, tmp_path: Path):
+        """A listening server should get the file via --server --remote."""
+        import socket
+
+        from zettelkasten_cli.services.editor import open_in_editor
+
+        address = str(tmp_path / "nvim.sock")
+        note = tmp_path / "Note.md"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(address)
+            server.listen()
+            with patch("zettelkasten_cli.services.editor.subprocess.run") as run:
+                open_in_editor(note, self._editor(address))
+
+        run.assert_called_once_with(
+            ["nvim", "--server", address, "--remote", str(note)], check=True
+        )
+
+    def test_tcp_server(self, tmp_path: Path):
+        """host:port addresses should be probed over TCP."""
+        import socket
+
+        from zettelkasten_cli.services.editor import open_in_editor
+
+        with socket.create_server(("127.0.0.1", 0)) as server:
+            address = f"127.0.0.1:{server.getsockname()[1]}"
+            with patch("zettelkasten_cli.services.editor.subprocess.run") as run:
+                open_in_editor(tmp_path / "Note.md", self._editor(address))
+
+        assert run.call_args.args[0][1:4] == ["--server", address, "--remote"]
+
+    def test_falls_back_to_spawning(self, tmp_path: Path):
+        """Without a reachable server, a new Neovim should be started."""
+        from zettelkasten_cli.services.editor import open_in_editor
+
+        note = tmp_path / "Note.md"
+        with patch("zettelkasten_cli.services.editor.subprocess.run") as run:
+            open_in_editor(note, self._editor(str(tmp_path / "missing.sock")))
+
+        [cmd] = run.call_args.args
+        assert cmd[:3] == ["nvim", "+ normal Gzzo", str(note)]
+        assert "--server" not in cmd
+
+
+class TestStats:
+    """Test vault statistics."""
+
+    def _write_notes(self, root: Path) -> None:
+        (root / "0 Inbox").mkdir()
+        (root / "0 Inbox" / "Idea.md").write_text("# Idea\n\nLinks to [[Plan]].\n")
+        (root / "1 Projects").mkdir()
+        (root / "1 Projects" / "Plan.md").write_text(
+            "# Plan\n\n[[Idea]] [[Idea|again]] [[Other]]\n"
+        )
+        (root / "periodic-notes" / "daily-notes").mkdir(parents=True)
+        (root / "periodic-notes" / "daily-notes" / "2026-10-18.md").write_text("# Day")
+
+    def test_collects_counts_and_growth(self, vault):
+        """Counts should come from the index and growth should skip periodic notes."""
+        from datetime import date
+
+        from zettelkasten_cli.services.index import open_index
+        from zettelkasten_cli.services.stats import collect_stats
+
+        root, config = vault
+        self._write_notes(root)
+        today = date.today()
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            stats = collect_stats(vault_index, config, days=3, weeks=2, today=today)
+
+        assert (stats.notes, stats.inbox, stats.daily, stats.weekly) == (3, 1, 1, 0)
+        assert stats.words == 5 + 5 + 2
+        assert (stats.links, stats.linking_notes) == (3, 2)
+        assert list(stats.created_per_day)[-1] == today.isoformat()
+        assert stats.created_per_day[today.isoformat()] == 2
+        assert sum(stats.created_per_day.values()) == 2
+        assert list(stats.created_per_week)[-1] == f"{today:%G-W%V}"
+        assert stats.created_per_week[f"{today:%G-W%V}"] == 2
+
+    def test_process_pool_reads_match_serial_reads(self, tmp_path: Path):
+        """Parsing on worker processes should give the same results in order."""
+        from zettelkasten_cli.services.index import parse_note
+        from zettelkasten_cli.services.scanner import Scanner
+
+        for i in range(300):
+            (tmp_path / f"{i:03}.md").write_text(f"Note {i} [[{i + 1:03}]]")
+        scanner = Scanner(tmp_path)
+        entries = sorted(scanner.walk())
+
+        serial = list(scanner.read(entries, parse=parse_note, workers=1))
+        parallel = list(
+            scanner.read(entries, parse=parse_note, workers=2, processes=True)
+        )
+
+        assert [(rel, parsed) for rel, _, parsed in parallel] == [
+            (rel, parsed) for rel, _, parsed in serial
+        ]
+        assert parallel[0][2].words == 3
+
+    def test_stats_command_json(self, vault):
+        """`zk stats --json` should print machine-readable statistics."""
+        import json
+
+        root, _ = vault
+        self._write_notes(root)
+
+        result = runner.invoke(app, ["stats", "--json", "--days", "7"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["notes"] == 3
+        assert data["links_per_note"] == 1.0
+        assert len(data["created_per_day"]) == 7
+
+
+class TestDoctor:
+    """Test vault health checks."""
+
+    def _write_notes(self, root: Path) -> None:
+        (root / "0 Inbox").mkdir()
+        (root / "0 Inbox" / "Linked.md").write_text("# Linked\n\nSome text.\n")
+        (root / "0 Inbox" / "Lonely.md").write_text("# Lonely\n\n")
+        (root / "0 Inbox" / "Self.md").write_text("# Self\n\n[[Self]]\n")
+        (root / "1 Projects").mkdir()
+        (root / "1 Projects" / "Plan.md").write_text(
+            "# Plan\n\n[[linked]] [[Gone|alias]] [[Gone#h]] ![[chart.png]] "
+            "[[2026-W43]]\n"
+        )
+        (root / "1 Projects" / "Linked.md").write_text("[[Plan]]")
+
+    def test_diagnose_finds_problems(self, vault):
+        """Broken links, inbox orphans, empty notes and duplicates are reported."""
+        from zettelkasten_cli.services.doctor import BrokenLink, diagnose
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        self._write_notes(root)
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            report = diagnose(vault_index, config)
+
+        inbox = root / "0 Inbox"
+        assert report.broken_links == [
+            BrokenLink(root / "1 Projects" / "Plan.md", "Gone")
+        ]
+        assert report.missing_periodic == [
+            BrokenLink(root / "1 Projects" / "Plan.md", "2026-W43")
+        ]
+        assert report.orphans == [inbox / "Lonely.md", inbox / "Self.md"]
+        assert report.empty == [inbox / "Lonely.md"]
+        assert report.duplicates == [
+            [inbox / "Linked.md", root / "1 Projects" / "Linked.md"]
+        ]
+        assert not report.ok
+
+    def test_doctor_command(self, vault):
+        """`zk doctor --json` should print the report and fail on problems."""
+        import json
+
+        root, _ = vault
+        self._write_notes(root)
+        result = runner.invoke(app, ["doctor", "--json"])
+
+        assert result.exit_code == 1
+        data = json.loads(result.output)
+        assert data["broken_links"][0]["target"] == "Gone"
+        assert len(data["orphans"]) == 2
+
+        for path in root.rglob("*.md"):
+            path.unlink()
+        (root / "Note.md").write_text("# Note\n\nContent.\n")
+        result = runner.invoke(app, ["doctor"])
+
+        assert result.exit_code == 0
+
+    def test_default_daily_note_is_healthy(self, vault):
+        """Links to yesterday's and tomorrow's daily notes are not problems."""
+        import json
+
+        from zettelkasten_cli.models.periodic_note import daily
+
+        _, config = vault
+        note = daily(config)
+        note.note_path.parent.mkdir(parents=True)
+        note.note_path.write_text(note.get_default_content())
+        result = runner.invoke(app, ["doctor", "--json"])
+
+        assert result.exit_code == 0
+        data = json.loads(result.output)
+        assert data["broken_links"] == []
+        assert sorted(link["target"] for link in data["missing_periodic"]) == [
+            note.get_offset_date_str(-1),
+            note.get_offset_date_str(1),
+        ]
+
+
+class TestRename:
+    """Test renaming notes with link rewriting."""
+
+    def _write_notes(self, root: Path) -> None:
+        (root / "0 Inbox").mkdir()
+        (root / "0 Inbox" / "Old.md").write_text("# Old\n\nSee [[Old#Top]].\n")
+        (root / "A.md").write_text("[[Old]] [[old|alias]] ![[dir/Old.md#h]] [[Older]]")
+        (root / "B.md").write_text("[[Old^block]]")
+        (root / "C.md").write_text("Nothing to see")
+
+    def test_replace_wikilinks(self):
+        """Aliases, headings, block references and folders should be kept."""
+        from zettelkasten_cli.services.markdown import replace_wikilinks
+
+        text, count = replace_wikilinks(
+            "[[Old]] [[old|a]] ![[dir/Old.md#h]] [[Older]] [[Old^b]]", "old", "New"
+        )
+
+        assert text == "[[New]] [[New|a]] ![[dir/New.md#h]] [[Older]] [[New^b]]"
+        assert count == 4
+
+    def test_rename_rewrites_only_backlinks(self, vault, vault_index):
+        """Only referencing files should be read, and the index should follow."""
+        from zettelkasten_cli.services import fs
+        from zettelkasten_cli.services.rename import Renamer
+
+        root, config = vault
+        self._write_notes(root)
+        vault_index.refresh()
+        with patch(
+            "zettelkasten_cli.services.rename.locked_read", wraps=fs.locked_read
+        ) as reads:
+            result = Renamer(config, vault_index).rename("old", "New")
+
+        assert result.new_path == root / "0 Inbox" / "New.md"
+        assert result.links == 5
+        assert {call.args[0].name for call in reads.call_args_list} == {
+            "New.md",
+            "A.md",
+            "B.md",
+        }
+        assert not vault_index.find_title("Old")
+        assert len(vault_index.backlinks("New")) == 3
+        assert not (root / "0 Inbox" / "Old.md").exists()
+        assert (root / "0 Inbox" / "New.md").read_text() == (
+            "# Old\n\nSee [[New#Top]].\n"
+        )
+        assert (root / "A.md").read_text() == (
+            "[[New]] [[New|alias]] ![[dir/New.md#h]] [[Older]]"
+        )
+        assert not (config.paths.state_dir / "rename.journal").exists()
+
+    def test_interrupted_rename_resumes_or_rolls_back(self, vault, vault_index):
+        """A crash mid-rename should leave a journal that allows both recoveries."""
+        from zettelkasten_cli.exceptions import RenameError
+        from zettelkasten_cli.services import fs
+        from zettelkasten_cli.services.rename import Renamer
+
+        root, config = vault
+        self._write_notes(root)
+        vault_index.refresh()
+        originals = {p: p.read_bytes() for p in root.glob("*.md")}
+        calls = 0
+
+        def crash_on_second_rewrite(path, content, sync=True):
+            nonlocal calls
+            if path.suffix == ".md":
+                calls += 1
+                if calls == 2:
+                    raise KeyboardInterrupt
+            fs.replace_atomic(path, content, sync)
+
+        renamer = Renamer(config, vault_index)
+        with (
+            patch(
+                "zettelkasten_cli.services.rename.replace_atomic",
+                crash_on_second_rewrite,
+            ),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            renamer.rename("Old", "New")
+
+        assert renamer.pending().new_title == "New"
+        with pytest.raises(RenameError, match="interrupted"):
+            renamer.rename("Old", "Other")
+
+        plan, kept = renamer.rollback()
+        assert (plan.old_title, kept) == ("Old", [])
+        assert (root / "0 Inbox" / "Old.md").exists()
+        assert {p: p.read_bytes() for p in root.glob("*.md")} == originals
+        assert renamer.pending() is None
+
+        calls = 0
+        with (
+            patch(
+                "zettelkasten_cli.services.rename.replace_atomic",
+                crash_on_second_rewrite,
+            ),
+            pytest.raises(KeyboardInterrupt),
+        ):
+            renamer.rename("Old", "New")
+        renamer.resume()
+
+        assert len(vault_index.backlinks("New")) == 3
+        assert "[[New|alias]]" in (root / "A.md").read_text()
+        assert (root / "B.md").read_text() == "[[New^block]]"
+
+    def test_rollback_leaves_files_it_did_not_move(self, vault, vault_index):
+        """A failed move should be rolled back without touching the new path."""
+        from zettelkasten_cli.exceptions import NoteExistsError
+        from zettelkasten_cli.services import fs
+        from zettelkasten_cli.services.rename import Renamer
+
+        root, config = vault
+        self._write_notes(root)
+        vault_index.refresh()
+        renamer = Renamer(config, vault_index)
+        stranger = root / "0 Inbox" / "New.md"
+
+        def appear_then_move(src, dst):
+            stranger.write_text("Not the note")
+            return fs.move_exclusive(src, dst)
+
+        with (
+            patch("zettelkasten_cli.services.rename.move_exclusive", appear_then_move),
+            pytest.raises(NoteExistsError),
+        ):
+            renamer.rename("Old", "New")
+
+        renamer.rollback()
+        assert renamer.pending() is None
+        assert stranger.read_text() == "Not the note"
+        assert (root / "0 Inbox" / "Old.md").read_text() == (
+            "# Old\n\nSee [[Old#Top]].\n"
+        )
+
+    @pytest.mark.parametrize("title", ["A|B", "A#B", "A^B", "A[B", "A]B", "A/B"])
+    def test_rename_refuses_link_syntax_in_title(self, vault, vault_index, title):
+        """Titles that would break wikilinks should be refused."""
+        from zettelkasten_cli.exceptions import NoteTitleError
+        from zettelkasten_cli.services.rename import Renamer
+
+        root, config = vault
+        self._write_notes(root)
+        vault_index.refresh()
+
+        with pytest.raises(NoteTitleError, match="cannot contain"):
+            Renamer(config, vault_index).rename("Old", title)
+        assert (root / "0 Inbox" / "Old.md").exists()
+
+    def test_rename_command_refuses_existing_title(self, vault):
+        """Renaming onto an existing title should fail without changes."""
+        root, _ = vault
+        self._write_notes(root)
+        result = runner.invoke(app, ["rename", "Old", "c"])
+        assert result.exit_code == 1
+        assert (root / "0 Inbox" / "Old.md").exists()
+
+        result = runner.invoke(app, ["rename", "Old", "Fresh"])
+        assert result.exit_code == 0
+        assert (root / "0 Inbox" / "Fresh.md").exists()
+
+
+class TestInbox:
+    """Test inbox listing and bulk moves."""
+
+    def _write_notes(self, root: Path) -> None:
+        inbox = root / "0 Inbox"
+        inbox.mkdir()
+        for i, (title, body) in enumerate(
+            [("Meeting B", "x" * 30), ("Idea", "[[Meeting A]]"), ("Meeting A", "")]
+        ):
+            path = inbox / f"{title}.md"
+            path.write_text(body)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        (root / "Other.md").write_text("[[Meeting A]] [[Idea]]")
+
+    def test_list_sorted_by_age_size_and_links(self, vault):
+        """Notes should be listed by age, size or backlink count."""
+        from zettelkasten_cli.services.inbox import InboxSort, list_inbox
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        self._write_notes(root)
+
+        def titles(notes):
+            return [note.title for note in notes]
+
+        assert titles(list_inbox(config)) == ["Meeting B", "Idea", "Meeting A"]
+        assert titles(list_inbox(config, InboxSort.SIZE, reverse=True)) == [
+            "Meeting B",
+            "Idea",
+            "Meeting A",
+        ]
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            notes = list_inbox(config, InboxSort.LINKS, vault_index=vault_index)
+        assert [(note.title, note.links) for note in notes] == [
+            ("Meeting B", 0),
+            ("Idea", 1),
+            ("Meeting A", 2),
+        ]
+
+    def test_move_checks_conflicts_first(self, vault):
+        """A conflicting batch should move nothing; a clean one updates the index."""
+        from zettelkasten_cli.exceptions import NoteExistsError
+        from zettelkasten_cli.services.inbox import match_inbox, move_notes
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        self._write_notes(root)
+        paths = match_inbox(config, "meeting *")
+        assert [path.name for path in paths] == ["Meeting A.md", "Meeting B.md"]
+
+        (root / "Meetings").mkdir()
+        (root / "Meetings" / "Meeting B.md").write_text("")
+        with pytest.raises(NoteExistsError):
+            list(move_notes(config, paths, Path("Meetings")))
+        assert all(path.exists() for path in paths)
+
+        (root / "Meetings" / "Meeting B.md").unlink()
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            moved = list(move_notes(config, paths, Path("Meetings"), vault_index))
+
+            assert [target.parent.name for _, target in moved] == ["Meetings"] * 2
+            assert vault_index.count(root / "Meetings") == 2
+            assert vault_index.count(config.paths.inbox) == 1
+
+    def test_inbox_commands(self, vault):
+        """`zk inbox` should list notes and `zk inbox move` relocate them."""
+        root, _ = vault
+        self._write_notes(root)
+        result = runner.invoke(app, ["inbox", "--sort", "title", "--vim"])
+        assert result.exit_code == 0
+        assert [Path(line).name for line in result.output.splitlines()] == [
+            "Idea.md",
+            "Meeting A.md",
+            "Meeting B.md",
+        ]
+
+        result = runner.invoke(app, ["inbox", "move", "Meeting*", "Archive"])
+        assert result.exit_code == 0
+        assert sorted(p.name for p in (root / "Archive").iterdir()) == [
+            "Meeting A.md",
+            "Meeting B.md",
+        ]
+
+
+class TestExport:
+    """Test streaming vault exports."""
+
+    def test_parse_frontmatter(self):
+        """Scalars, quoted strings and both list styles should be parsed."""
+        from zettelkasten_cli.services.markdown import parse_frontmatter
+
+        meta, body = parse_frontmatter(
+            "---\ntitle: \"A: b\"\ntags: [x, 'y']\naliases:\n  - one\n"
+            "status:\n---\n# Body\n"
+        )
+
+        assert meta == {
+            "title": "A: b",
+            "tags": ["x", "y"],
+            "aliases": ["one"],
+            "status": "",
+        }
+        assert body == "# Body\n"
+        assert parse_frontmatter("# No frontmatter\n---\n") == (
+            {},
+            "# No frontmatter\n---\n",
+        )
+
+    def test_ndjson_export_is_incremental(self, tmp_path: Path):
+        """A watermark should limit the next export to changed notes."""
+        import gzip
+        import json
+
+        from zettelkasten_cli.services.export import (
+            Compression,
+            export_vault,
+        )
+
+        vault = tmp_path / "vault"
+        (vault / "sub").mkdir(parents=True)
+        (vault / "A.md").write_text("---\ntags: [t]\n---\nSee [[B]].\n")
+        (vault / "sub" / "B.md").write_text("# B\n")
+        old_ns = 10**18
+        for path in vault.rglob("*.md"):
+            os.utime(path, ns=(old_ns, old_ns))
+        out = tmp_path / "out.ndjson.gz"
+        mark = tmp_path / "mark.json"
+
+        stats = export_vault(vault, out, compression=Compression.GZIP, watermark=mark)
+        records = [
+            json.loads(line) for line in gzip.decompress(out.read_bytes()).splitlines()
+        ]
+
+        assert stats.notes == 2
+        assert records[0] == {
+            "path": "A.md",
+            "title": "A",
+            "mtime": "2001-09-09T01:46:40Z",
+            "frontmatter": {"tags": ["t"]},
+            "links": ["B"],
+            "body": "See [[B]].\n",
+        }
+        assert json.loads(mark.read_text())["mtime_ns"] > old_ns
+
+        (vault / "sub" / "B.md").write_text("# B changed\n")
+        stats = export_vault(vault, out, compression=Compression.GZIP, watermark=mark)
+        records = [
+            json.loads(line) for line in gzip.decompress(out.read_bytes()).splitlines()
+        ]
+
+        assert (stats.notes, stats.unchanged) == (1, 1)
+        assert [record["path"] for record in records] == ["sub/B.md"]
+
+    def test_tar_export_command(self, vault):
+        """`zk export vault.tar.gz` should archive the note files."""
+        import tarfile
+
+        root, _ = vault
+        (root / "Note.md").write_text("# Note\n")
+        (root / ".obsidian").mkdir()
+        (root / ".obsidian" / "skip.md").write_text("")
+        out = root / "backup" / "vault.tar.gz"
+        out.parent.mkdir()
+        result = runner.invoke(app, ["export", str(out)])
+
+        assert result.exit_code == 0
+        with tarfile.open(out) as tar:
+            assert tar.getnames() == ["Note.md"]
+            assert tar.extractfile("Note.md").read() == b"# Note\n"
+        assert list(out.parent.iterdir()) == [out]
+
+
+class TestCalendar:
+    """Test the periodic note calendar."""
+
+    def _write_notes(self, root: Path) -> None:
+        daily = root / "periodic-notes" / "daily-notes"
+        weekly = root / "periodic-notes" / "weekly-notes"
+        daily.mkdir(parents=True)
+        weekly.mkdir(parents=True)
+        (daily / "2025-12-31.md").write_text("old year")
+        (daily / "2026-01-02.md").write_text("# Day\n\n[[A]] [[B]]\n")
+        (daily / "2026-03-01.md").write_text("x")
+        (daily / "Notes about days.md").write_text("not a daily note")
+        (weekly / "2026-W01.md").write_text("# Week\n")
+        # An old folder, so its listing is cached
+        for folder in (daily, weekly):
+            os.utime(folder, ns=(10**18, 10**18))
+
+    def test_collects_year_from_cached_listing(self, vault):
+        """Notes should be listed once, then served from the cache."""
+        from datetime import date
+
+        from zettelkasten_cli.services.calendar import collect_calendar
+
+        root, config = vault
+        self._write_notes(root)
+        today = date(2026, 3, 1)
+        first = collect_calendar(config, 2026, today=today)
+
+        (root / "periodic-notes" / "daily-notes" / "2026-03-01.md").write_text(
+            "edited in place"
+        )
+        with patch("os.scandir", side_effect=AssertionError("listed again")):
+            second = collect_calendar(config, 2026, today=today)
+
+        assert first.days == {"2026-01-02": 19, "2026-03-01": 1}
+        assert first.weeks == {"2026-W01": 7}
+        # Today's note is stat'ed again, since it is likely being edited
+        assert second.days == {"2026-01-02": 19, "2026-03-01": 15}
+
+    def test_shades_by_links(self, vault):
+        """Shading by links should count outgoing links from the index."""
+        from zettelkasten_cli.services.calendar import (
+            Intensity,
+            collect_calendar,
+            shade_levels,
+        )
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        self._write_notes(root)
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            calendar = collect_calendar(config, 2026, Intensity.LINKS, vault_index)
+
+        assert calendar.days == {"2026-01-02": 2, "2026-03-01": 0}
+        assert shade_levels(calendar.days) == {"2026-01-02": 4, "2026-03-01": 1}
+        assert shade_levels({}) == {}
+
+    def test_cal_command(self, vault):
+        """`zk cal` should print JSON or a grid and reject unknown shadings."""
+        import json
+
+        root, _ = vault
+        self._write_notes(root)
+        as_json = runner.invoke(app, ["cal", "2026", "--json"])
+        grid = runner.invoke(app, ["cal", "2026"])
+        bad = runner.invoke(app, ["cal", "--by", "colour"])
+
+        assert as_json.exit_code == 0
+        assert json.loads(as_json.output)["weeks"] == {"2026-W01": 7}
+        assert grid.exit_code == 0
+        assert "Jan" in grid.output and "2 daily notes, 1 weekly notes" in grid.output
+        assert bad.exit_code == 1
+
+    def test_year_range(self, vault):
+        """The first and last representable years render; others are refused."""
+        for year in ("1", "9999"):
+            assert runner.invoke(app, ["cal", year]).exit_code == 0
+        for year in ("0", "10000"):
+            assert runner.invoke(app, ["cal", year]).exit_code == 2
+
+
+class TestCapture:
+    """Test quick capture through the spool."""
+
+    def _when(self, day: str, clock: str) -> float:
+        from datetime import datetime
+
+        return datetime.fromisoformat(f"{day}T{clock}").timestamp()
+
+    def test_fast_path_args(self):
+        """Only `capture TEXT...` without options should take the fast path."""
+        from zettelkasten_cli.cli import _fast_capture_text
+
+        assert _fast_capture_text(["capture", "buy", "milk"]) == "buy milk"
+        assert _fast_capture_text(["capture", "--merge"]) is None
+        assert _fast_capture_text(["capture"]) is None
+        assert _fast_capture_text(["new", "Title"]) is None
+
+    def test_merges_into_each_day_in_order(self, vault):
+        """Entries should land in the note of the day they were captured."""
+        from zettelkasten_cli.services.capture import merge_captures, spool_captures
+
+        _, config = vault
+        state_dir = config.paths.state_dir
+        spool_captures(state_dir, ["late"], self._when("2026-10-17", "23:59"))
+        spool_captures(
+            state_dir, ["one", "two\nlines"], self._when("2026-10-18", "08:05")
+        )
+
+        assert merge_captures(config) == 3
+        assert merge_captures(config) == 0
+
+        daily = config.paths.daily_notes
+        assert (daily / "2026-10-17.md").read_text().endswith("\n- 23:59 late")
+        assert (
+            (daily / "2026-10-18.md")
+            .read_text()
+            .endswith("\n- 08:05 one\n- 08:05 two\n  lines")
+        )
+        assert sorted(path.name for path in state_dir.iterdir()) == ["capture.lock"]
+
+    def test_resumes_interrupted_merge(self, vault):
+        """A merge that died should finish without losing or repeating entries."""
+        import json
+
+        from zettelkasten_cli.services.capture import merge_captures, spool_captures
+
+        _, config = vault
+        state_dir = config.paths.state_dir
+        state_dir.mkdir()
+        daily = config.paths.daily_notes
+        daily.mkdir(parents=True)
+        # Day 16 was merged and marked, day 17 written but not marked yet,
+        # day 18 not reached; the last capture was torn
+        records = [
+            {"day": "2026-10-16", "time": "09:00", "text": "done"},
+            {"day": "2026-10-17", "time": "10:00", "text": "written"},
+            {"day": "2026-10-18", "time": "11:00", "text": "pending"},
+            {"merged": "2026-10-16"},
+        ]
+        (state_dir / "capture.merging").write_text(
+            "".join(json.dumps(record) + "\n" for record in records) + '{"day": "20'
+        )
+        (daily / "2026-10-16.md").write_text("# 16\n- 09:00 done")
+        (daily / "2026-10-17.md").write_text("# 17\n\n- 10:00 written")
+        # A capture made after the crash waits for the next merge
+        spool_captures(state_dir, ["new"], self._when("2026-10-18", "12:00"))
+
+        assert merge_captures(config) == 2
+
+        assert (daily / "2026-10-16.md").read_text() == "# 16\n- 09:00 done"
+        assert (daily / "2026-10-17.md").read_text() == "# 17\n\n- 10:00 written"
+        assert (daily / "2026-10-18.md").read_text().endswith("\n- 11:00 pending")
+        assert not (state_dir / "capture.merging").exists()
+        assert merge_captures(config) == 1
+        assert (
+            (daily / "2026-10-18.md")
+            .read_text()
+            .endswith("\n- 11:00 pending\n- 12:00 new")
+        )
+
+    def test_capture_command(self, vault):
+        """`zk capture` should spool text or stdin lines and merge on request."""
+        root, _ = vault
+        first = runner.invoke(app, ["capture", "call", "Alice"])
+        piped = runner.invoke(app, ["capture", "-"], input="a\n\nb\n")
+        empty = runner.invoke(app, ["capture"])
+        merged = runner.invoke(app, ["capture", "--merge"])
+
+        assert (first.exit_code, piped.exit_code, merged.exit_code) == (0, 0, 0)
+        assert empty.exit_code == 1
+        [note] = (root / "periodic-notes" / "daily-notes").iterdir()
+        lines = note.read_text().splitlines()[-3:]
+        assert [line.split(" ", 2)[2] for line in lines] == ["call Alice", "a", "b"]
+
+    def test_fast_path_skips_configuration(self, tmp_path: Path):
+        """The fast path should spool without importing typer or the config."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "from zettelkasten_cli.cli import main; main()",
+                "capture",
+                "quick",
+                "thought",
+            ],
+            capture_output=True,
+            text=True,
+            env={
+                **os.environ,
+                "ZETTELKASTEN": str(tmp_path),
+                "PYTHONPATH": str(Path(__file__).parent.parent),
+            },
+            check=True,
+        )
+
+        spool = (tmp_path / ".zk" / "capture.spool").read_text()
+        assert '"text": "quick thought"' in spool
+        for module in ("typer", "rich", "zettelkasten_cli.config"):
+            assert f" {module}\n" not in result.stderr + "\n"
+
+
+class TestSectionInsert:
+    """Test adding text under a heading of a periodic note."""
+
+    def _daily(self, root: Path, heading: str, content: str):
+        from zettelkasten_cli.config import Config, EditorConfig, PathConfig
+        from zettelkasten_cli.models.periodic_note import daily
+
+        config = Config(
+            paths=PathConfig(root=root, daily_heading=heading), editor=EditorConfig()
+        )
+        note = daily(config)
+        note.note_path.parent.mkdir(parents=True)
+        note.note_path.write_text(content)
+        return note
+
+    def test_section_end(self):
+        """The section should end before the next heading of its level or above."""
+        from zettelkasten_cli.services.markdown import section_end
+
+        text = b"# Day\n\n## Notes\n- a\n### Sub\n- b\n\n## Tasks\n"
+        assert text[: section_end(text, "## Notes")].endswith(b"- b")
+        assert section_end(text, "## Tasks") == len(text)
+        assert section_end(text, "## Note") is None
+        assert section_end(b"## Notes\n\n# Next", "## Notes") == len(b"## Notes")
+
+    def test_append_splices_into_section(self, tmp_path: Path):
+        """Text should go at the end of the section, keeping what follows."""
+        note = self._daily(
+            tmp_path, "## Notes", "# Day\n\n## Notes\n- a\n\n## Tasks\n- [ ] t\n"
+        )
+        mode = note.note_path.stat().st_mode
+
+        note.append("\n[[Idea]]")
+
+        assert note.note_path.read_text() == (
+            "# Day\n\n## Notes\n- a\n[[Idea]]\n\n## Tasks\n- [ ] t\n"
+        )
+        assert note.note_path.stat().st_mode == mode
+
+    def test_append_adds_missing_heading(self, tmp_path: Path):
+        """Without the heading in the note, it should be added at the end."""
+        note = self._daily(tmp_path, "## Log", "# Day\n")
+
+        note.append("\n[[One]]")
+        note.append("\n[[Two]]")
+
+        assert note.note_path.read_text() == "# Day\n\n## Log\n[[One]]\n[[Two]]"
+
+    def test_writes_are_visible_after_flush(self, tmp_path: Path):
+        """A flush inside the block should write the text right away."""
+        note = self._daily(tmp_path, "## Notes", "## Notes\n\n## End\n")
+
+        with note.locked() as f:
+            f.write("\n[[A]]")
+            f.flush()
+            assert note.note_path.read_text() == "## Notes\n[[A]]\n\n## End\n"
+            f.write("\n[[B]]")
+
+        assert note.note_path.read_text() == "## Notes\n[[A]]\n[[B]]\n\n## End\n"
+
+
+class TestTags:
+    """Test the tag index."""
+
+    def test_extract_tags(self):
+        """Frontmatter and inline tags should be found once each, outside code."""
+        from zettelkasten_cli.services.markdown import extract_tags
+
+        text = (
+            "---\ntags: [zk, Reading]\n---\n# Title\n\n"
+            "Some #inline text, #zk again and #Project/ZK.\n"
+            "Not a#tag, #123 or `#code`.\n\n```\n#fenced\n```\n#y1984\n"
+        )
+        assert extract_tags(text) == ["zk", "Reading", "inline", "Project/ZK", "y1984"]
+        assert extract_tags("---\ntags: a, b\n---\n#A") == ["a", "b"]
+
+    def test_index_keeps_tags_up_to_date(self, vault):
+        """Tag counts and members should follow edits, deletes and nesting."""
+        from zettelkasten_cli.services.index import open_index
+
+        root, config = vault
+        (root / "A.md").write_text("#project/zk #idea")
+        (root / "B.md").write_text("---\ntags: [Project]\n---\n#IDEA")
+        (root / "C.md").write_text("#projects")
+        with open_index(config) as vault_index:
+            vault_index.refresh()
+            assert vault_index.tag_counts() == [
+                ("IDEA", 2),
+                ("Project", 1),
+                ("project/zk", 1),
+                ("projects", 1),
+            ]
+            assert [n.title for n in vault_index.tagged("#PROJECT")] == ["A", "B"]
+            assert [n.title for n in vault_index.tagged("project/zk")] == ["A"]
+
+            (root / "A.md").write_text("#other")
+            (root / "B.md").unlink()
+            vault_index.refresh()
+            assert vault_index.tag_counts() == [("other", 1), ("projects", 1)]
+            assert vault_index.tagged("idea") == []
+
+    def test_tags_command(self, vault):
+        """`zk tags --json` should list counts, and members given a tag."""
+        import json
+
+        root, _ = vault
+        (root / "A.md").write_text("#zk #idea")
+        (root / "B.md").write_text("#zk")
+        result = runner.invoke(app, ["tags", "--json"])
+        assert result.exit_code == 0
+        assert json.loads(result.output) == [
+            {"tag": "zk", "count": 2},
+            {"tag": "idea", "count": 1},
+        ]
+
+        result = runner.invoke(app, ["tags", "idea", "--vim"])
+        assert result.exit_code == 0
+        assert result.output == f"{root / 'A.md'}\n"
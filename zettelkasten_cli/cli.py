@@ -0,0 +1,191 @@
+"""
+Startup-optimized entry point for the `zk` command.
+
+Editor integrations spawn `zk new TITLE --vim` for every capture, and
+hotkeys and scripts fire `zk capture TEXT`, so those invocations are handled
+here without importing typer or rich. When a `zk serve` daemon is running,
+`new`, `day` and `week` are forwarded to it. Everything else is delegated to
+the typer app in `zettelkasten_cli.main`.
+"""
+
+import os
+import sys
+
+from zettelkasten_cli.services import trace
+
+# Period names for the daemon's day/week responses
+_PERIODS = {"day": "daily", "week": "weekly"}
+
+
+def _fast_new_title(args: list[str]) -> str | None:
+    """Get the title if args are exactly `new TITLE --vim` (in either order)."""
+    if len(args) != 3 or args[0] != "new" or "--vim" not in args[1:]:
+        return None
+
+    title = args[2] if args[1] == "--vim" else args[1]
+    if title.startswith("-"):
+        return None
+    return title
+
+
+def _fast_capture_text(args: list[str]) -> str | None:
+    """Get the text if args are exactly `capture TEXT...` without options."""
+    if len(args) < 2 or args[0] != "capture":
+        return None
+    if any(arg.startswith("-") for arg in args[1:]):
+        return None
+    return " ".join(args[1:])
+
+
+def _daemon_request(args: list[str]) -> dict | None:
+    """Get the daemon request for args the daemon can answer, if any."""
+    if args in (["day"], ["week"]):
+        return {"command": args[0]}
+
+    title = _fast_new_title(args)
+    if title is not None:
+        return {"command": "new", "title": title.strip(), "vim": True}
+    if len(args) == 2 and args[0] == "new" and not args[1].startswith("-"):
+        return {"command": "new", "title": args[1].strip(), "vim": False}
+    return None
+
+
+def _run_via_daemon(args: list[str]) -> int | None:
+    """
+    Forward a command to a running `zk serve` daemon.
+
+    Returns:
+        The exit code, or None if the command must run in-process.
+    """
+    payload = _daemon_request(args)
+    if payload is None or "ZETTELKASTEN" not in os.environ:
+        return None
+
+    from zettelkasten_cli import output
+    from zettelkasten_cli.exceptions import DaemonError, error_message, exit_code
+    from zettelkasten_cli.services.daemon_client import request, vault_settings
+
+    payload["root"] = os.environ["ZETTELKASTEN"]
+    payload["settings"] = vault_settings()
+    try:
+        response = request(payload)
+    except DaemonError as e:
+        # Running the command again here could create the note twice
+        output.error(error_message(e))
+        return exit_code(e)
+    if response is None:
+        return None
+
+    if not response["ok"]:
+        output.error(response["error"])
+        return response["code"]
+
+    if payload.get("vim"):
+        output.plain(response["path"])
+        return 0
+
+    if payload["command"] == "new":
+        output.success(f"Created note: {response['path']}")
+    elif response["created"]:
+        output.info(f"Created {_PERIODS[payload['command']]} note: {response['path']}")
+
+    # The editor runs here, in the client's terminal, not in the daemon
+    from pathlib import Path
+
+    from zettelkasten_cli.config import EditorConfig
+    from zettelkasten_cli.exceptions import EditorError
+    from zettelkasten_cli.services.editor import open_in_editor
+
+    try:
+        open_in_editor(Path(response["path"]), EditorConfig())
+    except EditorError as e:
+        output.error(str(e))
+        return 1
+    return 0
+
+
+def _run_fast_new(title: str) -> int:
+    """Create a note in vim mode, returning the exit code."""
+    with trace.span("import note"):
+        from zettelkasten_cli import output
+        from zettelkasten_cli.exceptions import (
+            EXPECTED_ERRORS,
+            error_message,
+            exit_code,
+        )
+        from zettelkasten_cli.models.note import create_note
+
+    try:
+        create_note(title=title.strip(), vim_mode=True)
+    except EXPECTED_ERRORS as e:
+        output.error(error_message(e))
+        return exit_code(e)
+    return 0
+
+
+def _run_fast_capture(text: str) -> int | None:
+    """
+    Spool a capture without loading the configuration.
+
+    Returns:
+        The exit code, or None if the vault is not set up (the typer app
+        then reports the configuration error).
+    """
+    root = os.environ.get("ZETTELKASTEN")
+    if not root or not os.path.isdir(os.path.expanduser(root)):
+        return None
+
+    with trace.span("import capture"):
+        from pathlib import Path
+
+        from zettelkasten_cli import output
+        from zettelkasten_cli.exceptions import (
+            EXPECTED_ERRORS,
+            error_message,
+            exit_code,
+        )
+        from zettelkasten_cli.services.capture import spool_captures
+
+    # Same as PathConfig.state_dir
+    state_dir = Path(root).expanduser().resolve() / ".zk"
+    try:
+        spool_captures(state_dir, [text])
+    except EXPECTED_ERRORS as e:
+        output.error(error_message(e))
+        return exit_code(e)
+    return 0
+
+
+def main() -> None:
+    """Run the CLI, taking the fast path when possible."""
+    args = sys.argv[1:]
+
+    # Enable tracing before anything else so the typer import is timed too;
+    # the app's --profile callback is then a no-op
+    trace.enable_from_env()
+    if args[:1] == ["--profile"]:
+        trace.enable()
+
+    with trace.span("zk", args=" ".join(args)):
+        code = _run_via_daemon(args)
+        if code is not None:
+            sys.exit(code)
+
+        title = _fast_new_title(args)
+        if title is not None:
+            sys.exit(_run_fast_new(title))
+
+        text = _fast_capture_text(args)
+        if text is not None:
+            code = _run_fast_capture(text)
+            if code is not None:
+                sys.exit(code)
+
+        with trace.span("import main"):
+            from zettelkasten_cli.main import app
+
+        app()
+
+
+if __name__ == "__main__":
+    main()
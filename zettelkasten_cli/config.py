@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from zettelkasten_cli.exceptions import ConfigurationError
+from zettelkasten_cli.services.trace import traced
 
 
 def _get_env(key: str, default: str | None = None) -> str | None:
@@ -35,6 +36,13 @@ class EditorConfig:
         or "+ normal Gzzo"
     )
     nvim_commands: list[str] = field(default_factory=lambda: _parse_nvim_commands())
+    # Address of a running Neovim to open notes in; $NVIM is set by Neovim
+    # for processes started in its terminal
+    nvim_server: str | None = field(
+        default_factory=lambda: _get_env("ZETTELKASTEN_NVIM_SERVER")
+        or _get_env("NVIM")
+        or None
+    )
 
     @property
     def is_nvim(self) -> bool:
@@ -71,6 +79,24 @@ class PathConfig:
         )
         or "periodic-notes/weekly-notes"
     )
+    monthly_dir: str = field(
+        default_factory=lambda: _get_env(
+            "ZETTELKASTEN_MONTHLY_DIR", "periodic-notes/monthly-notes"
+        )
+        or "periodic-notes/monthly-notes"
+    )
+    quarterly_dir: str = field(
+        default_factory=lambda: _get_env(
+            "ZETTELKASTEN_QUARTERLY_DIR", "periodic-notes/quarterly-notes"
+        )
+        or "periodic-notes/quarterly-notes"
+    )
+    yearly_dir: str = field(
+        default_factory=lambda: _get_env(
+            "ZETTELKASTEN_YEARLY_DIR", "periodic-notes/yearly-notes"
+        )
+        or "periodic-notes/yearly-notes"
+    )
     daily_template: str = field(
         default_factory=lambda: _get_env("ZETTELKASTEN_DAILY_TEMPLATE", "zk/daily.md")
         or "zk/daily.md"
@@ -79,6 +105,31 @@ class PathConfig:
         default_factory=lambda: _get_env("ZETTELKASTEN_WEEKLY_TEMPLATE", "zk/weekly.md")
         or "zk/weekly.md"
     )
+    monthly_template: str = field(
+        default_factory=lambda: _get_env(
+            "ZETTELKASTEN_MONTHLY_TEMPLATE", "zk/monthly.md"
+        )
+        or "zk/monthly.md"
+    )
+    quarterly_template: str = field(
+        default_factory=lambda: _get_env(
+            "ZETTELKASTEN_QUARTERLY_TEMPLATE", "zk/quarterly.md"
+        )
+        or "zk/quarterly.md"
+    )
+    yearly_template: str = field(
+        default_factory=lambda: _get_env("ZETTELKASTEN_YEARLY_TEMPLATE", "zk/yearly.md")
+        or "zk/yearly.md"
+    )
+    note_template: str = field(
+        default_factory=lambda: _get_env("ZETTELKASTEN_NOTE_TEMPLATE", "zk/note.md")
+        or "zk/note.md"
+    )
+    # Heading (e.g. "## Notes") whose section links and captures are added
+    # to in the daily note; empty to add them at the end
+    daily_heading: str = field(
+        default_factory=lambda: _get_env("ZETTELKASTEN_DAILY_HEADING", "") or ""
+    )
 
     @property
     def inbox(self) -> Path:
@@ -95,6 +146,31 @@ class PathConfig:
         """Full path to weekly notes directory."""
         return self.root / self.weekly_dir
 
+    @property
+    def monthly_notes(self) -> Path:
+        """Full path to monthly notes directory."""
+        return self.root / self.monthly_dir
+
+    @property
+    def quarterly_notes(self) -> Path:
+        """Full path to quarterly notes directory."""
+        return self.root / self.quarterly_dir
+
+    @property
+    def yearly_notes(self) -> Path:
+        """Full path to yearly notes directory."""
+        return self.root / self.yearly_dir
+
+    @property
+    def state_dir(self) -> Path:
+        """Full path to the CLI's private state directory."""
+        return self.root / ".zk"
+
+    @property
+    def index_path(self) -> Path:
+        """Full path to the vault index database."""
+        return self.state_dir / "index.db"
+
     @property
     def daily_template_path(self) -> Path:
         """Full path to daily template."""
@@ -105,6 +181,26 @@ class PathConfig:
         """Full path to weekly template."""
         return self.root / self.weekly_template
 
+    @property
+    def monthly_template_path(self) -> Path:
+        """Full path to monthly template."""
+        return self.root / self.monthly_template
+
+    @property
+    def quarterly_template_path(self) -> Path:
+        """Full path to quarterly template."""
+        return self.root / self.quarterly_template
+
+    @property
+    def yearly_template_path(self) -> Path:
+        """Full path to yearly template."""
+        return self.root / self.yearly_template
+
+    @property
+    def note_template_path(self) -> Path:
+        """Full path to new note template."""
+        return self.root / self.note_template
+
 
 @dataclass(frozen=True)
 class Config:
@@ -114,6 +210,7 @@ class Config:
     editor: EditorConfig
 
     @classmethod
+    @traced("config.load")
     def load(cls) -> "Config":
         """Load configuration from environment variables."""
         root_str = _get_env_required("ZETTELKASTEN")
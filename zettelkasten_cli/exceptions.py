@@ -35,3 +35,52 @@ class EditorError(ZettelkastenError):
     """Raised when editor operations fail."""
 
     pass
+
+
+class VaultIndexError(ZettelkastenError):
+    """Raised when the vault index cannot be read or updated."""
+
+    pass
+
+
+class PeriodError(ZettelkastenError):
+    """Raised when a periodic note date or date range is invalid."""
+
+    pass
+
+
+class DaemonError(ZettelkastenError):
+    """Raised when the background daemon cannot be started or answers badly."""
+
+    pass
+
+
+class RenameError(ZettelkastenError):
+    """Raised when a note cannot be renamed or a rename cannot be recovered."""
+
+    pass
+
+
+class CaptureError(ZettelkastenError):
+    """Raised when a capture cannot be spooled or merged."""
+
+    pass
+
+
+# Failures commands report as a message; anything else is a bug and keeps
+# its traceback
+EXPECTED_ERRORS = (ZettelkastenError, OSError)
+
+
+def error_message(e: Exception) -> str:
+    """Get the user-facing message for an exception."""
+    if isinstance(e, ConfigurationError):
+        return f"Configuration error: {e}"
+    if isinstance(e, ZettelkastenError):
+        return str(e)
+    return f"Unexpected error: {e}"
+
+
+def exit_code(e: Exception) -> int:
+    """Get the process exit code for an exception."""
+    return 2 if isinstance(e, ConfigurationError) else 1
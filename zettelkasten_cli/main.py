@@ -1,19 +1,36 @@
 """CLI entry point for zettelkasten-cli."""
 
-from typing import Optional
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Annotated
 
 import typer
-from typing_extensions import Annotated
+from rich.markup import escape
 
 from zettelkasten_cli import output
 from zettelkasten_cli.exceptions import (
-    ConfigurationError,
-    NoteExistsError,
+    EXPECTED_ERRORS,
     NoteTitleError,
+    RenameError,
     ZettelkastenError,
+    error_message,
+    exit_code,
 )
-from zettelkasten_cli.models.note import create_note
-from zettelkasten_cli.models.periodic_note import daily, weekly
+from zettelkasten_cli.models.note import create_note, create_note_batch
+from zettelkasten_cli.models.periodic_note import Period, periodic
+
+# Commands import the services they need when they run, so that commands
+# which do not touch the vault index (new/day/week) never load SQLite.
+# See output.py for why `typing.TYPE_CHECKING` is not used.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from zettelkasten_cli.services.calendar import CalendarYear
+    from zettelkasten_cli.services.doctor import BrokenLink
+    from zettelkasten_cli.services.graph import Neighbour
+    from zettelkasten_cli.services.index import RefreshStats
 
 app = typer.Typer(
     name="zk",
@@ -22,71 +39,1072 @@ app = typer.Typer(
 )
 
 
+@app.callback()
+def global_options(
+    profile: Annotated[
+        bool,
+        typer.Option(
+            "--profile",
+            help="Print a timing breakdown to stderr (see also ZK_TRACE)",
+        ),
+    ] = False,
+) -> None:
+    """Handle options that apply to every command."""
+    if profile:
+        from zettelkasten_cli.services import trace
+
+        trace.enable()
+
+
 def handle_error(e: Exception) -> None:
     """Handle exceptions and exit with appropriate code."""
-    if isinstance(e, ConfigurationError):
-        output.error(f"Configuration error: {e}")
-        raise typer.Exit(code=2)
-    elif isinstance(e, (NoteExistsError, NoteTitleError)):
-        output.error(str(e))
-        raise typer.Exit(code=1)
-    elif isinstance(e, ZettelkastenError):
-        output.error(str(e))
-        raise typer.Exit(code=1)
-    else:
-        output.error(f"Unexpected error: {e}")
-        raise typer.Exit(code=1)
+    output.error(error_message(e))
+    raise typer.Exit(code=exit_code(e))
 
 
 @app.command()
 def new(
-    title: Annotated[Optional[str], typer.Argument(help="Note title")] = None,
+    title: Annotated[str | None, typer.Argument(help="Note title")] = None,
     vim: Annotated[
         bool, typer.Option("--vim", help="Output path for Neovim integration")
     ] = False,
+    batch: Annotated[
+        Path | None,
+        typer.Option(
+            "--batch",
+            help="Create notes from a file of titles or NDJSON ('-' for stdin)",
+        ),
+    ] = None,
 ) -> None:
     """
     Create a new note in the inbox.
 
     If no title is provided, you will be prompted to enter one.
     The note is automatically linked in today's daily note.
+
+    With --batch, one note is created per line of plain titles or NDJSON
+    records ({"title": ..., "body": ...}). The batch is validated up front
+    and all links are added to the daily note in one go.
     """
     try:
+        if batch is not None:
+            if title:
+                raise NoteTitleError("Pass either a title or --batch, not both.")
+            if str(batch) == "-":
+                create_note_batch(sys.stdin, vim_mode=vim)
+            else:
+                with batch.open(encoding="utf-8") as lines:
+                    create_note_batch(lines, vim_mode=vim)
+            return
+
         # Prompt for title if not provided
         if not title:
             title = typer.prompt("Enter note title")
 
         create_note(title=title.strip(), vim_mode=vim)
 
-    except Exception as e:
+    except EXPECTED_ERRORS as e:
         handle_error(e)
 
 
+# Shared by the periodic note commands
+RangeOption = Annotated[
+    str | None,
+    typer.Option(
+        "--range",
+        help="Create all missing notes in a range, e.g. 2026-01-01..2026-12-31",
+    ),
+]
+
+
+def _open_periodic(period: Period, date_range: str | None) -> None:
+    """Open the current periodic note, or create the notes in a range."""
+    if date_range is None:
+        periodic(period).open()
+        return
+
+    from zettelkasten_cli.models.periodic_note import create_range, parse_range
+
+    start, end = parse_range(period, date_range)
+    created, existing = create_range(period, start, end)
+    output.success(
+        f"Created {len(created)} {period.value} notes ({existing} already existed)"
+    )
+
+
 @app.command()
-def day() -> None:
+def day(date_range: RangeOption = None) -> None:
     """
     Open today's daily note.
 
-    Creates the note if it doesn't exist.
+    Creates the note if it doesn't exist, and merges spooled captures (see
+    `zk capture`) first. With --range, creates the daily notes for every day
+    in the range instead.
     """
     try:
-        daily().open()
-    except Exception as e:
+        if date_range is None:
+            _merge_captures()
+        _open_periodic(Period.DAILY, date_range)
+    except EXPECTED_ERRORS as e:
         handle_error(e)
 
 
+def _merge_captures() -> int:
+    """Fold spooled captures into the daily notes, reporting how many."""
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.capture import merge_captures
+
+    count = merge_captures(get_config())
+    if count:
+        output.info(f"Merged {count} captured entries into the daily notes")
+    return count
+
+
 @app.command()
-def week() -> None:
+def week(date_range: RangeOption = None) -> None:
     """
     Open this week's weekly note.
 
-    Creates the note if it doesn't exist.
+    Creates the note if it doesn't exist. With --range, creates the weekly
+    notes for every week in the range instead.
+    """
+    try:
+        _open_periodic(Period.WEEKLY, date_range)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def month(date_range: RangeOption = None) -> None:
+    """
+    Open this month's monthly note.
+
+    Creates the note if it doesn't exist. With --range, creates the monthly
+    notes for every month in the range instead.
+    """
+    try:
+        _open_periodic(Period.MONTHLY, date_range)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def quarter(date_range: RangeOption = None) -> None:
+    """
+    Open this quarter's quarterly note.
+
+    Creates the note if it doesn't exist. With --range, creates the
+    quarterly notes for every quarter in the range instead.
+    """
+    try:
+        _open_periodic(Period.QUARTERLY, date_range)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def year(date_range: RangeOption = None) -> None:
+    """
+    Open this year's yearly note.
+
+    Creates the note if it doesn't exist. With --range, creates the yearly
+    notes for every year in the range instead.
+    """
+    try:
+        _open_periodic(Period.YEARLY, date_range)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def capture(
+    text: Annotated[
+        list[str] | None,
+        typer.Argument(help="Text to capture, or - to read one entry per line"),
+    ] = None,
+    merge: Annotated[
+        bool,
+        typer.Option("--merge", help="Merge spooled captures into the daily notes"),
+    ] = False,
+) -> None:
+    """
+    Capture a thought for today's daily note.
+
+    The text is appended to a spool with a single write, and merged into the
+    daily note as a timestamped list item on the next `zk day` or
+    `zk capture --merge`.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.exceptions import CaptureError
+    from zettelkasten_cli.services.capture import spool_captures
+
+    try:
+        if text == ["-"]:
+            texts = [line for line in sys.stdin.read().splitlines() if line.strip()]
+        elif text:
+            texts = [" ".join(text)]
+        elif merge:
+            texts = []
+        else:
+            raise CaptureError("Nothing to capture.")
+
+        if texts:
+            spool_captures(get_config().paths.state_dir, texts)
+        if merge:
+            count = _merge_captures()
+            if not count:
+                output.info("No captures to merge.")
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def index(
+    rebuild: Annotated[
+        bool, typer.Option("--rebuild", help="Discard the index and rebuild it")
+    ] = False,
+) -> None:
+    """
+    Build or refresh the vault index.
+
+    Only notes changed since the last run are re-read.
+    """
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        with open_index() as vault_index:
+            stats = vault_index.rebuild() if rebuild else vault_index.refresh()
+
+        output.success(
+            f"Indexed {stats.total} notes "
+            f"({stats.added} added, {stats.updated} updated, "
+            f"{stats.removed} removed) in {stats.elapsed:.2f}s"
+        )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def search(
+    query: Annotated[str, typer.Argument(help='Search terms, "phrases" or prefix*')],
+    limit: Annotated[
+        int, typer.Option("--limit", "-n", help="Maximum number of results")
+    ] = 20,
+    refresh: Annotated[
+        bool,
+        typer.Option(
+            "--refresh/--no-refresh", help="Pick up changed notes before searching"
+        ),
+    ] = True,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+) -> None:
+    """
+    Full-text search the vault, best matches first.
+
+    All terms must match. Quote terms to search for an exact phrase and end
+    a term with * to match it as a prefix.
+    """
+    from zettelkasten_cli.services.index import SNIPPET_END, SNIPPET_START, open_index
+
+    try:
+        with open_index() as vault_index:
+            if refresh:
+                vault_index.refresh()
+            results = vault_index.search(query, limit=limit)
+
+        if not results and not vim:
+            output.warning("No matching notes.")
+
+        for result in results:
+            if vim:
+                output.plain(str(result.note.path))
+                continue
+
+            snippet = (
+                escape(" ".join(result.snippet.split()))
+                .replace(SNIPPET_START, "[bold yellow]")
+                .replace(SNIPPET_END, "[/bold yellow]")
+            )
+            output.result(
+                f"[bold]{escape(result.note.title)}[/bold] "
+                f"[dim]{escape(str(result.note.path))}[/dim]\n  {snippet}"
+            )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def find(
+    query: Annotated[str, typer.Argument(help="Approximate note title")],
+    limit: Annotated[
+        int, typer.Option("--limit", "-n", help="Maximum number of results")
+    ] = 10,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Output results as JSON")
+    ] = False,
+) -> None:
+    """
+    Find notes by approximate title, best matches first.
+    """
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        with open_index() as vault_index:
+            if refresh:
+                vault_index.refresh()
+            results = vault_index.find(query, limit=limit)
+
+        if as_json:
+            output.plain(
+                json.dumps(
+                    [
+                        {
+                            "title": r.note.title,
+                            "path": str(r.note.path),
+                            "score": round(r.score, 4),
+                        }
+                        for r in results
+                    ]
+                )
+            )
+            return
+
+        if not results and not vim:
+            output.warning("No matching notes.")
+
+        for result in results:
+            if vim:
+                output.plain(str(result.note.path))
+            else:
+                output.result(
+                    f"[bold]{escape(result.note.title)}[/bold] "
+                    f"[dim]{escape(str(result.note.path))}[/dim]"
+                )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+def _print_neighbours(neighbours: list[Neighbour], depth: int, vim: bool) -> None:
+    """Print link graph neighbours (paths only in vim mode)."""
+    if not neighbours and not vim:
+        output.warning("No linked notes.")
+
+    for neighbour in neighbours:
+        if vim:
+            for note in neighbour.notes:
+                output.plain(str(note.path))
+            continue
+
+        prefix = f"[dim]{neighbour.distance}[/dim] " if depth > 1 else ""
+        if neighbour.exists:
+            paths = ", ".join(escape(str(note.path)) for note in neighbour.notes)
+            output.result(
+                f"{prefix}[bold]{escape(neighbour.title)}[/bold] [dim]{paths}[/dim]"
+            )
+        else:
+            output.result(f"{prefix}[red]{escape(neighbour.title)} (missing)[/red]")
+
+
+@app.command()
+def links(
+    title: Annotated[str, typer.Argument(help="Note title")],
+    depth: Annotated[
+        int, typer.Option("--depth", "-d", min=1, help="Number of hops to follow")
+    ] = 1,
+    both: Annotated[
+        bool, typer.Option("--both", help="Follow backlinks as well as links")
+    ] = False,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+) -> None:
+    """
+    Show the notes a note links to.
+
+    With --depth, also follow the links of linked notes.
     """
+    from zettelkasten_cli.services.graph import Direction, neighbourhood
+    from zettelkasten_cli.services.index import open_index
+
     try:
-        weekly().open()
-    except Exception as e:
+        with open_index() as vault_index:
+            if refresh:
+                vault_index.refresh()
+            direction = Direction.BOTH if both else Direction.OUTGOING
+            neighbours = neighbourhood(vault_index, title, depth, direction)
+
+        _print_neighbours(neighbours, depth, vim)
+    except EXPECTED_ERRORS as e:
         handle_error(e)
 
 
+@app.command()
+def backlinks(
+    title: Annotated[str, typer.Argument(help="Note title")],
+    depth: Annotated[
+        int, typer.Option("--depth", "-d", min=1, help="Number of hops to follow")
+    ] = 1,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+) -> None:
+    """
+    Show the notes linking to a note.
+
+    With --depth, also follow the backlinks of linking notes.
+    """
+    from zettelkasten_cli.services.graph import Direction, neighbourhood
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        with open_index() as vault_index:
+            if refresh:
+                vault_index.refresh()
+            neighbours = neighbourhood(vault_index, title, depth, Direction.INCOMING)
+
+        _print_neighbours(neighbours, depth, vim)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def rename(
+    old: Annotated[
+        str | None, typer.Argument(help="Title of the note to rename")
+    ] = None,
+    new: Annotated[str | None, typer.Argument(help="New title")] = None,
+    resume: Annotated[
+        bool, typer.Option("--resume", help="Finish an interrupted rename")
+    ] = False,
+    rollback: Annotated[
+        bool, typer.Option("--rollback", help="Undo an interrupted rename")
+    ] = False,
+) -> None:
+    """
+    Rename a note and update every link to it.
+
+    Only the notes linking to it are read and rewritten, each atomically. If
+    a rename is interrupted, finish it with --resume or undo it with --rollback.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.index import open_index
+    from zettelkasten_cli.services.rename import Renamer
+
+    try:
+        if resume and rollback:
+            raise RenameError("Pass either --resume or --rollback, not both.")
+        if not (resume or rollback) and (old is None or new is None):
+            raise RenameError("Pass the current and the new title.")
+
+        config = get_config()
+        with open_index(config) as vault_index:
+            renamer = Renamer(config, vault_index)
+            if rollback:
+                plan, kept = renamer.rollback()
+                for path in kept:
+                    output.warning(f"Not restored (changed since): {path}")
+                output.success(f"Rolled back renaming '{plan.old_title}'.")
+                return
+
+            if resume:
+                result = renamer.resume()
+            else:
+                vault_index.refresh()
+                result = renamer.rename(old, new)
+
+        output.success(
+            f"Renamed to {result.new_path} "
+            f"({result.links} links in {len(result.rewritten)} notes updated)"
+        )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+inbox_app = typer.Typer(help="List and triage the notes in the inbox.")
+app.add_typer(inbox_app, name="inbox")
+
+
+@inbox_app.callback(invoke_without_command=True)
+def inbox(
+    ctx: typer.Context,
+    sort: Annotated[
+        str, typer.Option("--sort", "-s", help="Sort by age, size, links or title")
+    ] = "age",
+    reverse: Annotated[
+        bool, typer.Option("--reverse", "-r", help="Sort in descending order")
+    ] = False,
+    limit: Annotated[
+        int | None, typer.Option("--limit", "-n", help="Maximum number of notes")
+    ] = None,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+) -> None:
+    """
+    List the notes in the inbox, oldest first.
+
+    Sorting by age, size or title reads the inbox folder in one pass;
+    sorting by links (the number of notes linking to each) uses the vault
+    index.
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.inbox import InboxSort, age_days, list_inbox
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        config = get_config()
+        try:
+            order = InboxSort(sort)
+        except ValueError:
+            raise ZettelkastenError(
+                f"Cannot sort by '{sort}'; use age, size, links or title."
+            ) from None
+
+        if order is InboxSort.LINKS:
+            with open_index(config) as vault_index:
+                vault_index.refresh(under=config.paths.inbox)
+                notes = list_inbox(config, order, reverse, vault_index)
+        else:
+            notes = list_inbox(config, order, reverse)
+
+        if not notes and not vim:
+            output.warning("The inbox is empty.")
+
+        notes = notes[:limit] if limit is not None else notes
+        if vim:
+            output.stream(str(note.path) for note in notes)
+        else:
+            output.stream(
+                f"{age_days(note.created_ns):>5}d {note.size:>8} "
+                + (f"{note.links:>5} " if note.links is not None else "")
+                + note.title
+                for note in notes
+            )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@inbox_app.command("move")
+def inbox_move(
+    pattern: Annotated[
+        str, typer.Argument(help='Title glob, e.g. "Meeting *" (quote it)')
+    ],
+    destination: Annotated[
+        Path, typer.Argument(help="Folder to move to, relative to the vault")
+    ],
+    dry_run: Annotated[
+        bool, typer.Option("--dry-run", help="Only show what would be moved")
+    ] = False,
+) -> None:
+    """
+    Move the inbox notes whose title matches a pattern into a folder.
+
+    Nothing is moved if any note would overwrite another. Links keep working,
+    since wikilinks resolve by title.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.inbox import match_inbox, move_notes
+    from zettelkasten_cli.services.index import VaultIndex
+
+    try:
+        config = get_config()
+        paths = match_inbox(config, pattern)
+        if not paths:
+            output.warning("No matching notes.")
+            return
+        if dry_run:
+            output.stream(str(path) for path in paths)
+            return
+
+        # Update the index only if one has been built
+        vault_index = (
+            VaultIndex.open(config) if config.paths.index_path.exists() else None
+        )
+        try:
+            moved = 0
+            for _, target in move_notes(config, paths, destination, vault_index):
+                output.plain(str(target))
+                moved += 1
+        finally:
+            if vault_index is not None:
+                vault_index.close()
+        output.success(f"Moved {moved} notes to {destination}")
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def export(
+    destination: Annotated[
+        Path | None,
+        typer.Argument(
+            help="File to write, e.g. vault.ndjson.gz or vault.tar.zst (default stdout)"
+        ),
+    ] = None,
+    fmt: Annotated[
+        str | None,
+        typer.Option("--format", help="ndjson or tar (default: from the file name)"),
+    ] = None,
+    compress: Annotated[
+        str | None,
+        typer.Option(
+            "--compress", help="gzip, zstd or none (default: from the file name)"
+        ),
+    ] = None,
+    watermark: Annotated[
+        Path | None,
+        typer.Option(
+            "--watermark",
+            help="Only export notes changed since the last export using this file",
+        ),
+    ] = None,
+) -> None:
+    """
+    Export the vault as NDJSON records or a tar archive of the notes.
+
+    Notes are streamed, so memory use does not grow with the vault. NDJSON
+    records hold each note's path, title, modification time, frontmatter,
+    links and body.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.export import (
+        Compression,
+        ExportFormat,
+        export_vault,
+        guess_format,
+    )
+
+    try:
+        config = get_config()
+        guessed_format, guessed_compression = (
+            guess_format(destination)
+            if destination is not None
+            else (ExportFormat.NDJSON, Compression.NONE)
+        )
+        try:
+            export_format = ExportFormat(fmt) if fmt else guessed_format
+            compression = Compression(compress) if compress else guessed_compression
+        except ValueError as e:
+            raise ZettelkastenError(f"Invalid export option: {e}") from None
+
+        stats = export_vault(
+            config.paths.root,
+            destination,
+            export_format,
+            compression,
+            watermark=watermark,
+        )
+        if destination is not None:
+            unchanged = f", {stats.unchanged} unchanged" if watermark else ""
+            output.success(
+                f"Exported {stats.notes} notes{unchanged} to {destination} "
+                f"in {stats.elapsed:.2f}s"
+            )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def serve(
+    socket: Annotated[
+        Path | None, typer.Option("--socket", help="Unix socket to listen on")
+    ] = None,
+    watch: Annotated[
+        bool, typer.Option("--watch", help="Also keep the vault index up to date")
+    ] = False,
+) -> None:
+    """
+    Run a background daemon that answers new/day/week requests.
+
+    While it runs, `zk new`, `zk day` and `zk week` are forwarded to it,
+    skipping configuration loading on every call. With --watch it also
+    runs `zk watch` in the background. Stop it with Ctrl-C.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.daemon import serve as serve_daemon
+    from zettelkasten_cli.services.daemon_client import socket_path
+
+    try:
+        config = get_config()
+        path = socket or socket_path()
+        output.success(f"Listening on {path}")
+        serve_daemon(config, path, watch=watch)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def watch(
+    poll: Annotated[
+        bool, typer.Option("--poll", help="Poll for changes instead of using inotify")
+    ] = False,
+    interval: Annotated[
+        float, typer.Option("--interval", help="Polling interval in seconds")
+    ] = 1.0,
+) -> None:
+    """
+    Keep the vault index up to date as files change.
+
+    Picks up edits, renames and deletions made by any program, so `zk search`,
+    `zk find` and `zk links` never need to rescan the vault. Stop it with Ctrl-C.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.watcher import watch as watch_vault
+
+    def report(stats: RefreshStats) -> None:
+        output.result(
+            f"{stats.added} added, {stats.updated} updated, "
+            f"{stats.removed} removed in {stats.elapsed * 1000:.1f}ms"
+        )
+
+    try:
+        config = get_config()
+        output.success(f"Watching {config.paths.root}")
+        watch_vault(config, poll=poll, interval=interval, on_update=report)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def stats(
+    days: Annotated[
+        int, typer.Option("--days", help="Days of daily growth to show")
+    ] = 14,
+    weeks: Annotated[
+        int, typer.Option("--weeks", help="Weeks of weekly growth to show")
+    ] = 8,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Output statistics as JSON")
+    ] = False,
+) -> None:
+    """
+    Show vault statistics: note, word and link counts and growth over time.
+
+    Counts come from the vault index, so only notes changed since the last
+    run are re-read.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.index import open_index
+    from zettelkasten_cli.services.stats import collect_stats
+
+    try:
+        config = get_config()
+        with open_index(config) as vault_index:
+            if refresh:
+                vault_index.refresh()
+            vault_stats = collect_stats(vault_index, config, days=days, weeks=weeks)
+
+        if as_json:
+            output.plain(json.dumps(vault_stats.to_dict()))
+            return
+
+        rows = [
+            ("Notes", f"{vault_stats.notes}"),
+            ("Inbox", f"{vault_stats.inbox}"),
+            ("Daily notes", f"{vault_stats.daily}"),
+            ("Weekly notes", f"{vault_stats.weekly}"),
+            ("Words", f"{vault_stats.words} ({vault_stats.words_per_note:.0f}/note)"),
+            (
+                "Links",
+                (
+                    f"{vault_stats.links} ({vault_stats.links_per_note:.1f}/note, "
+                    f"{vault_stats.linking_notes} notes link out)"
+                ),
+            ),
+        ]
+        for label, value in rows:
+            output.result(f"[bold]{label:<13}[/bold]{value}")
+        _print_growth("Created per day", vault_stats.created_per_day)
+        _print_growth("Created per week", vault_stats.created_per_week)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def doctor(
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Output the report as JSON")
+    ] = False,
+) -> None:
+    """
+    Check the vault for broken links, orphans, empty notes and duplicate titles.
+
+    Orphans are inbox notes no other note links to. Links to periodic notes
+    that do not exist yet (e.g. tomorrow's daily note) are listed apart and
+    are not problems. Exits with status 1 if any problem is found.
+    """
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.doctor import diagnose
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        config = get_config()
+        with open_index(config) as vault_index:
+            if refresh:
+                vault_index.refresh()
+            report = diagnose(vault_index, config)
+
+        if as_json:
+            output.plain(json.dumps(report.to_dict()))
+        elif report.ok:
+            output.success("No problems found.")
+        else:
+            _print_links("Broken links", report.broken_links, "red")
+            _print_problems("Orphans", [escape(str(path)) for path in report.orphans])
+            _print_problems("Empty notes", [escape(str(path)) for path in report.empty])
+            _print_problems(
+                "Duplicate titles",
+                [
+                    ", ".join(escape(str(path)) for path in group)
+                    for group in report.duplicates
+                ],
+            )
+        if not as_json:
+            _print_links(
+                "Periodic notes not created yet", report.missing_periodic, "dim"
+            )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+    if not report.ok:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def cal(
+    year: Annotated[
+        int | None,
+        typer.Argument(min=1, max=9999, help="Year to show (default: this year)"),
+    ] = None,
+    by: Annotated[
+        str, typer.Option("--by", help="Shade notes by size or links")
+    ] = "size",
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Output the calendar as JSON")
+    ] = False,
+) -> None:
+    """
+    Show a calendar of the year's daily and weekly notes.
+
+    Darker cells are bigger notes (or, with --by links, notes with more
+    links). The note folders are listed once and the listing is cached
+    until they change.
+    """
+    from datetime import date
+
+    from zettelkasten_cli.config import get_config
+    from zettelkasten_cli.services.calendar import Intensity, collect_calendar
+
+    try:
+        config = get_config()
+        try:
+            intensity = Intensity(by)
+        except ValueError:
+            raise ZettelkastenError(
+                f"Cannot shade by '{by}'; use size or links."
+            ) from None
+        if year is None:
+            year = date.today().year
+
+        if intensity is Intensity.LINKS:
+            from zettelkasten_cli.services.index import open_index
+
+            with open_index(config) as vault_index:
+                vault_index.refresh(under=config.paths.daily_notes)
+                vault_index.refresh(under=config.paths.weekly_notes)
+                calendar = collect_calendar(config, year, intensity, vault_index)
+        else:
+            calendar = collect_calendar(config, year, intensity)
+
+        if as_json:
+            output.plain(json.dumps(calendar.to_dict()))
+        else:
+            _print_calendar(calendar)
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+@app.command()
+def tags(
+    tag: Annotated[
+        str | None,
+        typer.Argument(help="List the notes with this tag (or one nested under it)"),
+    ] = None,
+    refresh: Annotated[
+        bool,
+        typer.Option("--refresh/--no-refresh", help="Pick up changed notes first"),
+    ] = True,
+    vim: Annotated[
+        bool, typer.Option("--vim", help="Output paths for Neovim integration")
+    ] = False,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Output results as JSON")
+    ] = False,
+) -> None:
+    """
+    List tags with their note counts, or the notes with a tag.
+
+    Tags come from the frontmatter `tags` field and inline #tags. They are
+    kept in the vault index, so only notes changed since the last run are
+    re-read.
+    """
+    from zettelkasten_cli.services.index import open_index
+
+    try:
+        with open_index() as vault_index:
+            if refresh:
+                vault_index.refresh()
+            if tag is None:
+                counts = vault_index.tag_counts()
+            else:
+                notes = vault_index.tagged(tag)
+
+        if tag is None:
+            if as_json:
+                output.plain(
+                    json.dumps([{"tag": name, "count": n} for name, n in counts])
+                )
+                return
+            if not counts and not vim:
+                output.warning("No tags.")
+            for name, n in counts:
+                if vim:
+                    output.plain(name)
+                else:
+                    output.result(f"{n:>6}  #{escape(name)}")
+            return
+
+        if as_json:
+            output.plain(
+                json.dumps(
+                    [{"title": note.title, "path": str(note.path)} for note in notes]
+                )
+            )
+            return
+        if not notes and not vim:
+            output.warning(f"No notes tagged #{escape(tag.lstrip('#'))}.")
+        for note in notes:
+            if vim:
+                output.plain(str(note.path))
+            else:
+                output.result(
+                    f"[bold]{escape(note.title)}[/bold] "
+                    f"[dim]{escape(str(note.path))}[/dim]"
+                )
+    except EXPECTED_ERRORS as e:
+        handle_error(e)
+
+
+def _print_problems(heading: str, lines: list[str]) -> None:
+    """Print one section of the doctor report, if it has entries."""
+    if not lines:
+        return
+    output.result(f"[bold]{heading}[/bold] [dim]({len(lines)})[/dim]")
+    for line in lines:
+        output.result(f"  {line}")
+
+
+def _print_links(heading: str, links: list[BrokenLink], style: str) -> None:
+    """Print a doctor report section of links, each after the note it is in."""
+    lines = []
+    for link in links:
+        target = escape(f"[[{link.target}]]")
+        lines.append(f"{escape(str(link.path))} [{style}]{target}[/{style}]")
+    _print_problems(heading, lines)
+
+
+def _print_growth(heading: str, counts: dict[str, int]) -> None:
+    """Print note counts per period as a bar chart."""
+    if not counts:
+        return
+    output.result(f"\n[bold]{heading}[/bold]")
+    peak = max(counts.values()) or 1
+    for period, count in counts.items():
+        bar = "\u2588" * round(30 * count / peak)
+        output.result(f"{period:<10} {count:>4} [green]{bar}[/green]")
+
+
+def _print_calendar(calendar: CalendarYear) -> None:
+    """Print a year of daily and weekly notes as a contribution-style grid."""
+    from datetime import date, timedelta
+
+    from zettelkasten_cli.services.calendar import shade_levels
+
+    shades = ["grey30", "dark_green", "green4", "green3", "green1"]
+    day_levels = shade_levels(calendar.days)
+    week_levels = shade_levels(calendar.weeks)
+
+    first = date(calendar.year, 1, 1)
+    last = date(calendar.year, 12, 31)
+    # Counted rather than stepped past `last`, which may be date.max's year
+    start = first - timedelta(days=first.weekday())
+    mondays = [
+        start + timedelta(weeks=week) for week in range((last - start).days // 7 + 1)
+    ]
+
+    # Month names above the column holding the month's first day
+    months = [" "] * (2 * len(mondays) + 2)
+    end = 0
+    for month in range(1, 13):
+        column = 2 * ((date(calendar.year, month, 1) - mondays[0]).days // 7)
+        if column >= end:
+            months[column : column + 3] = f"{date(calendar.year, month, 1):%b}"
+            end = column + 4
+    output.result(f"[bold]{calendar.year}[/bold]")
+    output.result(f"    {''.join(months).rstrip()}")
+
+    for weekday, label in enumerate(["Mon", "", "Wed", "", "Fri", "", "Sun"]):
+        cells = []
+        for monday in mondays:
+            if (last - monday).days < weekday:
+                cells.append("  ")
+                continue
+            day = monday + timedelta(days=weekday)
+            if day < first:
+                cells.append("  ")
+            else:
+                level = day_levels.get(day.isoformat(), 0)
+                cells.append(f"[{shades[level]}]\u25a0[/{shades[level]}] ")
+        output.result(f"{label:<4}{''.join(cells).rstrip()}")
+
+    cells = []
+    for monday in mondays:
+        level = week_levels.get(f"{monday:%G-W%V}", 0)
+        cells.append(f"[{shades[level]}]\u25a0[/{shades[level]}] ")
+    output.result(f"{'Wk':<4}{''.join(cells).rstrip()}")
+    output.result(
+        f"[dim]{len(calendar.days)} daily notes, {len(calendar.weeks)} weekly notes"
+        f" (shaded by {calendar.intensity.value})[/dim]"
+    )
+
+
 if __name__ == "__main__":
     app()
@@ -1,17 +1,58 @@
 """Note model for creating new notes in the inbox."""
 
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
 
 from zettelkasten_cli import output
 from zettelkasten_cli.config import Config, get_config
-from zettelkasten_cli.exceptions import NoteExistsError, NoteTitleError
+from zettelkasten_cli.exceptions import (
+    NoteExistsError,
+    NoteTitleError,
+    VaultIndexError,
+)
 from zettelkasten_cli.models.periodic_note import daily
-from zettelkasten_cli.services.editor import open_in_editor
+from zettelkasten_cli.services.fs import create_exclusive, fsync_dir
+from zettelkasten_cli.services.markdown import title_key
+from zettelkasten_cli.services.template import CompiledTemplate, load_template
+from zettelkasten_cli.services.trace import span, traced
+
+# Type-only import: the index (and SQLite) is loaded lazily in _title_index.
+# See output.py for why `typing.TYPE_CHECKING` is not used.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from zettelkasten_cli.services.index import VaultIndex
 
 # Constraints
 MAX_TITLE_LENGTH = 80
 
+# Used when no note template exists
+DEFAULT_TEMPLATE = CompiledTemplate("# {{title}}\n\n")
+
+
+def validate_title(title: str) -> None:
+    """
+    Validate a note title.
+
+    Raises:
+        NoteTitleError: If the title is empty, too long or ends in .md.
+    """
+    if not title:
+        raise NoteTitleError("Note title cannot be empty.")
+
+    if len(title) > MAX_TITLE_LENGTH:
+        raise NoteTitleError(
+            f"Title cannot be more than {MAX_TITLE_LENGTH} characters."
+        )
+
+    if title.endswith(".md"):
+        raise NoteTitleError("Leave out the .md extension.")
+
 
 @dataclass
 class Note:
@@ -23,6 +64,7 @@ class Note:
 
     title: str
     config: Config
+    body: str = ""
 
     def __post_init__(self) -> None:
         """Validate the note after initialization."""
@@ -30,16 +72,7 @@ class Note:
 
     def _validate_title(self) -> None:
         """Validate the note title."""
-        if not self.title:
-            raise NoteTitleError("Note title cannot be empty.")
-
-        if len(self.title) > MAX_TITLE_LENGTH:
-            raise NoteTitleError(
-                f"Title cannot be more than {MAX_TITLE_LENGTH} characters."
-            )
-
-        if self.title.endswith(".md"):
-            raise NoteTitleError("Leave out the .md extension.")
+        validate_title(self.title)
 
     @property
     def path(self) -> Path:
@@ -50,10 +83,21 @@ class Note:
         """Check if the note already exists."""
         return self.path.exists()
 
+    def template_variables(self) -> dict[str, str]:
+        """Get the variables available to the note template."""
+        today = daily(self.config)
+        variables = today.template_variables()
+        variables["title"] = self.title
+        return variables
+
     def get_content(self) -> str:
-        """Get the initial content for the note."""
-        return f"# {self.title}\n\n"
+        """Get the initial content for the note (template or default), plus body."""
+        template = load_template(self.config.paths.note_template_path)
+        if template is None:
+            template = DEFAULT_TEMPLATE
+        return template.render(self.template_variables()) + self.body
 
+    @traced("note.create")
     def create(self, link_to_daily: bool = True) -> Path:
         """
         Create the note file.
@@ -70,19 +114,41 @@ class Note:
         if self.exists():
             raise NoteExistsError(f"Note already exists: {self.path}")
 
-        # Ensure inbox directory exists
-        self.config.paths.inbox.mkdir(parents=True, exist_ok=True)
+        with _title_index(self.config) as vault_index:
+            with span("note.check_titles"):
+                _check_vault_titles([self], vault_index)
+
+            # Ensure inbox directory exists
+            self.config.paths.inbox.mkdir(parents=True, exist_ok=True)
 
-        # Link to daily note first (so it appears even if note creation fails)
-        if link_to_daily:
+            if not link_to_daily:
+                self._write()
+                _record([self.path], vault_index)
+                return self.path
+
+            # Link to daily note first (so it appears even if note creation
+            # fails). The daily note's lock makes check-link-write atomic
+            # across processes, so racing creators of the same title cannot
+            # add duplicate links.
             daily_note = daily(self.config)
-            daily_note.append(f"\n[[{self.title}]]")
+            with daily_note.locked() as daily_file:
+                if self.exists():
+                    raise NoteExistsError(f"Note already exists: {self.path}")
+                daily_file.write(f"\n[[{self.title}]]")
+                daily_file.flush()
+                self._write()
 
-        # Write the note
-        self.path.write_text(self.get_content())
+            _record([self.path, daily_note.note_path], vault_index)
 
         return self.path
 
+    def _write(self, sync: bool = True) -> None:
+        """Atomically write the note file."""
+        content = self.get_content()
+        with span("note.write"):
+            if not create_exclusive(self.path, content, sync=sync):
+                raise NoteExistsError(f"Note already exists: {self.path}")
+
     def create_and_open(self, vim_mode: bool = False) -> None:
         """
         Create the note and open it in the editor.
@@ -96,6 +162,9 @@ class Note:
             # Plain output for Neovim to parse
             output.plain(str(path))
         else:
+            # Deferred: the editor service is not needed in vim mode
+            from zettelkasten_cli.services.editor import open_in_editor
+
             output.success(f"Created note: {path}")
             open_in_editor(path, self.config.editor)
 
@@ -118,3 +187,217 @@ def create_note(
 
     note = Note(title=title, config=config)
     note.create_and_open(vim_mode=vim_mode)
+
+
+@contextmanager
+def _title_index(config: Config) -> Iterator[VaultIndex | None]:
+    """
+    Open the vault index for title lookups, if one has been built.
+
+    Without an index (see `zk index`) only the inbox is checked for
+    duplicates; building one here would stall note creation on large vaults.
+    An existing index first picks up notes created, renamed or deleted
+    behind its back, which only lists directories modified since it was
+    last written.
+    """
+    if not config.paths.index_path.exists():
+        yield None
+        return
+
+    # Deferred: SQLite is only needed once the vault has an index
+    from zettelkasten_cli.services.index import VaultIndex
+
+    try:
+        vault_index = VaultIndex.open(config)
+    except VaultIndexError as e:
+        output.warning(f"Skipping vault-wide title check: {e}")
+        yield None
+        return
+
+    with vault_index:
+        try:
+            vault_index.refresh_names()
+        except VaultIndexError as e:
+            output.warning(f"Vault-wide title check may miss new notes: {e}")
+        yield vault_index
+
+
+def _check_vault_titles(notes: list[Note], vault_index: VaultIndex | None) -> None:
+    """
+    Refuse titles that already exist anywhere in the vault.
+
+    Titles are compared case-insensitively and Unicode-normalized, like
+    wikilinks, with one indexed lookup per note regardless of vault size.
+    Index entries whose file has since disappeared are ignored.
+    """
+    if vault_index is None:
+        return
+
+    errors = []
+    for note in notes:
+        for existing in vault_index.find_title(note.title):
+            if existing.path.exists():
+                errors.append(
+                    f"A note titled '{existing.title}' already exists: {existing.path}"
+                )
+                break
+
+    if errors:
+        raise NoteExistsError("\n".join(errors))
+
+
+def _record(paths: list[Path], vault_index: VaultIndex | None) -> None:
+    """Add freshly written files to the vault index, if there is one."""
+    if vault_index is None:
+        return
+
+    try:
+        for path in paths:
+            vault_index.sync_path(path)
+    except VaultIndexError as e:
+        output.warning(f"Could not update the vault index: {e}")
+
+
+def parse_batch(lines: Iterable[str], config: Config) -> list[Note]:
+    """
+    Parse and validate a batch of notes.
+
+    Each non-blank line is either a plain title or an NDJSON object with a
+    ``title`` and an optional ``body``. All lines are validated before any
+    note is returned, and every problem is reported at once.
+
+    Raises:
+        NoteTitleError: If any line is malformed or has an invalid title.
+    """
+    notes = []
+    errors = []
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            if line.startswith("{"):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    raise NoteTitleError("Invalid JSON.") from None
+                title, body = record.get("title"), record.get("body", "")
+                if not isinstance(title, str) or not isinstance(body, str):
+                    raise NoteTitleError("Expected a string title and body.")
+            else:
+                title, body = line, ""
+
+            notes.append(Note(title=title.strip(), config=config, body=body))
+        except NoteTitleError as e:
+            errors.append(f"Line {number}: {e}")
+
+    if errors:
+        raise NoteTitleError("\n".join(errors))
+    return notes
+
+
+def _check_batch(notes: list[Note], inbox: Path) -> None:
+    """
+    Refuse a batch containing duplicate titles or existing notes.
+
+    Titles within the batch are compared like wikilinks (see `title_key`).
+    """
+    try:
+        existing = {entry.name for entry in os.scandir(inbox)}
+    except FileNotFoundError:
+        existing = set()
+
+    seen: set[str] = set()
+    errors = []
+    for note in notes:
+        key = title_key(note.title)
+        if note.path.name in existing:
+            errors.append(f"Note already exists: {note.path}")
+        elif key in seen:
+            errors.append(f"Duplicate title in batch: {note.title}")
+        seen.add(key)
+
+    if errors:
+        raise NoteExistsError("\n".join(errors))
+
+
+def create_notes(
+    notes: list[Note], config: Config, link_to_daily: bool = True
+) -> list[Path]:
+    """
+    Create many notes at once.
+
+    The whole batch is checked before anything is written, every note file
+    is created atomically, and all daily-note links are written in a single
+    locked append.
+
+    Args:
+        notes: Validated notes (see ``parse_batch``).
+        config: The configuration.
+        link_to_daily: If True, add links to the daily note.
+
+    Returns:
+        Paths to the created notes, in batch order.
+
+    Raises:
+        NoteExistsError: If a note already exists or a title is repeated.
+    """
+    if not notes:
+        return []
+
+    inbox = config.paths.inbox
+    _check_batch(notes, inbox)
+
+    with _title_index(config) as vault_index:
+        _check_vault_titles(notes, vault_index)
+        inbox.mkdir(parents=True, exist_ok=True)
+
+        if not link_to_daily:
+            _write_batch(notes, inbox)
+            _record([note.path for note in notes], vault_index)
+            return [note.path for note in notes]
+
+        # Same ordering and locking as Note.create, once for the whole batch
+        daily_note = daily(config)
+        with daily_note.locked() as daily_file:
+            _check_batch(notes, inbox)
+            daily_file.write("".join(f"\n[[{note.title}]]" for note in notes))
+            daily_file.flush()
+            _write_batch(notes, inbox)
+
+        _record([note.path for note in notes] + [daily_note.note_path], vault_index)
+
+    return [note.path for note in notes]
+
+
+def _write_batch(notes: list[Note], inbox: Path) -> None:
+    """Write batch note files, syncing the directory once instead of per file."""
+    for note in notes:
+        note._write(sync=False)
+    fsync_dir(inbox)
+
+
+def create_note_batch(
+    lines: Iterable[str],
+    vim_mode: bool = False,
+    config: Config | None = None,
+) -> None:
+    """
+    Create notes from lines of titles or NDJSON records.
+
+    Args:
+        lines: Batch input (see ``parse_batch``).
+        vim_mode: If True, output the created paths for Neovim integration.
+        config: Optional config (uses global if not provided).
+    """
+    if config is None:
+        config = get_config()
+
+    paths = create_notes(parse_batch(lines, config), config)
+
+    if vim_mode:
+        for path in paths:
+            output.plain(str(path))
+    else:
+        output.success(f"Created {len(paths)} notes in {config.paths.inbox}")
@@ -1,14 +1,30 @@
 """Periodic note model for daily, weekly, monthly, yearly notes."""
 
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import os
+import re
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, timedelta
 from enum import Enum
 from pathlib import Path
 
 from zettelkasten_cli import output
 from zettelkasten_cli.config import Config, get_config
-from zettelkasten_cli.services.editor import open_in_editor
-from zettelkasten_cli.services.template import load_template
+from zettelkasten_cli.exceptions import PeriodError
+from zettelkasten_cli.services.fs import (
+    InsertWriter,
+    Locator,
+    create_exclusive,
+    fsync_dir,
+    locked_insert,
+)
+from zettelkasten_cli.services.markdown import section_end
+from zettelkasten_cli.services.template import CompiledTemplate, load_template
+from zettelkasten_cli.services.trace import span, traced
+
+# Used when no template file exists
+DEFAULT_TEMPLATE = CompiledTemplate("# [[{{yesterday}}]] - [[{{tomorrow}}]]\n\n")
 
 
 class Period(Enum):
@@ -16,91 +32,169 @@ class Period(Enum):
 
     DAILY = "daily"
     WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    QUARTERLY = "quarterly"
+    YEARLY = "yearly"
+
+
+def _add_months(day: date, months: int) -> date:
+    """Get the first of the month some months after (or before) a date's month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+@dataclass(frozen=True)
+class _PeriodSpec:
+    """How a period is laid out: where its notes live and how they are named."""
+
+    # PathConfig attributes for the notes folder and the template
+    notes_dir: str
+    template_path: str
+    # Start of the period containing a date
+    start: Callable[[date], date]
+    # Start of the period n periods after the one starting at a date
+    shift: Callable[[date, int], date]
+    # Note name for the period starting at a date
+    name: Callable[[date], str]
+    # Parses a note name back to the start of its period
+    parse: Callable[[str], date]
+    # PathConfig attribute for the heading text is added under, if any
+    heading: str | None = None
+
+
+def _parse_week(text: str) -> date:
+    year, week = re.fullmatch(r"(\d{4})-W(\d{1,2})", text).groups()
+    return date.fromisocalendar(int(year), int(week), 1)
+
+
+def _parse_quarter(text: str) -> date:
+    year, quarter = re.fullmatch(r"(\d{4})-Q([1-4])", text).groups()
+    return date(int(year), 3 * int(quarter) - 2, 1)
+
+
+_PERIODS = {
+    Period.DAILY: _PeriodSpec(
+        notes_dir="daily_notes",
+        template_path="daily_template_path",
+        start=lambda day: day,
+        shift=lambda day, n: day + timedelta(days=n),
+        name=lambda day: day.strftime("%Y-%m-%d"),
+        parse=date.fromisoformat,
+        heading="daily_heading",
+    ),
+    Period.WEEKLY: _PeriodSpec(
+        notes_dir="weekly_notes",
+        template_path="weekly_template_path",
+        start=lambda day: day - timedelta(days=day.weekday()),
+        shift=lambda day, n: day + timedelta(weeks=n),
+        # ISO week-numbering year, so the days around New Year land in the
+        # right week (e.g. Monday 2024-12-30 is in 2025-W01)
+        name=lambda day: day.strftime("%G-W%V"),
+        parse=_parse_week,
+    ),
+    Period.MONTHLY: _PeriodSpec(
+        notes_dir="monthly_notes",
+        template_path="monthly_template_path",
+        start=lambda day: day.replace(day=1),
+        shift=_add_months,
+        name=lambda day: day.strftime("%Y-%m"),
+        parse=lambda text: date.fromisoformat(f"{text}-01"),
+    ),
+    Period.QUARTERLY: _PeriodSpec(
+        notes_dir="quarterly_notes",
+        template_path="quarterly_template_path",
+        start=lambda day: date(day.year, day.month - (day.month - 1) % 3, 1),
+        shift=lambda day, n: _add_months(day, 3 * n),
+        name=lambda day: f"{day.year}-Q{(day.month - 1) // 3 + 1}",
+        parse=_parse_quarter,
+    ),
+    Period.YEARLY: _PeriodSpec(
+        notes_dir="yearly_notes",
+        template_path="yearly_template_path",
+        start=lambda day: date(day.year, 1, 1),
+        shift=lambda day, n: date(day.year + n, 1, 1),
+        name=lambda day: f"{day.year:04}",
+        parse=lambda text: date(int(text), 1, 1),
+    ),
+}
 
 
 @dataclass
 class PeriodicNote:
     """
-    A periodic note (daily, weekly, etc.).
+    A periodic note (daily, weekly, monthly, quarterly or yearly).
 
     This class encapsulates all logic for creating, opening, and appending
-    to periodic notes, eliminating duplication between daily/weekly handling.
+    to periodic notes. Everything that differs between periods comes from
+    the `_PERIODS` table.
     """
 
     period: Period
     config: Config
+    # Any date in the note's period (default: today)
+    day: date = field(default_factory=date.today)
 
-    def get_current_date_str(self) -> str:
-        """Get the formatted date string for the current period."""
-        now = datetime.now()
+    @property
+    def _spec(self) -> _PeriodSpec:
+        return _PERIODS[self.period]
 
-        if self.period == Period.DAILY:
-            return now.strftime("%Y-%m-%d")
-        elif self.period == Period.WEEKLY:
-            # Get Monday of current week
-            monday = now - timedelta(days=now.weekday())
-            return monday.strftime("%Y-W%V")
+    @property
+    def start(self) -> date:
+        """Get the first day of the note's period."""
+        return self._spec.start(self.day)
 
-        raise ValueError(f"Unknown period: {self.period}")
+    def get_current_date_str(self) -> str:
+        """Get the formatted date string for the note's period."""
+        return self._spec.name(self.start)
 
     def get_offset_date_str(self, offset: int) -> str:
         """Get the formatted date string with an offset (e.g., -1 for yesterday)."""
-        now = datetime.now()
-
-        if self.period == Period.DAILY:
-            target = now + timedelta(days=offset)
-            return target.strftime("%Y-%m-%d")
-        elif self.period == Period.WEEKLY:
-            # Offset is in weeks
-            monday = now - timedelta(days=now.weekday())
-            target = monday + timedelta(weeks=offset)
-            return target.strftime("%Y-W%V")
-
-        raise ValueError(f"Unknown period: {self.period}")
+        spec = self._spec
+        return spec.name(spec.shift(self.start, offset))
 
     @property
     def notes_dir(self) -> Path:
         """Get the directory for this period's notes."""
-        if self.period == Period.DAILY:
-            return self.config.paths.daily_notes
-        elif self.period == Period.WEEKLY:
-            return self.config.paths.weekly_notes
-
-        raise ValueError(f"Unknown period: {self.period}")
+        return getattr(self.config.paths, self._spec.notes_dir)
 
     @property
     def template_path(self) -> Path:
         """Get the template path for this period."""
-        if self.period == Period.DAILY:
-            return self.config.paths.daily_template_path
-        elif self.period == Period.WEEKLY:
-            return self.config.paths.weekly_template_path
-
-        raise ValueError(f"Unknown period: {self.period}")
+        return getattr(self.config.paths, self._spec.template_path)
 
     @property
     def note_path(self) -> Path:
-        """Get the full path to the current period's note."""
+        """Get the full path to the note of this period."""
         return self.notes_dir / f"{self.get_current_date_str()}.md"
 
     def exists(self) -> bool:
         """Check if the current period's note exists."""
         return self.note_path.exists()
 
+    def template_variables(self) -> dict[str, str]:
+        """Get the variables available to this period's template."""
+        return {
+            "date": self.get_current_date_str(),
+            "yesterday": self.get_offset_date_str(-1),
+            "tomorrow": self.get_offset_date_str(1),
+            "week": _PERIODS[Period.WEEKLY].name(self.start),
+        }
+
     def get_default_content(self) -> str:
         """Get the default content for a new note."""
-        yesterday = self.get_offset_date_str(-1)
-        tomorrow = self.get_offset_date_str(1)
-        return f"# [[{yesterday}]] - [[{tomorrow}]]\n\n"
+        return DEFAULT_TEMPLATE.render(self.template_variables())
 
     def get_content(self) -> str:
         """Get the content for a new note (template or default)."""
-        template_content = load_template(self.template_path)
-        if template_content:
-            return template_content
+        template = load_template(self.template_path)
+        if template:
+            content = template.render(self.template_variables())
+            if content:
+                return content
 
         return self.get_default_content()
 
+    @traced("periodic.create")
     def create(self) -> bool:
         """
         Create the note if it doesn't exist.
@@ -109,31 +203,82 @@ class PeriodicNote:
             True if note was created, False if it already existed.
         """
         if self.exists():
-            output.info(f"{self.period.value.title()} note already exists: {self.note_path}")
+            self._info_exists()
             return False
 
         # Ensure directory exists
         self.notes_dir.mkdir(parents=True, exist_ok=True)
 
-        # Write the note
-        self.note_path.write_text(self.get_content())
+        # Write the note atomically; another process may have beaten us to it
+        if not create_exclusive(self.note_path, self.get_content()):
+            self._info_exists()
+            return False
+
         output.info(f"Created {self.period.value} note: {self.note_path}")
         return True
 
+    def _info_exists(self) -> None:
+        """Report that the note already exists."""
+        output.info(
+            f"{self.period.value.title()} note already exists: {self.note_path}"
+        )
+
     def open(self) -> None:
         """Create (if needed) and open the note in the editor."""
+        from zettelkasten_cli.services.editor import open_in_editor
+
         self.create()
         open_in_editor(self.note_path, self.config.editor)
 
+    @property
+    def heading(self) -> str | None:
+        """Get the heading whose section text is added to, if one is set."""
+        if self._spec.heading is None:
+            return None
+        return getattr(self.config.paths, self._spec.heading).strip() or None
+
+    def _locator(self) -> Locator | None:
+        """Get where added text goes: the end of the heading's section."""
+        heading = self.heading
+        if heading is None:
+            return None
+
+        def locate(content: bytes, data: bytes) -> tuple[int, bytes]:
+            end = section_end(content, heading)
+            if end is None:
+                # Start the section at the end of the note
+                return len(content), f"\n{heading}".encode() + data
+            return end, data
+
+        return locate
+
+    @contextmanager
+    def locked(self) -> Iterator[InsertWriter]:
+        """
+        Hold an exclusive lock on the note, yielding a writer for adding text.
+
+        Creates the note first if it doesn't exist. Text goes at the end of
+        the configured heading's section, or at the end of the note. It is
+        written when the writer is flushed and at the end of the block.
+        Concurrent writers (e.g. several `zk new` processes) are serialized.
+        """
+        if not self.exists():
+            self.create()
+
+        # Covers waiting for the lock, the writes and the final fsync
+        with (
+            span("periodic.append", note=self.note_path.name),
+            locked_insert(self.note_path, self._locator()) as f,
+        ):
+            yield f
+
     def append(self, text: str) -> None:
         """
-        Append text to the note.
+        Add text to the note, under the configured heading if there is one.
 
         Creates the note first if it doesn't exist.
         """
-        self.create()
-
-        with self.note_path.open(mode="a") as f:
+        with self.locked() as f:
             f.write(text)
 
 
@@ -149,3 +294,118 @@ def weekly(config: Config | None = None) -> PeriodicNote:
     if config is None:
         config = get_config()
     return PeriodicNote(period=Period.WEEKLY, config=config)
+
+
+def periodic(period: Period, config: Config | None = None) -> PeriodicNote:
+    """Create a periodic note instance for the current period."""
+    if config is None:
+        config = get_config()
+    return PeriodicNote(period=period, config=config)
+
+
+def note_date(period: Period, name: str) -> date | None:
+    """Get the first day of the period a note name stands for, if it is one."""
+    spec = _PERIODS[period]
+    try:
+        start = spec.parse(name)
+    except (AttributeError, ValueError):
+        return None
+    # Reject names that parse but are not canonical, e.g. 2026-W1
+    return start if spec.name(start) == name else None
+
+
+def is_periodic_name(name: str) -> bool:
+    """Check if a note name is that of a periodic note of any period."""
+    return any(note_date(period, name) is not None for period in Period)
+
+
+def parse_range(period: Period, text: str) -> tuple[date, date]:
+    """
+    Parse a date range such as ``2026-01-01..2026-12-31``.
+
+    Either end may also be a note name of the period, e.g. ``2026-W01``,
+    ``2026-03``, ``2026-Q2`` or ``2026``.
+
+    Raises:
+        PeriodError: If the range is malformed, ends before it starts or
+            reaches a period at the edge of the calendar, whose note could
+            not link to the one before or after it.
+    """
+    first, sep, last = text.partition("..")
+    if not sep:
+        raise PeriodError(
+            f"Expected a range like 2026-01-01..2026-12-31, got '{text}'."
+        )
+
+    def parse(value: str) -> date:
+        value = value.strip()
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+        try:
+            return _PERIODS[period].parse(value)
+        except (AttributeError, ValueError):
+            raise PeriodError(f"Invalid date: '{value}'.") from None
+
+    start, end = parse(first), parse(last)
+    if end < start:
+        raise PeriodError(f"The range ends before it starts: '{text}'.")
+
+    spec = _PERIODS[period]
+    for day in (start, end):
+        try:
+            spec.shift(spec.start(day), -1)
+            spec.shift(spec.start(day), 1)
+        except (ValueError, OverflowError):
+            raise PeriodError(
+                f"'{spec.name(spec.start(day))}' has no previous or next "
+                f"{period.value} note to link to."
+            ) from None
+    return start, end
+
+
+@traced("periodic.create_range")
+def create_range(
+    period: Period, start: date, end: date, config: Config | None = None
+) -> tuple[list[Path], int]:
+    """
+    Create the notes of every period from start to end (inclusive) that are missing.
+
+    The notes folder is listed once to find existing notes and the template
+    is loaded once. Files are written without a per-file fsync; the folder
+    is synced once at the end.
+
+    Returns:
+        The created notes, and the number that already existed.
+    """
+    if config is None:
+        config = get_config()
+    spec = _PERIODS[period]
+    first = PeriodicNote(period=period, config=config, day=start)
+    notes_dir = first.notes_dir
+    notes_dir.mkdir(parents=True, exist_ok=True)
+    existing = {entry.name for entry in os.scandir(notes_dir)}
+
+    template = load_template(first.template_path)
+    created = []
+    skipped = 0
+    day = first.start
+    while day <= end:
+        note = PeriodicNote(period=period, config=config, day=day)
+        name = f"{note.get_current_date_str()}.md"
+        if name in existing:
+            skipped += 1
+        else:
+            content = template.render(note.template_variables()) if template else ""
+            if not content:
+                content = note.get_default_content()
+            if create_exclusive(notes_dir / name, content, sync=False):
+                created.append(notes_dir / name)
+            else:
+                skipped += 1
+        day = spec.shift(day, 1)
+
+    if created:
+        fsync_dir(notes_dir)
+    return created, skipped
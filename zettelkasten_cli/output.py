@@ -1,11 +1,29 @@
 """Unified output handling for zettelkasten-cli."""
 
+from __future__ import annotations
+
 import sys
 
-from rich.console import Console
+# Importing `typing` alone costs more than the rest of the fast path
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from rich.console import Console
+
+# Rich console for styled output, created on first use so that plain-mode
+# invocations (e.g. `zk new --vim`) never import rich
+_console: Console | None = None
 
-# Rich console for styled output
-_console = Console()
+
+def _get_console() -> Console:
+    """Get the rich console (lazy-loaded)."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+
+        _console = Console()
+    return _console
 
 
 def is_interactive() -> bool:
@@ -16,26 +34,51 @@ def is_interactive() -> bool:
 def info(message: str) -> None:
     """Print an info message (only in interactive mode)."""
     if is_interactive():
-        _console.print(message)
+        _get_console().print(message)
 
 
 def success(message: str) -> None:
     """Print a success message (only in interactive mode)."""
     if is_interactive():
-        _console.print(f"[green]{message}[/green]")
+        _get_console().print(f"[green]{message}[/green]")
 
 
 def warning(message: str) -> None:
     """Print a warning message (only in interactive mode)."""
     if is_interactive():
-        _console.print(f"[yellow]{message}[/yellow]")
+        _get_console().print(f"[yellow]{message}[/yellow]")
 
 
 def error(message: str) -> None:
     """Print an error message (always, to stderr)."""
-    _console.print(f"[red]{message}[/red]", stderr=True)
+    _get_console().print(f"[red]{message}[/red]", stderr=True)
+
+
+def result(message: str) -> None:
+    """Print a command result (always; styling is dropped when not a terminal)."""
+    _get_console().print(message, soft_wrap=True)
 
 
 def plain(message: str) -> None:
     """Print a plain message without formatting (for piping to other programs)."""
     print(message, file=sys.stdout, flush=True)
+
+
+def stream(lines: Iterable[str]) -> None:
+    """
+    Print plain lines as they are produced.
+
+    Lines appear immediately on a terminal (stdout is line buffered there)
+    and are written in blocks when piped. Stops quietly if the reader goes
+    away, e.g. when piped to `head`.
+    """
+    write = sys.stdout.write
+    try:
+        for line in lines:
+            write(line + "\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Keep the interpreter from failing to flush stdout again at exit
+        import os
+
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
@@ -0,0 +1,182 @@
+"""
+Calendar of daily and weekly notes for `zk cal`.
+
+The notes of each folder are found with one `scandir` pass, and the result
+(note names and sizes) is cached in the vault's state directory, keyed by
+the folder's modification time. Creating, deleting or renaming a note
+changes that time, so unchanged folders are never listed again. Editing a
+note in place does not, so the notes for today and this week, the ones
+likely being written, are always stat'ed again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import date
+from enum import Enum
+from pathlib import Path
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.exceptions import ZettelkastenError
+from zettelkasten_cli.models.periodic_note import Period, PeriodicNote, note_date
+from zettelkasten_cli.services.fs import replace_atomic
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX
+
+# Only needed for shading by links, so the size view never loads SQLite.
+# See output.py for why `typing.TYPE_CHECKING` is not used.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from zettelkasten_cli.services.index import VaultIndex
+
+CACHE_NAME = "calendar.json"
+
+# A folder changed this recently may change again within the same mtime
+# tick, so its listing is not cached yet
+_SETTLE_NS = 2 * 10**9
+
+
+class Intensity(Enum):
+    """What a calendar cell's shade stands for."""
+
+    SIZE = "size"
+    LINKS = "links"
+
+
+@dataclass(frozen=True)
+class CalendarYear:
+    """The daily and weekly notes of one year."""
+
+    year: int
+    intensity: Intensity
+    # Intensity keyed by ISO date / ISO week, for periods that have a note
+    days: dict[str, int]
+    weeks: dict[str, int]
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "year": self.year,
+            "intensity": self.intensity.value,
+            "days": self.days,
+            "weeks": self.weeks,
+        }
+
+
+class _ListingCache:
+    """Note names and sizes per folder, valid while the folder is unchanged."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.dirty = False
+        try:
+            self.entries = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def sizes(self, directory: Path, fresh: set[str]) -> dict[str, int]:
+        """
+        Get the size of each note in a folder, keyed by note name.
+
+        Args:
+            directory: The folder to list.
+            fresh: Note names to stat again even if the listing is cached.
+        """
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+
+        key = str(directory)
+        cached = self.entries.get(key)
+        if isinstance(cached, dict) and cached.get("mtime_ns") == mtime_ns:
+            sizes = dict(cached["sizes"])
+            for name in fresh & sizes.keys():
+                try:
+                    sizes[name] = (directory / f"{name}{NOTE_SUFFIX}").stat().st_size
+                except FileNotFoundError:
+                    del sizes[name]
+            return sizes
+
+        sizes = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(NOTE_SUFFIX) and entry.is_file():
+                    sizes[entry.name[: -len(NOTE_SUFFIX)]] = entry.stat().st_size
+        if time.time_ns() - mtime_ns > _SETTLE_NS:
+            self.entries[key] = {"mtime_ns": mtime_ns, "sizes": sizes}
+            self.dirty = True
+        return sizes
+
+    def save(self) -> None:
+        """Write the cache back if it changed."""
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            replace_atomic(self.path, json.dumps(self.entries), sync=False)
+
+
+def collect_calendar(
+    config: Config,
+    year: int,
+    intensity: Intensity = Intensity.SIZE,
+    vault_index: VaultIndex | None = None,
+    today: date | None = None,
+) -> CalendarYear:
+    """
+    Find the daily and weekly notes of a year.
+
+    Args:
+        config: The configuration, for the periodic note folders.
+        year: The calendar year (for weekly notes, the ISO year).
+        intensity: Shade by note size in bytes or by outgoing links.
+        vault_index: A refreshed index; required when shading by links.
+        today: The current date (default: today).
+    """
+    if intensity is Intensity.LINKS and vault_index is None:
+        raise ZettelkastenError("Shading by links needs the vault index.")
+    if today is None:
+        today = date.today()
+
+    paths = config.paths
+    cache = _ListingCache(paths.state_dir / CACHE_NAME)
+    folders = {}
+    for period, directory in (
+        (Period.DAILY, paths.daily_notes),
+        (Period.WEEKLY, paths.weekly_notes),
+    ):
+        current = PeriodicNote(period=period, config=config, day=today)
+        sizes = cache.sizes(directory, fresh={current.get_current_date_str()})
+        if intensity is Intensity.LINKS:
+            counts = vault_index.outgoing_link_counts(directory)
+            sizes = {
+                name: counts.get(directory / f"{name}{NOTE_SUFFIX}", 0)
+                for name in sizes
+            }
+        folders[period] = sizes
+    cache.save()
+
+    # Both note names start with the (ISO) year, which rules out most
+    # notes before any parsing
+    prefix = f"{year:04}-"
+    days, weeks = (
+        {
+            name: value
+            for name, value in sorted(folders[period].items())
+            if name.startswith(prefix) and note_date(period, name) is not None
+        }
+        for period in (Period.DAILY, Period.WEEKLY)
+    )
+    return CalendarYear(year=year, intensity=intensity, days=days, weeks=weeks)
+
+
+def shade_levels(values: dict[str, int], levels: int = 4) -> dict[str, int]:
+    """
+    Scale note values to shades 1..levels relative to the largest one, like a
+    contribution graph. Shade 0 is left for periods without a note.
+    """
+    peak = max(values.values(), default=0) or 1
+    return {
+        key: 1 + round((levels - 1) * value / peak) for key, value in values.items()
+    }
@@ -0,0 +1,191 @@
+"""
+Quick capture into daily notes through a spool file, for `zk capture`.
+
+Capturing only appends a line to a spool in the vault's state directory,
+with one write and one sync and without loading typer, rich or the index,
+so it stays fast however often hotkeys and scripts fire it. Each entry
+records the day and time it was captured.
+
+Merging folds the spool into the daily notes of those days, in capture
+order. The spool is first renamed aside, so captures made meanwhile start a
+new one, and each day's entries are marked as merged once written. If a
+merge dies, the next one resumes from the renamed spool, skipping the days
+already merged and checking the note before writing the day it was busy
+with, so no capture is lost or normally written twice.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import time
+from pathlib import Path
+
+from zettelkasten_cli.exceptions import CaptureError
+from zettelkasten_cli.services.fs import (
+    append_shared,
+    file_lock,
+    fsync_dir,
+    locked_read,
+)
+from zettelkasten_cli.services.trace import traced
+
+# Type-only import: capturing must not load the configuration (see cli.py).
+# See output.py for why `typing.TYPE_CHECKING` is not used.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from zettelkasten_cli.config import Config
+
+SPOOL_NAME = "capture.spool"
+MERGING_NAME = "capture.merging"
+LOCK_NAME = "capture.lock"
+
+
+def spool_captures(
+    state_dir: Path, texts: list[str], when: float | None = None
+) -> None:
+    """
+    Spool captured texts for the daily note, with one write and one sync.
+
+    Args:
+        state_dir: The vault's state directory.
+        texts: The texts to capture, each becoming one entry.
+        when: The capture time (default: now).
+
+    Raises:
+        CaptureError: If a text is blank.
+    """
+    stamp = time.localtime(when)
+    day, clock = time.strftime("%Y-%m-%d", stamp), time.strftime("%H:%M", stamp)
+    lines = []
+    for text in texts:
+        text = text.strip()
+        if not text:
+            raise CaptureError("Nothing to capture.")
+        lines.append(json.dumps({"day": day, "time": clock, "text": text}) + "\n")
+
+    data = "".join(lines).encode("utf-8")
+    try:
+        append_shared(state_dir / SPOOL_NAME, data)
+    except FileNotFoundError:
+        state_dir.mkdir(parents=True, exist_ok=True)
+        append_shared(state_dir / SPOOL_NAME, data)
+
+
+def has_captures(config: Config) -> bool:
+    """Check if there are captures waiting to be merged."""
+    state_dir = config.paths.state_dir
+    return (state_dir / SPOOL_NAME).exists() or (state_dir / MERGING_NAME).exists()
+
+
+def format_entry(clock: str, text: str) -> str:
+    """Format a captured entry as a daily note list item."""
+    return f"\n- {clock} " + text.replace("\n", "\n  ")
+
+
+@traced("capture.merge")
+def merge_captures(config: Config) -> int:
+    """
+    Fold spooled captures into the daily notes.
+
+    Resumes an interrupted merge first. Captures made while merging are
+    left for the next merge.
+
+    Returns:
+        The number of entries merged.
+    """
+    if not has_captures(config):
+        return 0
+
+    state_dir = config.paths.state_dir
+    # One merge at a time, e.g. `zk day` in two terminals
+    with file_lock(state_dir / LOCK_NAME):
+        return _merge(config, state_dir)
+
+
+def _merge(config: Config, state_dir: Path) -> int:
+    """Merge the spool while holding the merge lock."""
+    from datetime import date
+
+    from zettelkasten_cli.models.periodic_note import Period, PeriodicNote
+
+    spool = state_dir / SPOOL_NAME
+    merging = state_dir / MERGING_NAME
+    resumed = merging.exists()
+    if not resumed:
+        try:
+            # Waits for in-flight captures, which then move on to a new spool
+            with locked_read(spool):
+                os.rename(spool, merging)
+        except FileNotFoundError:
+            return 0
+        fsync_dir(state_dir)
+
+    entries, merged = _read_merging(merging)
+    count = 0
+    for day, items in entries.items():
+        if day in merged:
+            continue
+        try:
+            note = PeriodicNote(Period.DAILY, config, day=date.fromisoformat(day))
+        except ValueError:
+            continue
+        batch = "".join(format_entry(clock, text) for clock, text in items)
+        # Only the day an interrupted merge was busy with can be written
+        # already; merges are serialized, so nothing else writes entries
+        if not (resumed and _contains(note.note_path, batch.encode("utf-8"))):
+            note.append(batch)
+        resumed = False
+        _mark_merged(merging, day)
+        count += len(items)
+
+    merging.unlink()
+    fsync_dir(state_dir)
+    return count
+
+
+def _read_merging(path: Path) -> tuple[dict[str, list[tuple[str, str]]], set[str]]:
+    """Get the entries to merge by day (in capture order) and the merged days."""
+    data = path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        # Finish a torn last line so the next marker starts on its own
+        with open(path, "ab") as f:
+            f.write(b"\n")
+
+    entries: dict[str, list[tuple[str, str]]] = {}
+    merged = set()
+    for line in data.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # torn write of a capture that never finished
+        if not isinstance(record, dict):
+            continue
+        if "merged" in record:
+            merged.add(record["merged"])
+        elif {"day", "time", "text"} <= record.keys():
+            entries.setdefault(record["day"], []).append(
+                (record["time"], record["text"])
+            )
+    return entries, merged
+
+
+def _contains(path: Path, data: bytes) -> bool:
+    """Check if a file contains some bytes, without reading it into memory."""
+    try:
+        with (
+            open(path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content,
+        ):
+            return content.find(data) >= 0
+    except (FileNotFoundError, ValueError):  # ValueError: empty file
+        return False
+
+
+def _mark_merged(path: Path, day: str) -> None:
+    """Durably record that a day's entries are in its note."""
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"merged": day}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
@@ -0,0 +1,164 @@
+"""
+Long-running `zk serve` daemon.
+
+The daemon keeps the loaded configuration warm and answers note requests
+over a local Unix socket, so editor integrations only pay for interpreter
+startup plus one round trip. The protocol is one JSON object per line:
+
+    request:  {"command": "new", "title": "...", "root": "$ZETTELKASTEN",
+               "settings": {"ZETTELKASTEN_INBOX_DIR": "...", ...}}
+    response: {"ok": true, "path": "...", "created": true}
+              {"ok": false, "error": "...", "code": 1}
+              {"ok": false, "fallback": true}
+
+The daemon only answers clients whose vault and settings match its own and
+asks the others to fall back to running the command in-process. The client
+side lives in `daemon_client` so the `zk` entry point can probe
+for a daemon without importing the server machinery.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import socketserver
+from pathlib import Path
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.exceptions import (
+    EXPECTED_ERRORS,
+    DaemonError,
+    error_message,
+    exit_code,
+)
+from zettelkasten_cli.services.daemon_client import (
+    COMMANDS,
+    socket_path,
+    vault_settings,
+)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handle a single client connection."""
+
+    server: DaemonServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            response = self.server.dispatch(json.loads(line))
+        except ValueError:
+            response = {"ok": False, "error": "Malformed request.", "code": 1}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server answering note requests with a warm configuration."""
+
+    daemon_threads = True
+
+    def __init__(self, config: Config, path: Path) -> None:
+        self.config = config
+        self.path = path
+        self._roots: dict[str, bool] = {}
+        # From the environment the configuration was loaded from
+        self.settings = vault_settings()
+        _claim_socket(path)
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+    def _serves_root(self, root: str) -> bool:
+        """Check if a client's $ZETTELKASTEN points at this daemon's vault."""
+        if root not in self._roots:
+            resolved = Path(root).expanduser().resolve()
+            self._roots[root] = resolved == self.config.paths.root
+        return self._roots[root]
+
+    def dispatch(self, payload: dict) -> dict:
+        """Run a request and build the response."""
+        from zettelkasten_cli.models.note import Note
+        from zettelkasten_cli.models.periodic_note import daily, weekly
+        from zettelkasten_cli.services.capture import merge_captures
+
+        command = payload.get("command")
+        if (
+            command not in COMMANDS
+            or not self._serves_root(payload.get("root", ""))
+            or payload.get("settings", {}) != self.settings
+        ):
+            return {"ok": False, "fallback": True}
+
+        try:
+            if command == "new":
+                path = Note(title=payload["title"], config=self.config).create()
+                return {"ok": True, "path": str(path), "created": True}
+
+            if command == "day":
+                merge_captures(self.config)
+            note = daily(self.config) if command == "day" else weekly(self.config)
+            created = note.create()
+            return {"ok": True, "path": str(note.note_path), "created": created}
+        except EXPECTED_ERRORS as e:
+            return {"ok": False, "error": error_message(e), "code": exit_code(e)}
+
+
+def _claim_socket(path: Path) -> None:
+    """Remove a stale socket file, refusing if a daemon still answers on it."""
+    if not path.exists():
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            path.unlink(missing_ok=True)
+            return
+    raise DaemonError(f"A daemon is already listening on {path}")
+
+
+def serve(config: Config, path: Path | None = None, watch: bool = False) -> None:
+    """
+    Run the daemon until interrupted.
+
+    Args:
+        config: The configuration to keep warm.
+        path: Socket path (derived from the vault root if not provided).
+        watch: If True, also keep the vault index in sync with the filesystem.
+    """
+    if path is None:
+        path = socket_path()
+
+    try:
+        server = DaemonServer(config, path)
+    except OSError as e:
+        raise DaemonError(f"Could not listen on {path}: {e}") from e
+
+    # Treat `kill` like Ctrl-C so the socket file is cleaned up
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    watcher = None
+    if watch:
+        from zettelkasten_cli.services.watcher import Watcher
+
+        watcher = Watcher(config)
+        watcher.start()
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if watcher is not None:
+                watcher.stop()
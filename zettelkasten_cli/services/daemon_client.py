@@ -0,0 +1,94 @@
+"""Thin client for the `zk serve` daemon (see `daemon` for the protocol)."""
+
+import json
+import os
+import socket
+import zlib
+from pathlib import Path
+
+from zettelkasten_cli.exceptions import DaemonError
+
+# Commands the daemon can answer; anything else runs in-process
+COMMANDS = ("new", "day", "week")
+
+# How long the client waits for the daemon's answer
+CLIENT_TIMEOUT = 5.0
+
+# Settings that only matter to the client (where the daemon listens and how
+# notes are opened), so they may differ between client and daemon
+_CLIENT_SETTINGS = ("ZETTELKASTEN_SOCKET", "ZETTELKASTEN_EDITOR", "ZETTELKASTEN_NVIM_")
+
+
+def socket_path(root: str | None = None) -> Path:
+    """
+    Get the socket path for a vault without loading the configuration.
+
+    Uses ``ZETTELKASTEN_SOCKET`` if set, otherwise a per-vault socket in
+    ``$XDG_RUNTIME_DIR`` (or the temp directory).
+    """
+    override = os.environ.get("ZETTELKASTEN_SOCKET")
+    if override:
+        return Path(override)
+
+    if root is None:
+        root = os.environ.get("ZETTELKASTEN", "")
+    runtime_dir = (
+        os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    )
+    vault_id = f"{zlib.crc32(root.encode()):08x}"
+    return Path(runtime_dir) / f"zk-{os.getuid()}-{vault_id}.sock"
+
+
+def vault_settings() -> dict[str, str]:
+    """
+    Get the ``ZETTELKASTEN_*`` settings that decide where and how notes are
+    written, for the daemon to check they match its own.
+    """
+    return {
+        key: value
+        for key, value in os.environ.items()
+        if key.startswith("ZETTELKASTEN_") and not key.startswith(_CLIENT_SETTINGS)
+    }
+
+
+def request(payload: dict, path: Path | None = None) -> dict | None:
+    """
+    Send a request to a running daemon.
+
+    Returns:
+        The daemon's response, or None if no daemon is reachable or it asked
+        the client to run the command itself.
+
+    Raises:
+        DaemonError: If the daemon took the request but gave no valid answer.
+            The command may have run, so it must not be run again in-process.
+    """
+    if path is None:
+        path = socket_path()
+    if not path.exists():
+        return None
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return None  # stale socket file
+        try:
+            sock.sendall(json.dumps(payload).encode() + b"\n")
+            with sock.makefile("rb") as stream:
+                line = stream.readline()
+        except OSError as e:
+            raise DaemonError(f"No answer from the daemon on {path}: {e}") from e
+
+    if not line:
+        raise DaemonError(f"The daemon on {path} closed the connection.")
+    try:
+        response = json.loads(line)
+    except ValueError:
+        response = None
+    if not isinstance(response, dict):
+        raise DaemonError(f"Malformed answer from the daemon on {path}.")
+    if response.get("fallback"):
+        return None
+    return response
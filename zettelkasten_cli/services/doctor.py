@@ -0,0 +1,121 @@
+"""Vault health checks for `zk doctor`, answered from the vault index."""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.models.periodic_note import is_periodic_name
+from zettelkasten_cli.services.index import VaultIndex
+
+# Embeds of non-note files (![[diagram.png]]) are not broken links
+ATTACHMENT_SUFFIXES = frozenset(
+    {
+        "avif",
+        "bmp",
+        "canvas",
+        "excalidraw",
+        "gif",
+        "jpeg",
+        "jpg",
+        "m4a",
+        "mov",
+        "mp3",
+        "mp4",
+        "ogg",
+        "pdf",
+        "png",
+        "svg",
+        "wav",
+        "webm",
+        "webp",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BrokenLink:
+    """A wikilink to a title no note has."""
+
+    path: Path
+    target: str
+
+
+@dataclass(frozen=True)
+class DoctorReport:
+    """Problems found in the vault."""
+
+    broken_links: list[BrokenLink]
+    # Links to periodic notes not created yet, e.g. tomorrow's from the
+    # default daily template; expected, so not counted as problems
+    missing_periodic: list[BrokenLink]
+    # Inbox notes no other note links to
+    orphans: list[Path]
+    # Notes with nothing but their `# Title` heading, except periodic notes,
+    # which start out that way
+    empty: list[Path]
+    # Groups of notes sharing a title
+    duplicates: list[list[Path]]
+
+    @property
+    def ok(self) -> bool:
+        """Check if no problems were found."""
+        return not (self.broken_links or self.orphans or self.empty or self.duplicates)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "broken_links": [
+                {"path": str(link.path), "target": link.target}
+                for link in self.broken_links
+            ],
+            "missing_periodic": [
+                {"path": str(link.path), "target": link.target}
+                for link in self.missing_periodic
+            ],
+            "orphans": [str(path) for path in self.orphans],
+            "empty": [str(path) for path in self.empty],
+            "duplicates": [[str(path) for path in group] for group in self.duplicates],
+        }
+
+
+def _is_attachment(target: str) -> bool:
+    """Check if a link target names a non-note file."""
+    _, dot, suffix = target.rpartition(".")
+    return bool(dot) and suffix.lower() in ATTACHMENT_SUFFIXES
+
+
+def diagnose(vault_index: VaultIndex, config: Config) -> DoctorReport:
+    """
+    Check an up-to-date vault index for broken links, orphans, empty notes
+    and duplicate titles.
+
+    Links are resolved like wikilinks (case-insensitive, by note name), with
+    indexed joins against the stored titles rather than a pass over the files.
+    Unresolved links named like a periodic note are reported apart from the
+    broken ones.
+
+    Args:
+        vault_index: The (refreshed) index to check.
+        config: The configuration, for the inbox folder.
+    """
+    broken, missing_periodic = [], []
+    for path, target in vault_index.broken_links():
+        if _is_attachment(target):
+            continue
+        name = target.rsplit("/", 1)[-1]
+        group = missing_periodic if is_periodic_name(name) else broken
+        group.append(BrokenLink(path, target))
+
+    return DoctorReport(
+        broken_links=broken,
+        missing_periodic=missing_periodic,
+        orphans=[note.path for note in vault_index.orphans(config.paths.inbox)],
+        empty=[
+            note.path
+            for note in vault_index.empty_notes()
+            if not is_periodic_name(note.title)
+        ],
+        duplicates=[
+            [note.path for note in group] for group in vault_index.duplicate_titles()
+        ],
+    )
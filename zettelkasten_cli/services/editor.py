@@ -1,16 +1,27 @@
 """Editor service for opening files."""
 
+import os
+import socket
 import subprocess
 from pathlib import Path
 
+from zettelkasten_cli import output
 from zettelkasten_cli.config import EditorConfig, get_config
 from zettelkasten_cli.exceptions import EditorError
+from zettelkasten_cli.services.trace import traced
 
+# How long to wait for a Neovim server to accept a connection
+SERVER_TIMEOUT = 0.2
 
+
+@traced("editor.open")
 def open_in_editor(file_path: Path, config: EditorConfig | None = None) -> None:
     """
     Open a file in the configured editor.
 
+    If a Neovim server is configured and reachable, the file is opened there
+    and this returns immediately; otherwise a new editor is started.
+
     Args:
         file_path: Path to the file to open.
         config: Optional editor config (uses global config if not provided).
@@ -21,6 +32,9 @@ def open_in_editor(file_path: Path, config: EditorConfig | None = None) -> None:
     if config is None:
         config = get_config().editor
 
+    if config.is_nvim and config.nvim_server and _open_remote(file_path, config):
+        return
+
     cmd = _build_command(file_path, config)
 
     try:
@@ -34,6 +48,57 @@ def open_in_editor(file_path: Path, config: EditorConfig | None = None) -> None:
         ) from None
 
 
+def _open_remote(file_path: Path, config: EditorConfig) -> bool:
+    """
+    Open a file in a running Neovim via `--server --remote`.
+
+    Returns:
+        True if the file was sent, False if a new editor should be started.
+    """
+    server = config.nvim_server
+    if not _server_reachable(server):
+        return False
+
+    try:
+        subprocess.run(_build_remote_command(file_path, config), check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        output.warning(f"Could not open in Neovim at {server} ({e}); starting nvim")
+        return False
+    return True
+
+
+def _server_reachable(address: str) -> bool:
+    """Check if something accepts connections on a socket path or host:port."""
+    host, sep, port = address.rpartition(":")
+    try:
+        if sep and port.isdigit() and "/" not in address:
+            with socket.create_connection(
+                (host.strip("[]"), int(port)), timeout=SERVER_TIMEOUT
+            ):
+                return True
+
+        if not hasattr(socket, "AF_UNIX") or address.startswith("\\\\"):
+            # Windows named pipe: existence is the best cheap check
+            return os.path.exists(address)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SERVER_TIMEOUT)
+            sock.connect(address)
+        return True
+    except OSError:
+        return False
+
+
+def _build_remote_command(file_path: Path, config: EditorConfig) -> list[str]:
+    """
+    Build the command that opens a file in a running Neovim.
+
+    The running instance keeps its own layout, so `nvim_args` and
+    `nvim_commands` are only used when starting a new editor.
+    """
+    return [config.command, "--server", config.nvim_server, "--remote", str(file_path)]
+
+
 def _build_command(file_path: Path, config: EditorConfig) -> list[str]:
     """Build the command list for the editor."""
     if config.is_nvim:
@@ -0,0 +1,231 @@
+"""
+Streaming vault export for `zk export`.
+
+Notes are streamed from `Scanner.walk` through `Scanner.read`'s bounded
+thread pool straight into the output, so memory stays flat however large the
+vault is. Two formats are supported:
+
+- NDJSON: one JSON object per note with its path, title, modification time,
+  frontmatter, outgoing wikilinks and body, for analysis pipelines.
+- tar: the note files themselves with their modification times, for backups.
+
+Either can be gzip- or zstd-compressed. With a watermark file, only notes
+modified since the previous export that used the same file are exported.
+"""
+
+import gzip
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO
+
+from zettelkasten_cli.exceptions import ZettelkastenError
+from zettelkasten_cli.services.fs import replace_atomic
+from zettelkasten_cli.services.markdown import extract_wikilinks, parse_frontmatter
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX, READ_WORKERS, Scanner
+from zettelkasten_cli.services.trace import traced
+
+
+class ExportFormat(Enum):
+    """Export file formats."""
+
+    NDJSON = "ndjson"
+    TAR = "tar"
+
+
+class Compression(Enum):
+    """Export compression methods."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+@dataclass(frozen=True)
+class ExportStats:
+    """Summary of an export."""
+
+    notes: int
+    # Notes skipped as unchanged since the watermark
+    unchanged: int
+    elapsed: float
+
+
+def guess_format(path: Path) -> tuple[ExportFormat, Compression]:
+    """
+    Infer the format and compression from an output file name.
+
+    ``.tar``, ``.tar.gz``/``.tgz`` and ``.tar.zst``/``.tzst`` are tar
+    archives; anything else is NDJSON, compressed if it ends in ``.gz`` or
+    ``.zst``.
+    """
+    name = path.name.lower()
+    compression = Compression.NONE
+    if name.endswith((".gz", ".tgz")):
+        compression = Compression.GZIP
+    elif name.endswith((".zst", ".tzst")):
+        compression = Compression.ZSTD
+
+    is_tar = name.endswith((".tar", ".tar.gz", ".tgz", ".tar.zst", ".tzst"))
+    return ExportFormat.TAR if is_tar else ExportFormat.NDJSON, compression
+
+
+def note_record(rel: str, data: bytes) -> dict:
+    """
+    Build the NDJSON record for a note (without its modification time).
+
+    Runs on the read pool (see `Scanner.read`).
+    """
+    text = data.decode("utf-8", errors="replace")
+    frontmatter, body = parse_frontmatter(text)
+    return {
+        "path": rel,
+        "title": rel.rsplit("/", 1)[-1][: -len(NOTE_SUFFIX)],
+        "mtime": None,
+        "frontmatter": frontmatter,
+        "links": extract_wikilinks(body),
+        "body": body,
+    }
+
+
+@contextmanager
+def _open_output(path: Path | None, compression: Compression) -> Iterator[BinaryIO]:
+    """
+    Open the export destination for binary writing.
+
+    Files are written next to their final name and renamed into place once
+    complete, so a failed export never leaves a truncated file behind.
+    """
+    if path is None:
+        with _compressor(sys.stdout.buffer, compression) as stream:
+            yield stream
+        sys.stdout.buffer.flush()
+        return
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as raw, _compressor(raw, compression) as stream:
+            yield stream
+        tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _compressor(raw: BinaryIO, compression: Compression):
+    """Wrap a binary stream in a compressor (closing it leaves raw open)."""
+    if compression is Compression.GZIP:
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0)
+    if compression is Compression.ZSTD:
+        try:
+            # Deferred: the standard library only has zstd from Python 3.14
+            from compression.zstd import ZstdFile
+        except ImportError:
+            raise ZettelkastenError(
+                "zstd compression needs Python 3.14 or newer; use gzip instead."
+            ) from None
+        return ZstdFile(raw, "wb")
+    return nullcontext(raw)
+
+
+def read_watermark(path: Path) -> int:
+    """Get the time (ns) of the export that last used a watermark file, or 0."""
+    try:
+        return int(json.loads(path.read_text(encoding="utf-8"))["mtime_ns"])
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise ZettelkastenError(f"Invalid watermark file {path}: {e}") from e
+
+
+@traced("export")
+def export_vault(
+    root: Path,
+    output: Path | None,
+    fmt: ExportFormat = ExportFormat.NDJSON,
+    compression: Compression = Compression.NONE,
+    watermark: Path | None = None,
+    workers: int = READ_WORKERS,
+) -> ExportStats:
+    """
+    Stream the notes of a vault into an export.
+
+    Args:
+        root: The vault root.
+        output: The file to write, or None for stdout.
+        fmt: NDJSON records or a tar archive of the note files.
+        compression: How to compress the output.
+        watermark: If given, only export notes modified since the last export
+            that used this file, and record this export's start time in it
+            once the export is complete.
+        workers: Number of reader threads.
+    """
+    start = time.perf_counter()
+    started_ns = time.time_ns()
+    since_ns = read_watermark(watermark) if watermark is not None else 0
+
+    scanner = Scanner(root)
+    unchanged = 0
+
+    def changed() -> Iterator:
+        nonlocal unchanged
+        for rel, st in scanner.walk():
+            if st.st_mtime_ns >= since_ns:
+                yield rel, st
+            else:
+                unchanged += 1
+
+    parse = note_record if fmt is ExportFormat.NDJSON else None
+    entries = scanner.read(changed(), parse=parse, workers=workers)
+    with _open_output(output, compression) as stream:
+        if fmt is ExportFormat.NDJSON:
+            count = _write_ndjson(stream, entries)
+        else:
+            count = _write_tar(stream, entries)
+
+    if watermark is not None:
+        watermark.parent.mkdir(parents=True, exist_ok=True)
+        replace_atomic(watermark, json.dumps({"mtime_ns": started_ns}) + "\n")
+    return ExportStats(
+        notes=count, unchanged=unchanged, elapsed=time.perf_counter() - start
+    )
+
+
+def _write_ndjson(stream: BinaryIO, entries: Iterator) -> int:
+    """Write one JSON line per note."""
+    count = 0
+    for _, st, record in entries:
+        if record is None:
+            continue
+        record["mtime"] = (
+            datetime.fromtimestamp(st.st_mtime, UTC)
+            .isoformat(timespec="seconds")
+            .replace("+00:00", "Z")
+        )
+        stream.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        count += 1
+    return count
+
+
+def _write_tar(stream: BinaryIO, entries: Iterator) -> int:
+    """Write the note files into a streamed tar archive."""
+    count = 0
+    with tarfile.open(fileobj=stream, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for rel, st, data in entries:
+            if data is None:
+                continue
+            info = tarfile.TarInfo(rel)
+            info.size = len(data)
+            info.mtime = st.st_mtime
+            info.mode = st.st_mode & 0o777
+            tar.addfile(info, io.BytesIO(data))
+            count += 1
+    return count
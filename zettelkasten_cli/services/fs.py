@@ -0,0 +1,359 @@
+"""Crash- and concurrency-safe file writes."""
+
+import mmap
+import os
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, suppress
+from io import TextIOWrapper
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, appends are unguarded
+    fcntl = None
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory entry change (creation/rename) to disk."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _temp_path(path: Path) -> Path:
+    """Get a unique hidden temp file path next to path."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp")
+
+
+def create_exclusive(path: Path, content: str, sync: bool = True) -> bool:
+    """
+    Atomically create a file with the given content, unless it already exists.
+
+    The content is written to a temp file which is then hard-linked into
+    place, so readers never see a partially written file and concurrent
+    creators cannot overwrite each other.
+
+    Args:
+        path: The file to create.
+        content: The full file content.
+        sync: If True, fsync the file and directory before returning.
+
+    Returns:
+        True if the file was created, False if it already existed.
+    """
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, "x", encoding="utf-8") as f:
+            f.write(content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            return False
+        except OSError:
+            # Filesystem without hard links: fall back to an exclusive create
+            try:
+                with open(path, "x", encoding="utf-8") as f:
+                    f.write(content)
+            except FileExistsError:
+                return False
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    if sync:
+        fsync_dir(path.parent)
+    return True
+
+
+def move_exclusive(src: Path, dst: Path) -> bool:
+    """
+    Move a file, unless the destination already exists.
+
+    Hard-links the file into place and then removes the source, so an
+    existing file is never overwritten, even by a concurrent creator. The
+    caller is responsible for syncing the directories if needed.
+
+    Returns:
+        True if the file was moved, False if the destination existed.
+    """
+    try:
+        os.link(src, dst)
+    except FileExistsError:
+        return False
+    except OSError:
+        # Filesystem without hard links: fall back to a checked rename
+        if dst.exists():
+            return False
+        os.rename(src, dst)
+        return True
+    os.unlink(src)
+    return True
+
+
+def replace_atomic(path: Path, content: str | bytes, sync: bool = True) -> None:
+    """
+    Atomically replace a file's content.
+
+    The content is written to a temp file which is then renamed over the
+    original, so readers (and a crash) see either the old or the new content.
+    The original file's permissions are kept.
+
+    Args:
+        path: The file to replace (or create).
+        content: The full new content; text is written as UTF-8.
+        sync: If True, fsync the file and directory before returning.
+    """
+    tmp = _temp_path(path)
+    try:
+        with open(tmp, "xb") as f:
+            f.write(content.encode("utf-8") if isinstance(content, str) else content)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        with suppress(FileNotFoundError):
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    if sync:
+        fsync_dir(path.parent)
+
+
+def _lock_current(fd: int, path: Path) -> bool:
+    """
+    Take an exclusive lock on an open file.
+
+    Returns:
+        True if the file is still the one at path, False if it was replaced
+        or removed while waiting (the caller should reopen it).
+    """
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        return os.stat(path).st_ino == os.fstat(fd).st_ino
+    except FileNotFoundError:
+        return False
+
+
+@contextmanager
+def locked_read(path: Path) -> Iterator[bytes]:
+    """
+    Read a file while holding an exclusive lock on it.
+
+    Use with `replace_atomic` for a read-modify-write that cannot lose
+    concurrent `locked_append` writes: appenders wait for the lock and then
+    append to the replaced file. If the file is replaced while waiting for
+    the lock, the new file is read instead.
+    """
+    while True:
+        with open(path, "rb") as f:
+            if fcntl is not None and not _lock_current(f.fileno(), path):
+                continue
+            try:
+                yield f.read()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return
+
+
+@contextmanager
+def locked_append(path: Path) -> Iterator[TextIOWrapper]:
+    """
+    Open a file for appending while holding an exclusive lock on it.
+
+    Writers using this helper are serialized; everything written inside the
+    block is flushed and fsynced before the lock is released. If the file is
+    replaced while waiting for the lock (see `locked_read`), the new file is
+    opened and locked instead.
+    """
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            if fcntl is not None and not _lock_current(f.fileno(), path):
+                continue
+            try:
+                yield f
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            return
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on a lock file (created if missing) for a block."""
+    with open(path, "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def append_shared(path: Path, data: bytes, sync: bool = True) -> None:
+    """
+    Append bytes to a file with a single write, creating it if needed.
+
+    Many writers can append at once: each holds a shared lock and writes in
+    one O_APPEND call, so records never interleave. A reader that takes the
+    exclusive lock (see `locked_read`) and renames the file away waits for
+    in-flight appends; later appends then go to a new file.
+
+    Args:
+        path: The file to append to; its directory must exist.
+        data: The bytes to append, e.g. complete lines.
+        sync: If True, flush the data (and a new file's entry) to disk.
+    """
+    while True:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        if fcntl is None:
+            break
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        try:
+            if os.stat(path).st_ino == os.fstat(fd).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)
+
+    try:
+        created = os.fstat(fd).st_size == 0
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        if sync:
+            getattr(os, "fdatasync", os.fsync)(fd)
+            if created:
+                fsync_dir(path.parent)
+    finally:
+        os.close(fd)
+
+
+# Finds where text goes in a file: given the file's content (a memory map,
+# or b"" for an empty file) and the bytes to add, returns the offset and the
+# bytes to insert there
+Locator = Callable[[bytes | mmap.mmap, bytes], tuple[int, bytes]]
+
+
+class InsertWriter:
+    """
+    Text writes to a locked file, inserted where a locator says on flush.
+
+    Text going to the end of the file is appended. Anything else is spliced
+    in by writing a new file from the memory-mapped old one and renaming it
+    into place, so a crash leaves either version; the new file is locked
+    before the rename, so the lock is never lost. See `locked_insert`.
+    """
+
+    def __init__(self, path: Path, fd: int, locate: Locator | None) -> None:
+        self.path = path
+        self._fd = fd
+        self._locate = locate
+        self._pending: list[str] = []
+
+    def write(self, text: str) -> None:
+        """Queue text to be inserted on the next flush."""
+        self._pending.append(text)
+
+    def flush(self) -> None:
+        """Insert the queued text and sync it to disk."""
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode("utf-8")
+        self._pending.clear()
+
+        size = os.fstat(self._fd).st_size
+        if self._locate is None:
+            self._append(data)
+        elif size == 0:
+            self._append(self._locate(b"", data)[1])
+        else:
+            with mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ) as content:
+                offset, data = self._locate(content, data)
+                if offset >= size:
+                    self._append(data)
+                else:
+                    self._splice(content, offset, data)
+
+    def close(self) -> None:
+        """Flush, then release the lock."""
+        try:
+            self.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+
+    def _append(self, data: bytes) -> None:
+        os.lseek(self._fd, 0, os.SEEK_END)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view) :]
+        os.fsync(self._fd)
+
+    def _splice(self, content: mmap.mmap, offset: int, data: bytes) -> None:
+        tmp = _temp_path(self.path)
+        fd = os.open(tmp, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), "wb") as f, memoryview(content) as view:
+                f.write(view[:offset])
+                f.write(data)
+                f.write(view[offset:])
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp, os.fstat(self._fd).st_mode & 0o7777)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.close(fd)
+            tmp.unlink(missing_ok=True)
+            raise
+        fsync_dir(self.path.parent)
+
+        # Waiters on the old file find it replaced and queue on this one
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = fd
+
+
+@contextmanager
+def locked_insert(path: Path, locate: Locator | None = None) -> Iterator[InsertWriter]:
+    """
+    Hold an exclusive lock on a file, yielding a writer that inserts text.
+
+    Like `locked_append`, but text can go anywhere in the file: on flush
+    (and at the end of the block), `locate` is called with the file mapped
+    into memory, so large files are searched without being read into Python
+    objects. Writers are serialized with `locked_append` and `locked_read`.
+
+    Args:
+        path: The file to write to; it must exist.
+        locate: Finds where the text goes (default: the end of the file).
+    """
+    while True:
+        fd = os.open(path, os.O_RDWR)
+        if fcntl is None or _lock_current(fd, path):
+            break
+        os.close(fd)
+
+    writer = InsertWriter(path, fd, locate)
+    try:
+        yield writer
+    finally:
+        writer.close()
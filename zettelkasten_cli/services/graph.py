@@ -0,0 +1,90 @@
+"""Link graph queries over the vault index."""
+
+from dataclasses import dataclass, replace
+from enum import Enum
+
+from zettelkasten_cli.services.index import IndexedNote, VaultIndex
+from zettelkasten_cli.services.markdown import title_key
+
+
+class Direction(Enum):
+    """Which links to follow when walking the graph."""
+
+    OUTGOING = "outgoing"
+    INCOMING = "incoming"
+    BOTH = "both"
+
+
+@dataclass(frozen=True)
+class Neighbour:
+    """A note reachable from the starting note."""
+
+    key: str
+    distance: int
+    notes: list[IndexedNote]
+    # The target as written in a link, for targets without a note
+    target: str | None = None
+
+    @property
+    def title(self) -> str:
+        """Get the display title (as linked if the target has no note)."""
+        if self.notes:
+            return self.notes[0].title
+        return self.target or self.key
+
+    @property
+    def exists(self) -> bool:
+        """Check if the link target resolves to a note in the vault."""
+        return bool(self.notes)
+
+
+def neighbourhood(
+    vault_index: VaultIndex,
+    title: str,
+    depth: int = 1,
+    direction: Direction = Direction.OUTGOING,
+) -> list[Neighbour]:
+    """
+    Get every note within ``depth`` links of a note (breadth-first).
+
+    Each hop is answered with one indexed query for the whole frontier, so the
+    cost grows with the size of the neighbourhood rather than of the vault.
+
+    Args:
+        vault_index: The index to query.
+        title: Title of the starting note.
+        depth: Maximum number of hops.
+        direction: Which links to follow.
+
+    Returns:
+        Neighbours ordered by distance, then title key. Link targets without a
+        matching note are included with an empty ``notes`` list.
+    """
+    start = title_key(title)
+    distances = {start: 0}
+    frontier = {start}
+
+    for distance in range(1, depth + 1):
+        if not frontier:
+            break
+        found = vault_index.linked_keys(
+            frontier,
+            outgoing=direction in (Direction.OUTGOING, Direction.BOTH),
+            incoming=direction in (Direction.INCOMING, Direction.BOTH),
+        )
+        frontier = found - distances.keys()
+        for key in frontier:
+            distances[key] = distance
+
+    del distances[start]
+    neighbours = [
+        Neighbour(key=key, distance=distance, notes=vault_index.find_title(key))
+        for key, distance in sorted(distances.items(), key=lambda kv: (kv[1], kv[0]))
+    ]
+    missing = {n.key for n in neighbours if not n.exists}
+    if not missing:
+        return neighbours
+    targets = vault_index.link_targets(missing)
+    return [
+        n if n.exists else replace(n, target=targets.get(n.key)) for n in neighbours
+    ]
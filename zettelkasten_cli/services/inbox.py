@@ -0,0 +1,173 @@
+"""Listing and bulk-moving the notes in the inbox, for `zk inbox`."""
+
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import Enum
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.exceptions import NoteExistsError, ZettelkastenError
+from zettelkasten_cli.services.fs import fsync_dir, move_exclusive
+from zettelkasten_cli.services.index import VaultIndex
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX, Scanner
+
+_DAY_NS = 86_400 * 10**9
+
+
+class InboxSort(Enum):
+    """Orders for listing the inbox."""
+
+    AGE = "age"
+    SIZE = "size"
+    LINKS = "links"
+    TITLE = "title"
+
+
+@dataclass(frozen=True)
+class InboxNote:
+    """A note in the inbox, with what it is sorted by."""
+
+    path: Path
+    title: str
+    size: int
+    # Birth time where the OS records one, else the modification time
+    created_ns: int
+    # Notes linking to it; only known when listed with the vault index
+    links: int | None = None
+
+
+def list_inbox(
+    config: Config,
+    sort: InboxSort = InboxSort.AGE,
+    reverse: bool = False,
+    vault_index: VaultIndex | None = None,
+) -> list[InboxNote]:
+    """
+    List the notes in the inbox, oldest (or smallest, least linked) first.
+
+    Sizes and ages come from a single `scandir` pass that stats each file
+    once; link counts come from the vault index.
+
+    Args:
+        config: The configuration, for the inbox folder.
+        sort: What to sort by.
+        reverse: Sort in descending order.
+        vault_index: A refreshed index; required when sorting by links.
+    """
+    if sort is InboxSort.LINKS and vault_index is None:
+        raise ZettelkastenError("Sorting by links needs the vault index.")
+
+    inbox = config.paths.inbox
+    scanner = Scanner(config.paths.root)
+    counts = vault_index.backlink_counts(inbox) if vault_index is not None else {}
+
+    notes = []
+    for rel, st in scanner.walk(inbox.relative_to(config.paths.root).as_posix()):
+        path = scanner.root / rel
+        birth_ns = getattr(st, "st_birthtime_ns", None) or st.st_mtime_ns
+        notes.append(
+            InboxNote(
+                path=path,
+                title=path.name[: -len(NOTE_SUFFIX)],
+                size=st.st_size,
+                created_ns=min(birth_ns, st.st_mtime_ns),
+                links=counts.get(path, 0) if vault_index is not None else None,
+            )
+        )
+
+    key = {
+        InboxSort.AGE: lambda note: note.created_ns,
+        InboxSort.SIZE: lambda note: note.size,
+        InboxSort.LINKS: lambda note: note.links,
+        InboxSort.TITLE: lambda note: note.title.casefold(),
+    }[sort]
+    notes.sort(key=key, reverse=reverse)
+    return notes
+
+
+def match_inbox(config: Config, pattern: str) -> list[Path]:
+    """
+    Get the inbox notes whose title matches a glob, case-insensitively.
+
+    Args:
+        config: The configuration, for the inbox folder.
+        pattern: A glob such as ``"Meeting *"``, matched against titles.
+    """
+    scanner = Scanner(config.paths.root)
+    inbox = config.paths.inbox.relative_to(config.paths.root).as_posix()
+    pattern = pattern.casefold()
+    return sorted(
+        scanner.root / rel
+        for rel, _ in scanner.walk(inbox)
+        if fnmatchcase(rel.rsplit("/", 1)[-1][: -len(NOTE_SUFFIX)].casefold(), pattern)
+    )
+
+
+def move_notes(
+    config: Config,
+    paths: list[Path],
+    destination: Path,
+    vault_index: VaultIndex | None = None,
+) -> Iterator[tuple[Path, Path]]:
+    """
+    Move notes into a folder as one batch.
+
+    Conflicts are checked for all notes before any is moved. Directories are
+    synced and the index updated once for the whole batch, also if the move
+    is interrupted. Wikilinks resolve by title, so they keep working.
+
+    Args:
+        config: The configuration, for the vault root.
+        paths: The notes to move.
+        destination: Target folder, relative to the vault root or absolute
+            inside it; created if missing.
+        vault_index: The index to update, if there is one.
+
+    Yields:
+        (old path, new path) for each note as it is moved.
+
+    Raises:
+        NoteExistsError: If a target exists or two notes share a name; nothing
+            is moved.
+        ZettelkastenError: If the destination is outside the vault.
+    """
+    root = config.paths.root
+    destination = root / destination
+    if not destination.resolve().is_relative_to(root.resolve()):
+        raise ZettelkastenError(f"{destination} is outside the vault.")
+
+    moves = [
+        (path, destination / path.name) for path in paths if path.parent != destination
+    ]
+    errors = []
+    targets: set[str] = set()
+    for _, target in moves:
+        if target.name in targets or target.exists():
+            errors.append(f"Note already exists: {target}")
+        targets.add(target.name)
+    if errors:
+        raise NoteExistsError("\n".join(errors))
+
+    destination.mkdir(parents=True, exist_ok=True)
+    moved: list[Path] = []
+    try:
+        for path, target in moves:
+            if not move_exclusive(path, target):
+                raise NoteExistsError(f"Note already exists: {target}")
+            moved.extend((path, target))
+            yield path, target
+    finally:
+        if moved:
+            for directory in {path.parent for path in moved}:
+                fsync_dir(directory)
+            if vault_index is not None:
+                vault_index.apply_changes(moved)
+
+
+def age_days(created_ns: int, now_ns: int | None = None) -> int:
+    """Get the age in whole days of something created at the given time."""
+    if now_ns is None:
+        now_ns = time.time_ns()
+    return max(0, (now_ns - created_ns) // _DAY_NS)
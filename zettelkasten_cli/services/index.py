@@ -0,0 +1,1094 @@
+"""Persistent, incrementally refreshed index of the notes in the vault."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from zettelkasten_cli.config import Config, get_config
+from zettelkasten_cli.exceptions import VaultIndexError
+from zettelkasten_cli.services.markdown import (
+    extract_tags,
+    extract_wikilinks,
+    is_empty,
+    tag_key,
+    title_key,
+)
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX, READ_WORKERS, Scanner
+from zettelkasten_cli.services.trace import traced
+
+# See output.py for why `typing.TYPE_CHECKING` is not used
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Self
+
+# Bump whenever the schema changes; outdated databases are rebuilt from scratch
+SCHEMA_VERSION = 8
+
+_SCHEMA = """
+CREATE TABLE notes (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    title_key TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    -- When the note was first seen: birth time where the OS has one, else mtime
+    created_ns INTEGER NOT NULL,
+    words INTEGER NOT NULL,
+    -- Nothing but a `# Title` heading (see `is_empty`)
+    empty INTEGER NOT NULL
+);
+CREATE INDEX notes_title_key ON notes (title_key);
+-- Each note's directory with a trailing slash, "" at the root (see _NOTE_DIR)
+CREATE INDEX notes_dir ON notes (substr(path, 1, length(path) - length(title) - 3));
+
+-- Adjacency list of the link graph: one row per (note, distinct target)
+CREATE TABLE links (
+    note_id INTEGER NOT NULL,
+    target_key TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (note_id, target_key)
+) WITHOUT ROWID;
+CREATE INDEX links_target_key ON links (target_key, note_id);
+
+-- Frontmatter and inline tags: one row per (note, distinct tag), with
+-- per-tag note counts kept up to date; spellings differing only in case are
+-- one tag, shown as the lowest spelling seen so the result is deterministic
+CREATE TABLE tags (
+    note_id INTEGER NOT NULL,
+    tag_key TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (note_id, tag_key)
+) WITHOUT ROWID;
+CREATE INDEX tags_tag_key ON tags (tag_key, note_id);
+CREATE TABLE tag_counts (
+    tag_key TEXT PRIMARY KEY,
+    tag TEXT NOT NULL,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Title trigrams for fuzzy title matching, with per-trigram note counts
+CREATE TABLE trigrams (
+    trigram TEXT NOT NULL,
+    note_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, note_id)
+) WITHOUT ROWID;
+CREATE TABLE trigram_counts (
+    trigram TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE search USING fts5 (
+    title,
+    body,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+"""
+
+_NOTE_COLUMNS = "notes.path, notes.title, notes.mtime_ns, notes.size, notes.hash"
+
+# Must match the notes_dir index expression for SQLite to use the index
+_NOTE_DIR = "substr(path, 1, length(path) - length(title) - 3)"
+
+# Below this many changed files, a thread pool costs more than it saves...
+_PARALLEL_READS = 64
+# ...and below this many, so does a process pool
+_PARALLEL_PARSES = 2000
+
+# SQLite's default limit on host parameters per statement is well above this
+_MAX_PARAMS = 500
+
+# Fuzzy find: postings read per query (rarest trigrams first) and how many
+# of the best candidates are re-scored
+_FIND_POSTINGS = 10_000
+_FIND_CANDIDATES = 200
+
+# BM25 column weights for (title, body): title matches rank higher
+_BM25_WEIGHTS = (10.0, 1.0)
+
+# Quoted phrases or bare words (a trailing * makes a word a prefix query)
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+# Snippet highlight markers, replaced by the caller
+SNIPPET_START = "\x02"
+SNIPPET_END = "\x03"
+
+
+@dataclass(frozen=True)
+class IndexedNote:
+    """A note as recorded in the index."""
+
+    path: Path
+    title: str
+    mtime_ns: int
+    size: int
+    hash: str
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """A single full-text search hit."""
+
+    note: IndexedNote
+    score: float
+    snippet: str
+
+
+@dataclass(frozen=True)
+class FindResult:
+    """A fuzzy title match."""
+
+    note: IndexedNote
+    score: float
+
+
+@dataclass(frozen=True)
+class RefreshStats:
+    """Summary of a single index refresh."""
+
+    total: int
+    added: int
+    updated: int
+    removed: int
+    elapsed: float
+
+    @property
+    def changed(self) -> bool:
+        """Check if the refresh modified the index."""
+        return bool(self.added or self.updated or self.removed)
+
+
+def _fts_query(query: str) -> str:
+    """
+    Translate a user query into an FTS5 MATCH expression.
+
+    Every term is quoted so FTS5 operators in the input are matched literally.
+    ``"a b"`` is a phrase query and ``word*`` a prefix query; all terms must match.
+    """
+    terms = []
+    for phrase, word in _QUERY_TOKEN_RE.findall(query):
+        is_prefix = not phrase and word.endswith("*")
+        text = (phrase or word.rstrip("*")).replace('"', '""').strip()
+        if text:
+            terms.append(f'"{text}"*' if is_prefix else f'"{text}"')
+    return " ".join(terms)
+
+
+def _trigrams(text: str) -> set[str]:
+    """Get the trigrams of a normalized title, padded to weight word starts."""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _subtree(prefix: str) -> tuple[str, str]:
+    """Get the path range of everything below a vault-relative directory."""
+    # Everything after "prefix/" and before "prefix0" ('0' follows '/')
+    return f"{prefix}/", f"{prefix}0"
+
+
+def _hash(data: bytes) -> str:
+    """Get the content hash stored for a note."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+@dataclass(frozen=True)
+class ParsedNote:
+    """Everything the index derives from a note's content."""
+
+    hash: str
+    text: str
+    words: int
+    empty: bool
+    links: list[tuple[str, str]]
+    tags: list[tuple[str, str]]
+
+
+def parse_note(rel: str, data: bytes) -> ParsedNote:
+    """
+    Parse a note's content for the index.
+
+    A module-level function so that it can run in worker threads and
+    processes (see `Scanner.read`).
+
+    Returns:
+        The content hash, decoded text, word count, whether it is empty,
+        (key, target) pairs of its distinct wikilinks and (key, tag) pairs
+        of its distinct tags.
+    """
+    text = data.decode("utf-8", errors="replace")
+    return ParsedNote(
+        hash=_hash(data),
+        text=text,
+        words=len(text.split()),
+        empty=is_empty(text),
+        links=[(title_key(target), target) for target in extract_wikilinks(text)],
+        tags=[(tag_key(tag), tag) for tag in extract_tags(text)],
+    )
+
+
+class VaultIndex:
+    """
+    SQLite-backed index of every note in the vault.
+
+    Stores each note's path, title, mtime, size, content hash and outgoing
+    wikilinks. ``refresh`` only re-reads files whose mtime or size changed,
+    so rescanning an unchanged vault costs one directory walk.
+    """
+
+    def __init__(self, root: Path, db_path: Path) -> None:
+        self.root = root
+        self.db_path = db_path
+        self.scanner = Scanner(root)
+        self._conn = self._connect()
+
+    @classmethod
+    def open(cls, config: Config) -> VaultIndex:
+        """Open (and create if needed) the index for the configured vault."""
+        return cls(root=config.paths.root, db_path=config.paths.index_path)
+
+    @traced("index.open")
+    def _connect(self) -> sqlite3.Connection:
+        """Connect to the database, rebuilding it if the schema is outdated."""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == SCHEMA_VERSION:
+                return conn
+
+            conn.close()
+            self._delete_files()
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            raise VaultIndexError(f"Could not open index {self.db_path}: {e}") from e
+
+    def _delete_files(self) -> None:
+        """Remove the database and its WAL side files."""
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def rebuild(self) -> RefreshStats:
+        """Drop everything and index the vault from scratch."""
+        self.close()
+        self._delete_files()
+        self._conn = self._connect()
+        return self.refresh()
+
+    @traced("index.refresh")
+    def refresh(self, under: Path | None = None) -> RefreshStats:
+        """
+        Bring the index up to date with the vault.
+
+        Files are only read when their mtime or size differs from the index,
+        and only re-parsed when their content hash changed.
+
+        Args:
+            under: Only refresh notes below this directory (default: everything).
+
+        Returns:
+            Statistics about what changed.
+        """
+        start = time.perf_counter()
+        prefix = "" if under in (None, self.root) else self._relative(under)
+        try:
+            with self._conn:
+                total, added, updated, removed = self._refresh_tree(prefix)
+        except sqlite3.Error as e:
+            raise VaultIndexError(f"Could not update index: {e}") from e
+
+        return RefreshStats(
+            total=total,
+            added=added,
+            updated=updated,
+            removed=removed,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def _refresh_tree(self, prefix: str) -> tuple[int, int, int, int]:
+        """
+        Refresh every note below a vault-relative directory ("" for all).
+
+        Returns:
+            The (total, added, updated, removed) note counts.
+        """
+        if prefix:
+            rows = self._conn.execute(
+                "SELECT id, path, mtime_ns, size FROM notes "
+                "WHERE path > ? AND path < ?",
+                _subtree(prefix),
+            )
+        else:
+            rows = self._conn.execute("SELECT id, path, mtime_ns, size FROM notes")
+        known = {
+            path: (note_id, mtime_ns, size) for note_id, path, mtime_ns, size in rows
+        }
+
+        total = 0
+        changed: list[tuple[str, os.stat_result]] = []
+        note_ids: list[int | None] = []
+        for rel, st in self.scanner.walk(prefix):
+            total += 1
+            row = known.pop(rel, None)
+            if row and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+                continue
+            changed.append((rel, st))
+            note_ids.append(row[0] if row else None)
+
+        # Read and parse changed files in parallel (in worker processes for
+        # large batches); SQLite writes stay on this thread
+        workers = 1 if len(changed) < _PARALLEL_READS else READ_WORKERS
+        reads = self.scanner.read(
+            changed,
+            parse=parse_note,
+            workers=workers,
+            processes=len(changed) >= _PARALLEL_PARSES,
+        )
+        added = updated = 0
+        for (rel, st, parsed), note_id in zip(reads, note_ids, strict=True):
+            if self._index_file(rel, st, note_id, parsed):
+                if note_id is None:
+                    added += 1
+                else:
+                    updated += 1
+
+        for note_id, _, _ in known.values():
+            self._delete(note_id)
+        return total, added, updated, len(known)
+
+    def sync_path(self, path: Path) -> None:
+        """Update the index entry for a single note, e.g. right after writing it."""
+        if not path.is_relative_to(self.root) or path.suffix != NOTE_SUFFIX:
+            return
+
+        with self._conn:
+            self._sync_file(self._relative(path))
+
+    def _sync_file(self, rel: str) -> str | None:
+        """
+        Re-index a single note by its vault-relative path.
+
+        Returns:
+            "added", "updated" or "removed", or None if nothing changed.
+        """
+        row = self._conn.execute(
+            "SELECT id, mtime_ns, size FROM notes WHERE path = ?", (rel,)
+        ).fetchone()
+        try:
+            st = os.stat(self.root / rel)
+        except OSError:
+            if row is None:
+                return None
+            self._delete(row[0])
+            return "removed"
+
+        if row and row[1] == st.st_mtime_ns and row[2] == st.st_size:
+            return None
+        if not self._index_file(rel, st, row[0] if row else None):
+            return None
+        return "updated" if row else "added"
+
+    @traced("index.apply_changes")
+    def apply_changes(self, paths: Iterable[Path]) -> RefreshStats:
+        """
+        Update the index for a set of changed paths in one transaction.
+
+        Notes are re-synced one by one. Any other path, e.g. a directory that
+        was created, moved away or deleted, has its whole subtree refreshed.
+        Paths outside the vault or below a dot-directory are ignored.
+
+        Args:
+            paths: Changed paths, as reported by a filesystem watcher.
+
+        Returns:
+            Statistics about what changed; ``total`` is the number of paths
+            that were applied.
+        """
+        start = time.perf_counter()
+        counts: Counter[str | None] = Counter()
+        total = 0
+        try:
+            with self._conn:
+                for path in paths:
+                    if path == self.root:
+                        rel = ""
+                    elif path.is_relative_to(self.root):
+                        rel = self._relative(path)
+                        if self.scanner.ignores(rel):
+                            continue
+                    else:
+                        continue
+
+                    total += 1
+                    if rel and path.suffix == NOTE_SUFFIX and not path.is_dir():
+                        counts[self._sync_file(rel)] += 1
+                    elif rel == "" or not path.exists() or path.is_dir():
+                        _, added, updated, removed = self._refresh_tree(rel)
+                        counts.update(added=added, updated=updated, removed=removed)
+        except sqlite3.Error as e:
+            raise VaultIndexError(f"Could not update index: {e}") from e
+
+        return RefreshStats(
+            total=total,
+            added=counts["added"],
+            updated=counts["updated"],
+            removed=counts["removed"],
+            elapsed=time.perf_counter() - start,
+        )
+
+    @traced("index.refresh_names")
+    def refresh_names(self) -> RefreshStats:
+        """
+        Pick up notes created, renamed or deleted since the index was written.
+
+        Much cheaper than `refresh`: only directories modified since the
+        database was last written are listed, and only names that appeared
+        or disappeared are synced. Edits to existing notes are not noticed,
+        which is fine for title lookups since titles are file names.
+
+        Returns:
+            Statistics about what changed, as for `apply_changes`.
+        """
+        since = self._written_ns()
+        changed: list[Path] = []
+        try:
+            dirs = {""}
+            for prefix in self._note_dirs():
+                parts = prefix.split("/")[:-1]
+                dirs.update("/".join(parts[: i + 1]) for i in range(len(parts)))
+
+            for rel_dir in dirs:
+                path = self.root / rel_dir if rel_dir else self.root
+                try:
+                    # Timestamps are coarse, so a tie still counts as modified
+                    if os.stat(path).st_mtime_ns < since:
+                        continue
+                except OSError:
+                    changed.append(path)
+                    continue
+                changed.extend(self._changed_names(rel_dir, dirs))
+        except sqlite3.Error as e:
+            raise VaultIndexError(f"Could not update index: {e}") from e
+
+        return self.apply_changes(changed)
+
+    def _note_dirs(self) -> Iterator[str]:
+        """
+        Yield the distinct directories holding notes, as "dir/" ("" at the root).
+
+        Skips through the notes_dir index with one seek per directory rather
+        than reading every note.
+        """
+        query = f"SELECT min({_NOTE_DIR}) FROM notes WHERE {_NOTE_DIR} > ?"
+        (prefix,) = self._conn.execute(f"SELECT min({_NOTE_DIR}) FROM notes").fetchone()
+        while prefix is not None:
+            yield prefix
+            (prefix,) = self._conn.execute(query, (prefix,)).fetchone()
+
+    def _written_ns(self) -> int:
+        """Get when the database (or its write-ahead log) was last written."""
+        written = 0
+        for suffix in ("", "-wal"):
+            try:
+                st = os.stat(f"{self.db_path}{suffix}")
+            except OSError:
+                continue
+            # Opening the database creates an empty log, which says nothing
+            if st.st_size:
+                written = max(written, st.st_mtime_ns)
+        return written
+
+    def _changed_names(self, rel_dir: str, dirs: set[str]) -> list[Path]:
+        """
+        Compare a directory's entries with the notes indexed directly in it.
+
+        Returns:
+            Notes that appeared or disappeared, and subdirectories the index
+            does not know yet.
+        """
+        base = self.root / rel_dir if rel_dir else self.root
+        changed: list[Path] = []
+        on_disk = set()
+        try:
+            with os.scandir(base) as it:
+                for entry in it:
+                    rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    if self.scanner.ignores(rel):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if rel not in dirs:
+                            changed.append(base / entry.name)
+                    elif entry.name.endswith(NOTE_SUFFIX) and entry.is_file():
+                        on_disk.add(rel)
+        except OSError:
+            return [base]
+
+        rows = self._conn.execute(
+            f"SELECT path FROM notes WHERE {_NOTE_DIR} = ?",
+            (f"{rel_dir}/" if rel_dir else "",),
+        )
+        indexed = {rel for (rel,) in rows}
+
+        changed.extend(self.root / rel for rel in on_disk ^ indexed)
+        return changed
+
+    def _relative(self, path: Path) -> str:
+        """Get the index key (vault-relative POSIX path) for a path."""
+        return path.relative_to(self.root).as_posix()
+
+    def _index_file(
+        self,
+        rel: str,
+        st: os.stat_result,
+        note_id: int | None,
+        parsed: ParsedNote | None = None,
+    ) -> bool:
+        """
+        Store a single file in the index.
+
+        Args:
+            parsed: The parsed content, if already read; otherwise the file
+                is read and parsed here.
+
+        Returns:
+            True if the file was (re-)parsed, False if only its stat changed
+            or it vanished before it could be read.
+        """
+        if parsed is None:
+            try:
+                parsed = parse_note(rel, (self.root / rel).read_bytes())
+            except OSError:
+                if note_id is not None:
+                    self._delete(note_id)
+                return False
+
+        if note_id is not None:
+            (old_digest,) = self._conn.execute(
+                "SELECT hash FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+            if old_digest == parsed.hash:
+                self._conn.execute(
+                    "UPDATE notes SET mtime_ns = ?, size = ? WHERE id = ?",
+                    (st.st_mtime_ns, st.st_size, note_id),
+                )
+                return False
+
+        title = rel.rsplit("/", 1)[-1][: -len(NOTE_SUFFIX)]
+        if note_id is None:
+            key = title_key(title)
+            created_ns = getattr(st, "st_birthtime_ns", None) or st.st_mtime_ns
+            note_id = self._conn.execute(
+                "INSERT INTO notes "
+                "(path, title, title_key, mtime_ns, size, hash, created_ns, words,"
+                " empty) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    rel,
+                    title,
+                    key,
+                    st.st_mtime_ns,
+                    st.st_size,
+                    parsed.hash,
+                    min(created_ns, st.st_mtime_ns),
+                    parsed.words,
+                    parsed.empty,
+                ),
+            ).lastrowid
+            key_trigrams = _trigrams(key)
+            self._conn.executemany(
+                "INSERT INTO trigrams (trigram, note_id) VALUES (?, ?)",
+                ((trigram, note_id) for trigram in key_trigrams),
+            )
+            self._conn.executemany(
+                "INSERT INTO trigram_counts (trigram, count) VALUES (?, 1) "
+                "ON CONFLICT (trigram) DO UPDATE SET count = count + 1",
+                ((trigram,) for trigram in key_trigrams),
+            )
+        else:
+            self._conn.execute(
+                "UPDATE notes SET mtime_ns = ?, size = ?, hash = ?, words = ?, "
+                "empty = ? WHERE id = ?",
+                (
+                    st.st_mtime_ns,
+                    st.st_size,
+                    parsed.hash,
+                    parsed.words,
+                    parsed.empty,
+                    note_id,
+                ),
+            )
+            self._conn.execute("DELETE FROM links WHERE note_id = ?", (note_id,))
+            self._conn.execute("DELETE FROM search WHERE rowid = ?", (note_id,))
+            self._delete_tags(note_id)
+
+        self._conn.execute(
+            "INSERT INTO search (rowid, title, body) VALUES (?, ?, ?)",
+            (note_id, title, parsed.text),
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO links (note_id, target_key, target) "
+            "VALUES (?, ?, ?)",
+            ((note_id, key, target) for key, target in parsed.links),
+        )
+        self._conn.executemany(
+            "INSERT INTO tags (note_id, tag_key, tag) VALUES (?, ?, ?)",
+            ((note_id, key, tag) for key, tag in parsed.tags),
+        )
+        self._conn.executemany(
+            "INSERT INTO tag_counts (tag_key, tag, count) VALUES (?, ?, 1) "
+            "ON CONFLICT (tag_key) DO UPDATE "
+            "SET count = count + 1, tag = min(tag, excluded.tag)",
+            parsed.tags,
+        )
+        return True
+
+    def _delete_tags(self, note_id: int) -> None:
+        """Remove a note's tags, keeping the tag counts in step."""
+        self._conn.execute(
+            "UPDATE tag_counts SET count = count - 1 WHERE tag_key IN "
+            "(SELECT tag_key FROM tags WHERE note_id = ?)",
+            (note_id,),
+        )
+        self._conn.execute("DELETE FROM tags WHERE note_id = ?", (note_id,))
+
+    def _delete(self, note_id: int) -> None:
+        """Remove a note and everything derived from it."""
+        self._conn.execute("DELETE FROM links WHERE note_id = ?", (note_id,))
+        self._conn.execute("DELETE FROM search WHERE rowid = ?", (note_id,))
+        self._delete_tags(note_id)
+        (key,) = self._conn.execute(
+            "SELECT title_key FROM notes WHERE id = ?", (note_id,)
+        ).fetchone()
+        key_trigrams = _trigrams(key)
+        self._conn.executemany(
+            "DELETE FROM trigrams WHERE trigram = ? AND note_id = ?",
+            ((trigram, note_id) for trigram in key_trigrams),
+        )
+        self._conn.executemany(
+            "UPDATE trigram_counts SET count = count - 1 WHERE trigram = ?",
+            ((trigram,) for trigram in key_trigrams),
+        )
+        self._conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+
+    def _to_note(self, row: tuple) -> IndexedNote:
+        """Convert a notes row to an IndexedNote."""
+        path, title, mtime_ns, size, digest = row
+        return IndexedNote(
+            path=self.root / path,
+            title=title,
+            mtime_ns=mtime_ns,
+            size=size,
+            hash=digest,
+        )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def notes(self) -> Iterator[IndexedNote]:
+        """Iterate over all indexed notes, ordered by path."""
+        for row in self._conn.execute(
+            f"SELECT {_NOTE_COLUMNS} FROM notes ORDER BY path"
+        ):
+            yield self._to_note(row)
+
+    def count(self, under: Path | None = None) -> int:
+        """Count the notes below a directory (default: the whole vault)."""
+        if under is None or under == self.root:
+            return len(self)
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM notes WHERE path > ? AND path < ?",
+            _subtree(self._relative(under)),
+        ).fetchone()[0]
+
+    def word_count(self) -> int:
+        """Get the total number of words in all notes."""
+        return self._conn.execute(
+            "SELECT COALESCE(SUM(words), 0) FROM notes"
+        ).fetchone()[0]
+
+    def link_counts(self) -> tuple[int, int]:
+        """Get the number of distinct links and of notes with outgoing links."""
+        return self._conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT note_id) FROM links"
+        ).fetchone()
+
+    def created_per_day(
+        self, since_ns: int, exclude: Iterable[Path] = ()
+    ) -> dict[str, int]:
+        """
+        Count notes by the local date they were created.
+
+        Args:
+            since_ns: Only count notes created at or after this time.
+            exclude: Directories whose notes are not counted.
+
+        Returns:
+            Note counts keyed by ISO date, for dates with at least one note.
+        """
+        where = ["created_ns >= ?"]
+        params: list[object] = [since_ns]
+        for directory in exclude:
+            if directory.is_relative_to(self.root) and directory != self.root:
+                where.append("NOT (path > ? AND path < ?)")
+                params.extend(_subtree(self._relative(directory)))
+
+        return dict(
+            self._conn.execute(
+                "SELECT date(created_ns / 1000000000, 'unixepoch', 'localtime') AS day,"
+                f" COUNT(*) FROM notes WHERE {' AND '.join(where)} GROUP BY day",
+                params,
+            )
+        )
+
+    def broken_links(self) -> list[tuple[Path, str]]:
+        """
+        Get the wikilinks whose target matches no note title.
+
+        Returns:
+            (linking note path, target as written) pairs, ordered by path.
+        """
+        return [
+            (self.root / path, target)
+            for path, target in self._conn.execute(
+                "SELECT notes.path, links.target FROM links "
+                "JOIN notes ON notes.id = links.note_id "
+                "WHERE NOT EXISTS "
+                "(SELECT 1 FROM notes AS t WHERE t.title_key = links.target_key) "
+                "ORDER BY notes.path, links.target_key"
+            )
+        ]
+
+    def orphans(self, under: Path | None = None) -> list[IndexedNote]:
+        """
+        Get the notes no other note links to.
+
+        Args:
+            under: Only consider notes below this directory.
+        """
+        where, params = "", ()
+        if under is not None and under != self.root:
+            where, params = (
+                "AND notes.path > ? AND notes.path < ?",
+                _subtree(self._relative(under)),
+            )
+        return [
+            self._to_note(row)
+            for row in self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS} FROM notes WHERE NOT EXISTS "
+                "(SELECT 1 FROM links WHERE links.target_key = notes.title_key "
+                f"AND links.note_id != notes.id) {where} ORDER BY notes.path",
+                params,
+            )
+        ]
+
+    def backlink_counts(self, under: Path) -> dict[Path, int]:
+        """Count the other notes linking to each note below a directory."""
+        return {
+            self.root / path: count
+            for path, count in self._conn.execute(
+                "SELECT notes.path, COUNT(links.note_id) FROM notes "
+                "LEFT JOIN links ON links.target_key = notes.title_key "
+                "AND links.note_id != notes.id "
+                "WHERE notes.path > ? AND notes.path < ? GROUP BY notes.id",
+                _subtree(self._relative(under)),
+            )
+        }
+
+    def outgoing_link_counts(self, under: Path) -> dict[Path, int]:
+        """Count the distinct links from each note below a directory."""
+        return {
+            self.root / path: count
+            for path, count in self._conn.execute(
+                "SELECT notes.path, COUNT(links.note_id) FROM notes "
+                "LEFT JOIN links ON links.note_id = notes.id "
+                "WHERE notes.path > ? AND notes.path < ? GROUP BY notes.id",
+                _subtree(self._relative(under)),
+            )
+        }
+
+    def empty_notes(self) -> list[IndexedNote]:
+        """Get the notes with nothing but a title heading."""
+        return [
+            self._to_note(row)
+            for row in self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS} FROM notes WHERE empty ORDER BY path"
+            )
+        ]
+
+    def duplicate_titles(self) -> list[list[IndexedNote]]:
+        """Get groups of notes sharing a title (which wikilinks cannot tell apart)."""
+        groups: dict[str, list[IndexedNote]] = {}
+        for row in self._conn.execute(
+            f"SELECT {_NOTE_COLUMNS}, notes.title_key FROM notes "
+            "WHERE title_key IN "
+            "(SELECT title_key FROM notes GROUP BY title_key HAVING COUNT(*) > 1) "
+            "ORDER BY title_key, path"
+        ):
+            groups.setdefault(row[5], []).append(self._to_note(row[:5]))
+        return list(groups.values())
+
+    def tag_counts(self) -> list[tuple[str, int]]:
+        """Get every tag with its number of notes, most used first."""
+        return self._conn.execute(
+            "SELECT tag, count FROM tag_counts WHERE count > 0 "
+            "ORDER BY count DESC, tag_key"
+        ).fetchall()
+
+    def tagged(self, tag: str) -> list[IndexedNote]:
+        """
+        Get the notes with a tag or a tag nested under it, ordered by path.
+
+        Tags match case-insensitively, with or without the leading ``#``;
+        ``project`` also matches ``project/zk``.
+        """
+        key = tag_key(tag).rstrip("/")
+        return [
+            self._to_note(row)
+            for row in self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS} FROM notes WHERE id IN "
+                "(SELECT note_id FROM tags WHERE tag_key = ? "
+                "OR (tag_key > ? AND tag_key < ?)) ORDER BY path",
+                (key, *_subtree(key)),
+            )
+        ]
+
+    def get(self, path: Path) -> IndexedNote | None:
+        """Get the index entry for a path, if indexed."""
+        row = self._conn.execute(
+            f"SELECT {_NOTE_COLUMNS} FROM notes WHERE path = ?",
+            (self._relative(path),),
+        ).fetchone()
+        return self._to_note(row) if row else None
+
+    def contains(self, path: Path) -> bool:
+        """Check if a path is in the index."""
+        return self.get(path) is not None
+
+    def find_title(self, title: str) -> list[IndexedNote]:
+        """
+        Get all notes with the given title.
+
+        Matching is case-insensitive and Unicode-normalized, like wikilinks.
+        """
+        return [
+            self._to_note(row)
+            for row in self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS} FROM notes WHERE title_key = ? ORDER BY path",
+                (title_key(title),),
+            )
+        ]
+
+    def links_from(self, path: Path) -> list[str]:
+        """Get the outgoing wikilink targets of a note, as written."""
+        return [
+            target
+            for (target,) in self._conn.execute(
+                "SELECT target FROM links JOIN notes ON notes.id = links.note_id "
+                "WHERE notes.path = ? ORDER BY target_key",
+                (self._relative(path),),
+            )
+        ]
+
+    def backlinks(self, title: str) -> list[IndexedNote]:
+        """Get all notes linking to the given title."""
+        return [
+            self._to_note(row)
+            for row in self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS} FROM links "
+                "JOIN notes ON notes.id = links.note_id "
+                "WHERE links.target_key = ? ORDER BY notes.path",
+                (title_key(title),),
+            )
+        ]
+
+    def linked_keys(
+        self, keys: set[str], outgoing: bool = True, incoming: bool = False
+    ) -> set[str]:
+        """
+        Get the title keys adjacent to the given title keys in the link graph.
+
+        Args:
+            keys: Title keys (see ``title_key``) to expand.
+            outgoing: Include targets the notes link to.
+            incoming: Include notes linking to them.
+        """
+        found: set[str] = set()
+        ordered = sorted(keys)
+        for i in range(0, len(ordered), _MAX_PARAMS):
+            chunk = ordered[i : i + _MAX_PARAMS]
+            marks = ", ".join("?" * len(chunk))
+            if outgoing:
+                found.update(
+                    key
+                    for (key,) in self._conn.execute(
+                        "SELECT DISTINCT links.target_key FROM notes "
+                        "JOIN links ON links.note_id = notes.id "
+                        f"WHERE notes.title_key IN ({marks})",
+                        chunk,
+                    )
+                )
+            if incoming:
+                found.update(
+                    key
+                    for (key,) in self._conn.execute(
+                        "SELECT DISTINCT notes.title_key FROM links "
+                        "JOIN notes ON notes.id = links.note_id "
+                        f"WHERE links.target_key IN ({marks})",
+                        chunk,
+                    )
+                )
+        return found
+
+    def link_targets(self, keys: set[str]) -> dict[str, str]:
+        """
+        Get link targets as written, by title key.
+
+        Where a target is written several ways (``[[World]]``, ``[[world]]``),
+        the lowest spelling is used so the result does not depend on the
+        order notes were indexed.
+        """
+        targets: dict[str, str] = {}
+        ordered = sorted(keys)
+        for i in range(0, len(ordered), _MAX_PARAMS):
+            chunk = ordered[i : i + _MAX_PARAMS]
+            marks = ", ".join("?" * len(chunk))
+            targets.update(
+                self._conn.execute(
+                    "SELECT target_key, MIN(target) FROM links "
+                    f"WHERE target_key IN ({marks}) GROUP BY target_key",
+                    chunk,
+                )
+            )
+        return targets
+
+    @traced("index.search")
+    def search(self, query: str, limit: int = 20) -> list[SearchResult]:
+        """
+        Full-text search over note titles and bodies, ranked by BM25.
+
+        Supports ``"exact phrases"`` and ``prefix*`` terms; all terms must match.
+
+        Args:
+            query: The search query.
+            limit: Maximum number of results.
+
+        Returns:
+            Results ordered from best to worst match.
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        try:
+            rows = self._conn.execute(
+                f"SELECT {_NOTE_COLUMNS}, bm25(search, ?, ?) AS score, "
+                "snippet(search, 1, ?, ?, '…', 12) "
+                "FROM search JOIN notes ON notes.id = search.rowid "
+                "WHERE search MATCH ? ORDER BY score LIMIT ?",
+                (*_BM25_WEIGHTS, SNIPPET_START, SNIPPET_END, match, limit),
+            ).fetchall()
+        except sqlite3.Error as e:
+            raise VaultIndexError(f"Search failed: {e}") from e
+
+        return [
+            SearchResult(note=self._to_note(row[:5]), score=-row[5], snippet=row[6])
+            for row in rows
+        ]
+
+    @traced("index.find")
+    def find(self, query: str, limit: int = 10) -> list[FindResult]:
+        """
+        Fuzzy-match note titles against a query.
+
+        Candidates are gathered from the posting lists of the query's rarest
+        trigrams (bounded, so common trigrams cannot make a query slow), then
+        re-scored by trigram similarity with bonuses for prefix and substring
+        matches.
+
+        Args:
+            query: Approximate title.
+            limit: Maximum number of results.
+
+        Returns:
+            Results ordered from best to worst match.
+        """
+        key = title_key(query.strip())
+        if not key:
+            return []
+
+        query_trigrams = _trigrams(key)
+        marks = ", ".join("?" * len(query_trigrams))
+        counts = dict(
+            self._conn.execute(
+                "SELECT trigram, count FROM trigram_counts "
+                f"WHERE count > 0 AND trigram IN ({marks})",
+                tuple(query_trigrams),
+            )
+        )
+
+        shared: Counter[int] = Counter()
+        budget = _FIND_POSTINGS
+        for trigram in sorted(counts, key=counts.__getitem__):
+            if budget <= 0:
+                break
+            postings = self._conn.execute(
+                "SELECT note_id FROM trigrams WHERE trigram = ? LIMIT ?",
+                (trigram, budget),
+            ).fetchall()
+            shared.update(note_id for (note_id,) in postings)
+            budget -= len(postings)
+
+        candidates = [note_id for note_id, _ in shared.most_common(_FIND_CANDIDATES)]
+        if not candidates:
+            return []
+
+        marks = ", ".join("?" * len(candidates))
+        results = []
+        for row in self._conn.execute(
+            f"SELECT {_NOTE_COLUMNS}, notes.title_key FROM notes "
+            f"WHERE notes.id IN ({marks})",
+            candidates,
+        ):
+            candidate_key = row[5]
+            candidate_trigrams = _trigrams(candidate_key)
+            common = len(query_trigrams & candidate_trigrams)
+            score = common / len(query_trigrams | candidate_trigrams)
+            if candidate_key.startswith(key):
+                score += 0.5
+            elif key in candidate_key:
+                score += 0.25
+            results.append(FindResult(note=self._to_note(row[:5]), score=score))
+
+        results.sort(key=lambda r: (-r.score, r.note.title))
+        return results[:limit]
+
+
+def open_index(config: Config | None = None) -> VaultIndex:
+    """Open the vault index (uses global config if not provided)."""
+    if config is None:
+        config = get_config()
+    return VaultIndex.open(config)
@@ -0,0 +1,262 @@
+"""Markdown parsing helpers for notes."""
+
+import re
+import unicodedata
+
+# [[target]], [[target|alias]], [[target#heading]] and ![[embeds]]
+WIKILINK_RE = re.compile(r"!?\[\[([^\[\]\n]+?)\]\]")
+
+# Inline #tags, as Obsidian reads them: after whitespace or at the start of
+# a line, made of letters, digits, _, - and / (for nested tags)
+TAG_RE = re.compile(r"(?:^|(?<=\s))#([\w/-]+)")
+
+# Code spans and fenced code blocks, whose #s are not tags
+CODE_RE = re.compile(r"```.*?(?:```|\Z)|~~~.*?(?:~~~|\Z)|`[^`\n]*`", re.DOTALL)
+
+# A YAML frontmatter block at the very start of a note
+FRONTMATTER_RE = re.compile(
+    r"\A---[ \t]*\r?\n(.*?)^(?:---|\.\.\.)[ \t]*(?:\r?\n|\Z)",
+    re.DOTALL | re.MULTILINE,
+)
+
+
+def link_target(raw: str) -> str:
+    """
+    Get the note a raw wikilink body points to.
+
+    Strips the alias (``a|b``) and heading/block reference (``a#h``, ``a^id``).
+    """
+    target = raw.split("|", 1)[0]
+    target = target.split("#", 1)[0].split("^", 1)[0]
+    return target.strip()
+
+
+def title_key(title: str) -> str:
+    """
+    Get the lookup key for a note title or link target.
+
+    Keys are NFC-normalized and case-folded, and a link target pointing into a
+    folder (``dir/Note``) or at a file (``Note.md``) resolves to the note name,
+    matching how Obsidian resolves links.
+    """
+    name = title.rsplit("/", 1)[-1]
+    if name.endswith(".md"):
+        name = name[:-3]
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+def tag_key(tag: str) -> str:
+    """Get the lookup key for a tag: tags are case-insensitive, like in Obsidian."""
+    return unicodedata.normalize("NFC", tag.strip().lstrip("#")).casefold()
+
+
+def extract_wikilinks(text: str) -> list[str]:
+    """
+    Extract the targets of all wikilinks in the given text.
+
+    Returns:
+        Link targets in order of appearance, with duplicates removed.
+    """
+    seen: dict[str, None] = {}
+    for match in WIKILINK_RE.finditer(text):
+        target = link_target(match.group(1))
+        if target:
+            seen.setdefault(target, None)
+    return list(seen)
+
+
+def replace_wikilinks(text: str, key: str, new_title: str) -> tuple[str, int]:
+    """
+    Point every wikilink to a title at a new title.
+
+    Aliases, heading and block references and folder prefixes are kept:
+    ``[[Old|alias]]`` becomes ``[[New|alias]]`` and ``[[dir/Old#h]]``
+    becomes ``[[dir/New#h]]``.
+
+    Args:
+        text: The note content.
+        key: The title key (see `title_key`) of the links to rewrite.
+        new_title: The title to link to instead.
+
+    Returns:
+        The new text and the number of links rewritten.
+    """
+    count = 0
+
+    def rewrite(match: re.Match[str]) -> str:
+        nonlocal count
+        raw = match.group(1)
+        end = min((i for i in map(raw.find, "|#^") if i != -1), default=len(raw))
+        target = raw[:end].strip()
+        if not target or title_key(target) != key:
+            return match.group(0)
+
+        folder, slash, name = target.rpartition("/")
+        new_target = (
+            folder + slash + new_title + (".md" if name.endswith(".md") else "")
+        )
+        start = raw.index(target)
+        count += 1
+        body = raw[:start] + new_target + raw[start + len(target) :]
+        return match.group(0)[: match.start(1) - match.start()] + body + "]]"
+
+    return WIKILINK_RE.sub(rewrite, text), count
+
+
+def is_empty(text: str) -> bool:
+    """
+    Check if a note has no content beyond its ``# Title`` heading.
+
+    This is what an untouched note created with the default template looks like.
+    """
+    text = text.strip()
+    if text.startswith("# "):
+        text = text.partition("\n")[2].strip()
+    return not text
+
+
+def _scalar(value: str) -> str:
+    """Strip matching quotes from a frontmatter value."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def parse_frontmatter(text: str) -> tuple[dict[str, str | list[str]], str]:
+    """
+    Split a note into its frontmatter and body.
+
+    Understands the subset of YAML that Obsidian writes: ``key: value``
+    pairs, quoted strings, and lists written as ``[a, b]`` or as ``- item``
+    lines. Values are kept as strings; anything else is skipped.
+
+    Returns:
+        The frontmatter (empty if there is none) and the rest of the text.
+    """
+    match = FRONTMATTER_RE.match(text)
+    if match is None:
+        return {}, text
+
+    data: dict[str, str | list[str]] = {}
+    # Keys without an inline value: a block list, or empty if none follows
+    bare: list[str] = []
+    key = None
+    for line in match.group(1).splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- ") or stripped == "-":
+            if key is not None and isinstance(data[key], list):
+                data[key].append(_scalar(stripped[1:]))
+            continue
+
+        name, sep, value = line.partition(":")
+        if not sep or line[:1].isspace():
+            key = None
+            continue
+        key = name.strip()
+        value = value.strip()
+        if not value:
+            data[key] = []
+            bare.append(key)
+        elif value.startswith("[") and value.endswith("]"):
+            data[key] = [
+                _scalar(item) for item in value[1:-1].split(",") if item.strip()
+            ]
+        else:
+            data[key] = _scalar(value)
+
+    for key in bare:
+        if data.get(key) == []:
+            data[key] = ""
+    return data, text[match.end() :]
+
+
+def section_end(content: bytes, heading: str) -> int | None:
+    """
+    Find where text added to the end of a section should go.
+
+    Works on bytes or a memory map using only `find` and slicing, so a large
+    note is searched without being decoded. The section runs from the
+    heading line to the next heading of the same or a higher level.
+
+    Args:
+        content: The note's raw content.
+        heading: The heading line, e.g. ``"## Notes"``.
+
+    Returns:
+        The offset right after the section's last non-blank line, or the end
+        of the content if the section is last; None if there is no such
+        heading.
+    """
+    target = heading.strip().encode("utf-8")
+    level = len(target) - len(target.lstrip(b"#")) or 6
+    size = len(content)
+
+    start = 0
+    while True:
+        pos = content.find(target, start)
+        if pos < 0:
+            return None
+        line_end = content.find(b"\n", pos)
+        if line_end < 0:
+            line_end = size
+        if (pos == 0 or content[pos - 1] == 0x0A) and content[
+            pos + len(target) : line_end
+        ].strip() == b"":
+            break
+        start = pos + 1
+
+    search = line_end
+    while True:
+        nxt = content.find(b"\n#", search)
+        if nxt < 0:
+            return size
+        hashes = nxt + 1
+        while hashes < size and content[hashes] == 0x23:
+            hashes += 1
+        if hashes - nxt - 1 <= level and (
+            hashes == size or content[hashes] in b" \t\r\n"
+        ):
+            break
+        search = nxt + 1
+
+    end = nxt
+    while end > line_end and content[end - 1] in b"\r\n":
+        end -= 1
+    return end
+
+
+def extract_tags(text: str) -> list[str]:
+    """
+    Get the distinct tags of a note, from its frontmatter and inline #tags.
+
+    Frontmatter ``tags`` (or ``tag``) may be a list or a comma- or
+    space-separated string. Inline tags in code are ignored, as are
+    all-digit ones like ``#123``. Nested tags (``#project/zk``) are kept
+    whole.
+
+    Returns:
+        Tags without the leading ``#``, once per key (see `tag_key`), in order
+        of first appearance.
+    """
+    frontmatter, body = (
+        parse_frontmatter(text) if text.startswith("---") else ({}, text)
+    )
+
+    tags: list[str] = []
+    for key in ("tags", "tag"):
+        value = frontmatter.get(key, [])
+        tags.extend(value if isinstance(value, list) else re.split(r"[,\s]+", value))
+    if "#" in body:
+        if "`" in body or "~~~" in body:
+            body = CODE_RE.sub(" ", body)
+        tags.extend(TAG_RE.findall(body))
+
+    distinct: dict[str, str] = {}
+    for tag in tags:
+        tag = tag.strip().lstrip("#").strip("/")
+        if tag and not tag.isdigit():
+            distinct.setdefault(tag_key(tag), tag)
+    return list(distinct.values())
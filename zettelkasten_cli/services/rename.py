@@ -0,0 +1,335 @@
+"""
+Renaming notes and rewriting the wikilinks that point to them.
+
+Only the files the vault index lists as backlinks are read and rewritten,
+each with an atomic replace. Before anything is changed, the original content
+of every file to be rewritten is saved and a journal of the plan is written
+to the vault's state directory; progress is appended to it as the rename
+goes. An interrupted rename can then be resumed (rewriting is idempotent) or
+rolled back, and further renames are refused until one of the two happens.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.exceptions import NoteExistsError, NoteTitleError, RenameError
+from zettelkasten_cli.models.note import validate_title
+from zettelkasten_cli.services.fs import (
+    fsync_dir,
+    locked_read,
+    move_exclusive,
+    replace_atomic,
+)
+from zettelkasten_cli.services.index import VaultIndex
+from zettelkasten_cli.services.markdown import replace_wikilinks, title_key
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX
+from zettelkasten_cli.services.trace import traced
+
+JOURNAL_NAME = "rename.journal"
+BACKUP_DIR_NAME = "rename-backup"
+
+
+@dataclass(frozen=True)
+class RenamePlan:
+    """What a rename changes, as recorded in the journal."""
+
+    old: str
+    new: str
+    old_title: str
+    new_title: str
+    # Vault-relative paths of the files to rewrite, as they are after the
+    # move (a note linking to itself is listed under its new path)
+    files: list[str]
+
+
+@dataclass(frozen=True)
+class RenameResult:
+    """Summary of a completed rename."""
+
+    old_path: Path
+    new_path: Path
+    rewritten: list[Path]
+    links: int
+
+
+class Renamer:
+    """Renames notes in a vault, keeping the vault index up to date."""
+
+    def __init__(self, config: Config, vault_index: VaultIndex) -> None:
+        self.root = config.paths.root
+        self.vault_index = vault_index
+        self.journal_path = config.paths.state_dir / JOURNAL_NAME
+        self.backup_dir = config.paths.state_dir / BACKUP_DIR_NAME
+
+    def pending(self) -> RenamePlan | None:
+        """Get the plan of an interrupted rename, if there is one."""
+        plan, _, _ = self._read_journal()
+        return plan
+
+    @traced("rename")
+    def rename(self, old: str, new_title: str) -> RenameResult:
+        """
+        Rename a note and rewrite all links to it.
+
+        The note keeps its folder. The index must be up to date, since it
+        decides which files are read.
+
+        Args:
+            old: Title of the note to rename.
+            new_title: Its new title.
+
+        Raises:
+            RenameError: If the note is missing or ambiguous, or an earlier
+                rename was interrupted.
+            NoteTitleError: If the new title is invalid.
+            NoteExistsError: If a note with the new title already exists.
+        """
+        pending = self.pending()
+        if pending is not None:
+            raise RenameError(
+                f"Renaming '{pending.old_title}' to '{pending.new_title}' was "
+                "interrupted. Run `zk rename --resume` or `zk rename --rollback` "
+                "first."
+            )
+
+        validate_title(new_title)
+        forbidden = [char for char in "/|#^[]" if char in new_title]
+        if forbidden:
+            raise NoteTitleError(
+                f"Title cannot contain {', '.join(map(repr, forbidden))}."
+            )
+
+        notes = [
+            note for note in self.vault_index.find_title(old) if note.path.exists()
+        ]
+        if not notes:
+            raise RenameError(f"No note titled '{old}'.")
+        if len(notes) > 1:
+            paths = "\n".join(f"  {note.path}" for note in notes)
+            raise RenameError(
+                f"Several notes are titled '{old}'; rename one by hand:\n{paths}"
+            )
+        note = notes[0]
+        if new_title == note.title:
+            raise RenameError(f"The note is already titled '{new_title}'.")
+
+        if title_key(new_title) != title_key(note.title):
+            for existing in self.vault_index.find_title(new_title):
+                if existing.path.exists():
+                    raise NoteExistsError(
+                        f"A note titled '{existing.title}' already exists: "
+                        f"{existing.path}"
+                    )
+
+        old_rel = note.path.relative_to(self.root).as_posix()
+        new_rel = note.path.with_name(new_title + NOTE_SUFFIX).relative_to(self.root)
+        plan = RenamePlan(
+            old=old_rel,
+            new=new_rel.as_posix(),
+            old_title=note.title,
+            new_title=new_title,
+            files=[
+                new_rel.as_posix()
+                if source.path == note.path
+                else source.path.relative_to(self.root).as_posix()
+                for source in self.vault_index.backlinks(note.title)
+            ],
+        )
+        self._begin(plan)
+        return self._run(plan, moved=False, done=set())
+
+    @traced("rename.resume")
+    def resume(self) -> RenameResult:
+        """
+        Finish an interrupted rename.
+
+        Raises:
+            RenameError: If there is nothing to resume.
+        """
+        plan, moved, done = self._read_journal()
+        if plan is None:
+            raise RenameError("No interrupted rename to resume.")
+        return self._run(plan, moved, done)
+
+    @traced("rename.rollback")
+    def rollback(self) -> tuple[RenamePlan, list[Path]]:
+        """
+        Undo an interrupted rename.
+
+        Files are only restored if they still hold exactly what the rename
+        wrote, so later edits are never overwritten.
+
+        Returns:
+            The plan that was undone, and the files that were changed since
+            and left as they are.
+
+        Raises:
+            RenameError: If there is nothing to roll back, or the note cannot
+                be moved back.
+        """
+        plan, moved, _ = self._read_journal()
+        if plan is None:
+            raise RenameError("No interrupted rename to roll back.")
+
+        old_path, new_path = self.root / plan.old, self.root / plan.new
+        # The move may have happened just before it could be recorded; a
+        # file at the new path is otherwise not ours to touch
+        moved = moved or (new_path.exists() and not old_path.exists())
+        old_key = title_key(plan.old_title)
+        kept = []
+        for i, rel in enumerate(plan.files):
+            path = self.root / rel
+            if rel == plan.new and not moved:
+                path = old_path  # interrupted before the move
+            try:
+                original = (self.backup_dir / str(i)).read_bytes()
+            except OSError as e:
+                raise RenameError(f"Saved copy of {path} is missing: {e}") from e
+            rewritten = _rewrite(original, old_key, plan.new_title)[0]
+            try:
+                with locked_read(path) as current:
+                    if current == original:
+                        continue
+                    if current != rewritten:
+                        kept.append(path)
+                        continue
+                    replace_atomic(path, original)
+            except FileNotFoundError:
+                kept.append(path)
+
+        if _same_file(new_path, old_path):
+            os.rename(new_path, old_path)  # case change on a case-insensitive FS
+        elif moved:
+            _move_note(new_path, old_path)
+
+        self.vault_index.apply_changes(
+            [old_path, new_path, *(self.root / rel for rel in plan.files)]
+        )
+        self._finish()
+        return plan, kept
+
+    def _begin(self, plan: RenamePlan) -> None:
+        """Save the files to rewrite and write the journal."""
+        if self.backup_dir.exists():
+            shutil.rmtree(self.backup_dir)
+        self.backup_dir.mkdir(parents=True)
+
+        old_path = self.root / plan.old
+        for i, rel in enumerate(plan.files):
+            path = old_path if rel == plan.new else self.root / rel
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                shutil.rmtree(self.backup_dir)
+                raise RenameError(f"Could not read {path}: {e}") from e
+            replace_atomic(self.backup_dir / str(i), data, sync=False)
+        _fsync_tree(self.backup_dir)
+
+        replace_atomic(self.journal_path, json.dumps(asdict(plan)) + "\n")
+
+    def _run(self, plan: RenamePlan, moved: bool, done: set[str]) -> RenameResult:
+        """Move the note and rewrite the links, recording progress."""
+        old_path, new_path = self.root / plan.old, self.root / plan.new
+        if not moved:
+            if _same_file(old_path, new_path):
+                os.rename(old_path, new_path)  # case change on a case-insensitive FS
+            elif old_path.exists():
+                _move_note(old_path, new_path)
+            elif not new_path.exists():
+                raise RenameError(f"Neither {old_path} nor {new_path} exists.")
+            self._log({"moved": True})
+
+        old_key = title_key(plan.old_title)
+        rewritten = []
+        links = 0
+        for rel in plan.files:
+            if rel in done:
+                continue
+            path = self.root / rel
+            try:
+                with locked_read(path) as data:
+                    new_data, count = _rewrite(data, old_key, plan.new_title)
+                    if count:
+                        replace_atomic(path, new_data)
+            except FileNotFoundError:
+                count = 0
+            if count:
+                rewritten.append(path)
+                links += count
+            self._log({"done": rel})
+
+        self.vault_index.apply_changes([old_path, new_path, *rewritten])
+        self._finish()
+        return RenameResult(old_path, new_path, rewritten, links)
+
+    def _log(self, record: dict) -> None:
+        """Durably append a progress record to the journal."""
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_journal(self) -> tuple[RenamePlan | None, bool, set[str]]:
+        """Get the plan, whether the note was moved, and the rewritten files."""
+        try:
+            lines = self.journal_path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return None, False, set()
+
+        try:
+            plan = RenamePlan(**json.loads(lines[0]))
+        except (IndexError, TypeError, ValueError) as e:
+            raise RenameError(f"Corrupt rename journal {self.journal_path}") from e
+
+        moved = False
+        done = set()
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # torn write of the last record
+            moved = moved or record.get("moved", False)
+            if "done" in record:
+                done.add(record["done"])
+        return plan, moved, done
+
+    def _finish(self) -> None:
+        """Remove the journal and the saved files."""
+        self.journal_path.unlink(missing_ok=True)
+        fsync_dir(self.journal_path.parent)
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+
+def _rewrite(data: bytes, key: str, new_title: str) -> tuple[bytes, int]:
+    """Rewrite links in raw file content, keeping undecodable bytes as they are."""
+    text, count = replace_wikilinks(
+        data.decode("utf-8", errors="surrogateescape"), key, new_title
+    )
+    return text.encode("utf-8", errors="surrogateescape"), count
+
+
+def _same_file(a: Path, b: Path) -> bool:
+    """Check if two paths name the same existing file (e.g. differing only in case)."""
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return False
+
+
+def _move_note(src: Path, dst: Path) -> None:
+    """Move a note, refusing to overwrite another one."""
+    if not move_exclusive(src, dst):
+        raise NoteExistsError(f"Note already exists: {dst}")
+    fsync_dir(dst.parent)
+
+
+def _fsync_tree(directory: Path) -> None:
+    """Flush the files in a directory and the directory itself to disk."""
+    for path in directory.iterdir():
+        with open(path, "rb") as f:
+            os.fsync(f.fileno())
+    fsync_dir(directory)
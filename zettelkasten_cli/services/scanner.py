@@ -0,0 +1,266 @@
+"""
+Vault scanning shared by the index, the watcher and other whole-vault commands.
+
+`Scanner.walk` streams the notes in the vault with `os.scandir`, so only
+one directory listing is held in memory at a time. Dot-entries (`.obsidian`,
+`.git`, `.trash`, the CLI's own `.zk`, editor temp files) are always skipped,
+and a `.zkignore` file at the vault root can exclude more with gitignore-style
+patterns. `Scanner.read` then reads (and parses) the files on a thread or
+process pool with a bounded amount of work in flight.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+NOTE_SUFFIX = ".md"
+IGNORE_FILE = ".zkignore"
+
+# Reads in flight per worker; bounds memory when files are parsed slowly
+_WINDOW_PER_WORKER = 4
+
+# Files per task sent to a worker process
+_CHUNK_SIZE = 256
+
+# Scandir entries are cheap to read in parallel; more threads only add contention
+READ_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore-style glob into a regular expression."""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(parts)
+
+
+class IgnoreRules:
+    """
+    Gitignore-style path exclusions.
+
+    Supports ``#`` comments, ``!`` negation, a trailing ``/`` to match only
+    directories, ``*``, ``?``, ``[...]`` and ``**``. Patterns without a slash
+    match at any depth; patterns with one are relative to the vault root.
+    As in git, the last matching pattern wins.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self._rules: list[tuple[re.Pattern[str], bool, bool]] = []
+        for line in patterns:
+            line = line.rstrip()
+            if not line or line.startswith("#"):
+                continue
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.strip("/") if dir_only else line
+            if not line:
+                continue
+
+            anchored = "/" in line
+            regex = _translate(line.lstrip("/"))
+            if not anchored:
+                regex = f"(?:.*/)?{regex}"
+            self._rules.append((re.compile(f"{regex}$"), negate, dir_only))
+
+    @classmethod
+    def load(cls, root: Path) -> IgnoreRules:
+        """Load the vault's ignore file, if it has one."""
+        try:
+            text = (root / IGNORE_FILE).read_text(encoding="utf-8")
+        except OSError:
+            return cls()
+        return cls(text.splitlines())
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def match(self, rel: str, is_dir: bool = False) -> bool:
+        """Check if a vault-relative path is ignored, ignoring its parents."""
+        ignored = False
+        for regex, negate, dir_only in self._rules:
+            if (is_dir or not dir_only) and regex.match(rel):
+                ignored = not negate
+        return ignored
+
+
+class Scanner:
+    """Walks and reads the notes below a vault root."""
+
+    def __init__(self, root: Path, rules: IgnoreRules | None = None) -> None:
+        self.root = root
+        self.rules = IgnoreRules.load(root) if rules is None else rules
+
+    def walk(self, start: str = "") -> Iterator[tuple[str, os.stat_result]]:
+        """
+        Yield (relative path, stat) for every note, depth first.
+
+        Args:
+            start: Only walk this vault-relative directory (default: everything).
+        """
+        root = str(self.root)
+        rules = self.rules or None
+        stack = [start]
+        while stack:
+            rel_dir = stack.pop()
+            try:
+                it = os.scandir(os.path.join(root, rel_dir) if rel_dir else root)
+            except OSError:
+                continue
+
+            with it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith("."):
+                        continue
+                    rel = f"{rel_dir}/{name}" if rel_dir else name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not (rules and rules.match(rel, is_dir=True)):
+                                stack.append(rel)
+                        elif (
+                            name.endswith(NOTE_SUFFIX)
+                            and entry.is_file()
+                            and not (rules and rules.match(rel))
+                        ):
+                            yield rel, entry.stat()
+                    except OSError:
+                        continue
+
+    def ignores(self, rel: str) -> bool:
+        """Check if a vault-relative path would be skipped by `walk`."""
+        parts = rel.split("/")
+        if any(part.startswith(".") for part in parts):
+            return True
+        if not self.rules:
+            return False
+        return any(
+            self.rules.match("/".join(parts[: i + 1]), is_dir=i < len(parts) - 1)
+            for i in range(len(parts))
+        )
+
+    def read(
+        self,
+        entries: Iterable[tuple[str, os.stat_result]],
+        parse: Callable[[str, bytes], object] | None = None,
+        workers: int = READ_WORKERS,
+        processes: bool = False,
+    ) -> Iterator[tuple[str, os.stat_result, object]]:
+        """
+        Read (and optionally parse) files, yielding results in input order.
+
+        Reads run on a pool with a bounded amount of work in flight, so memory
+        stays bounded however many entries are streamed in.
+
+        Args:
+            entries: (relative path, stat) pairs, e.g. from `walk`.
+            parse: Called as ``parse(rel, data)`` in the worker; its result is
+                yielded instead of the raw bytes. Must be a module-level
+                function when ``processes`` is set.
+            workers: Number of workers; 1 reads in the calling thread.
+            processes: Use worker processes instead of threads, for parsing
+                that is CPU-bound. Files are handed out in chunks to keep
+                inter-process overhead low.
+
+        Yields:
+            (relative path, stat, bytes or parse result). The result is None
+            for files that vanished or could not be read.
+        """
+        load = partial(_load, self.root, parse)
+        if workers <= 1:
+            for rel, st in entries:
+                yield rel, st, load(rel)
+            return
+
+        if processes:
+            yield from self._read_chunks(entries, parse, workers)
+            return
+
+        window = workers * _WINDOW_PER_WORKER
+        pending: deque[tuple[str, os.stat_result, Future]] = deque()
+        with ThreadPoolExecutor(workers, thread_name_prefix="zk-scan") as pool:
+            for rel, st in entries:
+                pending.append((rel, st, pool.submit(load, rel)))
+                if len(pending) >= window:
+                    rel, st, future = pending.popleft()
+                    yield rel, st, future.result()
+            while pending:
+                rel, st, future = pending.popleft()
+                yield rel, st, future.result()
+
+    def _read_chunks(
+        self,
+        entries: Iterable[tuple[str, os.stat_result]],
+        parse: Callable[[str, bytes], object] | None,
+        workers: int,
+    ) -> Iterator[tuple[str, os.stat_result, object]]:
+        """Read files on a process pool, a chunk of paths per task."""
+        load_chunk = partial(_load_chunk, self.root, parse)
+        window = workers * _WINDOW_PER_WORKER
+        pending: deque[tuple[list, Future]] = deque()
+
+        def drain(limit: int) -> Iterator[tuple[str, os.stat_result, object]]:
+            while len(pending) > limit:
+                chunk, future = pending.popleft()
+                for (rel, st), result in zip(chunk, future.result(), strict=True):
+                    yield rel, st, result
+
+        with ProcessPoolExecutor(workers) as pool:
+            chunk: list[tuple[str, os.stat_result]] = []
+            for entry in entries:
+                chunk.append(entry)
+                if len(chunk) == _CHUNK_SIZE:
+                    pending.append(
+                        (chunk, pool.submit(load_chunk, [r for r, _ in chunk]))
+                    )
+                    chunk = []
+                    yield from drain(window)
+            if chunk:
+                pending.append((chunk, pool.submit(load_chunk, [r for r, _ in chunk])))
+            yield from drain(0)
+
+
+def _load(root: Path, parse: Callable[[str, bytes], object] | None, rel: str) -> object:
+    """Read (and parse) one file; None if it cannot be read."""
+    try:
+        with open(root / rel, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    return data if parse is None else parse(rel, data)
+
+
+def _load_chunk(
+    root: Path, parse: Callable[[str, bytes], object] | None, rels: list[str]
+) -> list[object]:
+    """Read (and parse) a chunk of files in a worker process."""
+    return [_load(root, parse, rel) for rel in rels]
@@ -0,0 +1,107 @@
+"""Vault analytics for `zk stats`, aggregated from the vault index."""
+
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.services.index import VaultIndex
+
+
+@dataclass(frozen=True)
+class VaultStats:
+    """A snapshot of the vault's size and growth."""
+
+    notes: int
+    words: int
+    links: int
+    linking_notes: int
+    inbox: int
+    daily: int
+    weekly: int
+    # Notes created per ISO date / ISO week, oldest first, excluding
+    # periodic notes
+    created_per_day: dict[str, int]
+    created_per_week: dict[str, int]
+
+    @property
+    def words_per_note(self) -> float:
+        """Get the average number of words per note."""
+        return self.words / self.notes if self.notes else 0.0
+
+    @property
+    def links_per_note(self) -> float:
+        """Get the average number of distinct outgoing links per note."""
+        return self.links / self.notes if self.notes else 0.0
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict, including derived values."""
+        data = asdict(self)
+        data["words_per_note"] = round(self.words_per_note, 2)
+        data["links_per_note"] = round(self.links_per_note, 2)
+        return data
+
+
+def collect_stats(
+    vault_index: VaultIndex,
+    config: Config,
+    days: int = 14,
+    weeks: int = 8,
+    today: date | None = None,
+) -> VaultStats:
+    """
+    Aggregate statistics from an up-to-date vault index.
+
+    Creation dates are the file's birth time where the OS records one, and
+    otherwise its modification time when the index first saw it.
+
+    Args:
+        vault_index: The (refreshed) index to aggregate.
+        config: The configuration, for the inbox and periodic note folders.
+        days: Number of days of daily growth to report.
+        weeks: Number of ISO weeks of weekly growth to report.
+        today: The last day to report (default: today).
+    """
+    if today is None:
+        today = date.today()
+    paths = config.paths
+
+    first_day = today - timedelta(days=max(days, 1) - 1)
+    this_monday = today - timedelta(days=today.weekday())
+    first_monday = this_monday - timedelta(weeks=max(weeks, 1) - 1)
+    since = datetime.combine(min(first_day, first_monday), datetime.min.time())
+    per_day = vault_index.created_per_day(
+        int(since.timestamp() * 1e9),
+        exclude=[
+            paths.daily_notes,
+            paths.weekly_notes,
+            paths.monthly_notes,
+            paths.quarterly_notes,
+            paths.yearly_notes,
+        ],
+    )
+
+    created_per_day = {
+        day.isoformat(): per_day.get(day.isoformat(), 0)
+        for day in (first_day + timedelta(days=n) for n in range(days))
+    }
+    created_per_week = {
+        f"{monday:%G-W%V}": 0
+        for monday in (first_monday + timedelta(weeks=n) for n in range(weeks))
+    }
+    for day, count in per_day.items():
+        week = f"{date.fromisoformat(day):%G-W%V}"
+        if week in created_per_week:
+            created_per_week[week] += count
+
+    links, linking_notes = vault_index.link_counts()
+    return VaultStats(
+        notes=len(vault_index),
+        words=vault_index.word_count(),
+        links=links,
+        linking_notes=linking_notes,
+        inbox=vault_index.count(paths.inbox),
+        daily=vault_index.count(paths.daily_notes),
+        weekly=vault_index.count(paths.weekly_notes),
+        created_per_day=created_per_day,
+        created_per_week=created_per_week,
+    )
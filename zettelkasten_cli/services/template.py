@@ -1,24 +1,89 @@
-"""Template service for loading note templates."""
+"""Template service for loading and rendering note templates."""
 
+import os
+import re
+from collections.abc import Mapping
 from pathlib import Path
 
 from zettelkasten_cli import output
+from zettelkasten_cli.services.trace import traced
 
+# {{name}} or {{ name }}; anything else (e.g. Templater's {{date:YYYY}}) is
+# left untouched
+_VARIABLE_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
 
-def load_template(template_path: Path) -> str | None:
+
+class CompiledTemplate:
+    """
+    A template parsed once into literal text and variable slots.
+
+    Unknown variables are rendered verbatim, so templates written for other
+    tools keep working.
     """
-    Load a template from the given path.
+
+    __slots__ = ("_head", "_slots")
+
+    def __init__(self, text: str) -> None:
+        pieces = _VARIABLE_RE.split(text)
+        raws = [m.group(0) for m in _VARIABLE_RE.finditer(text)]
+        self._head = pieces[0]
+        # (variable name, original text, literal text that follows)
+        self._slots = tuple(zip(pieces[1::2], raws, pieces[2::2], strict=True))
+
+    @property
+    def variables(self) -> set[str]:
+        """Get the names of all variables used in the template."""
+        return {name for name, _, _ in self._slots}
+
+    def render(self, variables: Mapping[str, str]) -> str:
+        """Render the template with the given variables."""
+        if not self._slots:
+            return self._head
+
+        parts = [self._head]
+        for name, raw, literal in self._slots:
+            parts.append(variables.get(name, raw))
+            parts.append(literal)
+        return "".join(parts)
+
+
+# Compiled templates keyed by path, with the (mtime_ns, size) they were read at
+_cache: dict[Path, tuple[int, int, CompiledTemplate]] = {}
+
+
+@traced("template.load")
+def load_template(template_path: Path) -> CompiledTemplate | None:
+    """
+    Load a compiled template from the given path.
+
+    Templates are compiled once and cached in-process; later calls only
+    stat the file and re-read it if its mtime or size changed. This keeps
+    bulk creation and the `zk serve` daemon from re-parsing templates.
 
     Args:
         template_path: Path to the template file.
 
     Returns:
-        Template content if file exists, None otherwise.
+        The compiled template if the file exists, None otherwise.
     """
     try:
-        if template_path.exists():
-            return template_path.read_text()
+        st = os.stat(template_path)
+    except FileNotFoundError:
+        _cache.pop(template_path, None)
+        return None
+    except OSError as e:
+        output.warning(f"Could not read template {template_path}: {e}")
+        return None
+
+    cached = _cache.get(template_path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    try:
+        template = CompiledTemplate(template_path.read_text())
     except OSError as e:
         output.warning(f"Could not read template {template_path}: {e}")
+        return None
 
-    return None
+    _cache[template_path] = (st.st_mtime_ns, st.st_size, template)
+    return template
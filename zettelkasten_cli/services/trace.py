@@ -0,0 +1,217 @@
+"""
+Lightweight span timing for finding out where a command spends its time.
+
+Tracing is off unless ``ZK_TRACE`` is set or ``zk --profile`` is used:
+
+    ZK_TRACE=1 zk new "Title" --vim     # timing breakdown on stderr
+    ZK_TRACE=trace.json zk day          # Chrome trace (Perfetto, chrome://tracing)
+    ZK_CPROFILE=zk.prof zk index        # cProfile dump for pstats or snakeviz
+
+When tracing is off, `span` returns a shared no-op context manager and
+`traced` functions pay a single flag check, so instrumentation can stay in
+hot paths. This module only imports what the `zk new --vim` fast path
+already loads.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import sys
+import time
+from _thread import get_ident
+from functools import wraps
+
+# See output.py for why `typing.TYPE_CHECKING` is not used
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import ParamSpec, Self, TypeVar
+
+    P = ParamSpec("P")
+    R = TypeVar("R")
+
+_TRUE = ("1", "true", "yes", "on")
+
+_enabled = False
+_json_path: str | None = None
+_profiler = None
+_origin_ns = 0
+_registered = False
+
+# (name, start ns, duration ns, thread id, depth, args), in completion order
+_events: list[tuple[str, int, int, int, int, dict]] = []
+# Current nesting depth per thread
+_depth: dict[int, int] = {}
+
+
+class _Span:
+    """A timed block, recorded when it exits."""
+
+    __slots__ = ("args", "depth", "name", "start", "tid")
+
+    def __init__(self, name: str, args: dict) -> None:
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> Self:
+        self.tid = get_ident()
+        self.depth = _depth.get(self.tid, 0)
+        _depth[self.tid] = self.depth + 1
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        duration = time.perf_counter_ns() - self.start
+        _depth[self.tid] = self.depth
+        _events.append(
+            (self.name, self.start, duration, self.tid, self.depth, self.args)
+        )
+
+
+class _NullSpan:
+    """Stand-in for `_Span` while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enabled() -> bool:
+    """Check if tracing is on."""
+    return _enabled
+
+
+def span(name: str, **args: object) -> _Span | _NullSpan:
+    """
+    Time a block of code.
+
+    Args:
+        name: Span name, e.g. ``"config.load"``.
+        **args: Extra details shown in the report and the Chrome trace.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function so every call is timed as a span."""
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def enable(json_path: str | None = None, cprofile_path: str | None = None) -> None:
+    """
+    Start tracing; the report is written when the process exits.
+
+    Args:
+        json_path: Write a Chrome trace here instead of printing to stderr.
+        cprofile_path: Also run cProfile and dump its stats here.
+    """
+    global _enabled, _json_path, _profiler, _origin_ns, _registered
+
+    if not _enabled:
+        _enabled = True
+        _origin_ns = time.perf_counter_ns()
+    if json_path:
+        _json_path = json_path
+    if cprofile_path and _profiler is None:
+        import cProfile
+
+        _profiler = (cProfile.Profile(), cprofile_path)
+        _profiler[0].enable()
+    if not _registered:
+        atexit.register(finish)
+        _registered = True
+
+
+def enable_from_env() -> None:
+    """Start tracing if ``ZK_TRACE`` or ``ZK_CPROFILE`` asks for it."""
+    value = os.environ.get("ZK_TRACE", "")
+    cprofile_path = os.environ.get("ZK_CPROFILE") or None
+    if value.lower() in _TRUE:
+        enable(cprofile_path=cprofile_path)
+    elif value and value.lower() not in ("0", "false", "no", "off"):
+        enable(json_path=value, cprofile_path=cprofile_path)
+    elif cprofile_path:
+        enable(cprofile_path=cprofile_path)
+
+
+def finish() -> None:
+    """Stop tracing and write the report (runs automatically at exit)."""
+    global _enabled, _json_path, _profiler
+
+    if not _enabled:
+        return
+    total_ns = time.perf_counter_ns() - _origin_ns
+    _enabled = False
+
+    if _profiler is not None:
+        profiler, path = _profiler
+        profiler.disable()
+        profiler.dump_stats(path)
+        _profiler = None
+
+    events = sorted(_events, key=lambda event: event[1])
+    _events.clear()
+    _depth.clear()
+    try:
+        if _json_path:
+            _write_chrome_trace(_json_path, events)
+            _json_path = None
+        else:
+            sys.stderr.write(format_report(events, total_ns))
+    except OSError as e:
+        sys.stderr.write(f"zk trace: could not write report: {e}\n")
+
+
+def format_report(events: list[tuple], total_ns: int) -> str:
+    """Format spans as an indented timing breakdown."""
+    lines = [f"zk trace: {total_ns / 1e6:.2f} ms total"]
+    for name, _, duration, _, depth, args in events:
+        details = " ".join(f"{key}={value}" for key, value in args.items())
+        share = 100 * duration / total_ns if total_ns else 0.0
+        lines.append(
+            f"{duration / 1e6:>10.2f} ms {share:>5.1f}%  {'  ' * depth}{name}"
+            + (f"  {details}" if details else "")
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _write_chrome_trace(path: str, events: list[tuple]) -> None:
+    """Write spans in the Chrome trace event format."""
+    import json
+
+    pid = os.getpid()
+    trace_events = [
+        {
+            "name": name,
+            "ph": "X",
+            "ts": (start - _origin_ns) / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": tid,
+            "args": {key: str(value) for key, value in args.items()},
+        }
+        for name, start, duration, tid, _, args in events
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
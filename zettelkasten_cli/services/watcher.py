@@ -0,0 +1,382 @@
+"""
+Filesystem watcher that keeps the vault index current.
+
+Changes made by Obsidian, Neovim, git or anything else are picked up with
+inotify on Linux, or by polling file mtimes elsewhere. Bursts of events are
+coalesced by a `Debouncer` and applied with `VaultIndex.apply_changes`, so
+queries never need a full walk while a watcher runs. `zk watch` runs one in
+the foreground; `Watcher.start` embeds one in a long-running process such
+as `zk serve --watch`.
+"""
+
+import errno
+import os
+import select
+import signal
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from pathlib import Path
+
+from zettelkasten_cli import output
+from zettelkasten_cli.config import Config
+from zettelkasten_cli.services.index import RefreshStats, VaultIndex
+from zettelkasten_cli.services.scanner import NOTE_SUFFIX, Scanner
+
+# Wait this long after the last event before applying a batch...
+DEBOUNCE_DELAY = 0.2
+# ...but never hold changes back for longer than this during a steady stream
+DEBOUNCE_MAX_DELAY = 2.0
+POLL_INTERVAL = 1.0
+
+# Upper bound on a single blocking read, so stop requests are noticed
+_READ_TIMEOUT = 0.5
+
+# inotify(7) flags
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_ONLYDIR
+)
+
+# struct inotify_event header: wd, mask, cookie, len (followed by the name)
+_EVENT = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+class Debouncer:
+    """
+    Coalesce bursts of change events into batches of distinct paths.
+
+    A batch becomes ready once no event has arrived for ``delay`` seconds,
+    or ``max_delay`` seconds after its first event, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        delay: float = DEBOUNCE_DELAY,
+        max_delay: float = DEBOUNCE_MAX_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.delay = delay
+        self.max_delay = max_delay
+        self._clock = clock
+        self._pending: set[Path] = set()
+        self._first = self._last = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, paths: Iterable[Path]) -> None:
+        """Record changed paths; repeated paths still count as activity."""
+        changed = set(paths)
+        if not changed:
+            return
+
+        now = self._clock()
+        if not self._pending:
+            self._first = now
+        self._last = now
+        self._pending |= changed
+
+    def timeout(self) -> float | None:
+        """Get the seconds until the pending batch is due, or None if idle."""
+        if not self._pending:
+            return None
+        due = min(self._last + self.delay, self._first + self.max_delay)
+        return max(0.0, due - self._clock())
+
+    def ready(self) -> bool:
+        """Check if the pending batch should be applied now."""
+        return self.timeout() == 0.0
+
+    def drain(self) -> set[Path]:
+        """Take the pending batch."""
+        paths, self._pending = self._pending, set()
+        return paths
+
+
+class PollingBackend:
+    """Portable change detection by comparing (mtime, size) snapshots."""
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL) -> None:
+        self.root = root
+        self.interval = interval
+        self._scanner = Scanner(root)
+        self._snapshot = self._scan()
+        self._next = time.monotonic() + interval
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        return {rel: (st.st_mtime_ns, st.st_size) for rel, st in self._scanner.walk()}
+
+    def read(self, timeout: float | None) -> list[Path]:
+        """Wait up to timeout seconds, returning paths changed since the last scan."""
+        wait = self._next - time.monotonic()
+        if timeout is not None and timeout < wait:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next = time.monotonic() + self.interval
+
+        old, new = self._snapshot, self._scan()
+        self._snapshot = new
+        changed = [rel for rel, stamp in new.items() if old.get(rel) != stamp]
+        changed.extend(rel for rel in old.keys() - new.keys())
+        return [self.root / rel for rel in changed]
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyBackend:
+    """
+    Linux change detection with inotify, called through ctypes.
+
+    Every directory that `Scanner.walk` visits gets a watch; watches follow
+    directories as they are created, moved and deleted. Only notes and
+    directories are reported. A queue overflow reports the vault root, which
+    makes the index refresh everything.
+    """
+
+    def __init__(self, root: Path) -> None:
+        import ctypes
+
+        self.root = root
+        self._scanner = Scanner(root)
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        try:
+            init = self._libc.inotify_init1
+        except AttributeError:
+            raise OSError("inotify is not available") from None
+
+        self._fd = init(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1: {os.strerror(err)}")
+
+        self._get_errno = ctypes.get_errno
+        self._dirs: dict[int, Path] = {}
+        self._watches: dict[Path, int] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _watch_tree(self, top: Path) -> None:
+        """Watch a directory and every directory below it."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            rel = directory.relative_to(self.root).as_posix()
+            if directory != self.root and self._scanner.ignores(rel):
+                continue
+            if not self._watch(directory):
+                continue
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+            except OSError:
+                continue
+
+    def _watch(self, directory: Path) -> bool:
+        """Add a watch, returning False if the directory is gone."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = self._get_errno()
+            if err == errno.ENOSPC:  # fs.inotify.max_user_watches reached
+                raise OSError(
+                    err,
+                    "Too many directories to watch; raise "
+                    "fs.inotify.max_user_watches or use --poll",
+                )
+            return False
+        self._dirs[wd] = directory
+        self._watches[directory] = wd
+        return True
+
+    def _unwatch_tree(self, top: Path) -> None:
+        """Drop the watches on a directory that moved away, and below it."""
+        for directory in [d for d in self._watches if d.is_relative_to(top)]:
+            wd = self._watches.pop(directory)
+            self._dirs.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read(self, timeout: float | None) -> list[Path]:
+        """Wait up to timeout seconds for events, returning the changed paths."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+
+        changed = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            changed.extend(self._parse(data))
+        return changed
+
+    def _parse(self, data: bytes) -> Iterable[Path]:
+        """Translate raw inotify events into changed paths."""
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                yield self.root
+                continue
+            if mask & _IN_IGNORED:
+                directory = self._dirs.pop(wd, None)
+                if directory is not None and self._watches.get(directory) == wd:
+                    del self._watches[directory]
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name or name.startswith("."):
+                continue
+
+            path = directory / name
+            if mask & _IN_ISDIR:
+                if mask & _IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_tree(path)
+                yield path
+            elif name.endswith(NOTE_SUFFIX):
+                yield path
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def open_backend(
+    root: Path, poll: bool = False, interval: float = POLL_INTERVAL
+) -> InotifyBackend | PollingBackend:
+    """
+    Start watching the vault with the best available backend.
+
+    Args:
+        root: The vault root.
+        poll: If True, always poll instead of using inotify.
+        interval: Polling interval in seconds.
+    """
+    if not poll and sys.platform == "linux":
+        try:
+            return InotifyBackend(root)
+        except OSError as e:
+            output.warning(f"Falling back to polling: {e}")
+    return PollingBackend(root, interval)
+
+
+class Watcher:
+    """
+    Keep the vault index in sync with the filesystem.
+
+    Opens its own index connection in whichever thread runs it, does one
+    refresh to catch up on changes made while nothing was watching, then
+    applies each debounced batch of changes incrementally.
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        poll: bool = False,
+        interval: float = POLL_INTERVAL,
+        debouncer: Debouncer | None = None,
+        on_update: Callable[[RefreshStats], None] | None = None,
+        backend: InotifyBackend | PollingBackend | None = None,
+    ) -> None:
+        self.config = config
+        self.poll = poll
+        self.interval = interval
+        self.debouncer = debouncer if debouncer is not None else Debouncer()
+        self.on_update = on_update
+        self._backend = backend
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run(self) -> None:
+        """Watch until `stop` is called (or the process is interrupted)."""
+        root = self.config.paths.root
+        backend = self._backend or open_backend(root, self.poll, self.interval)
+        try:
+            # Watches are in place before the catch-up refresh, so nothing
+            # changed in between is missed
+            with VaultIndex.open(self.config) as vault_index:
+                self._report(vault_index.refresh())
+                while not self._stop.is_set():
+                    timeout = self.debouncer.timeout()
+                    timeout = _READ_TIMEOUT if timeout is None else timeout
+                    self.debouncer.add(backend.read(min(timeout, _READ_TIMEOUT)))
+                    if self.debouncer.ready():
+                        paths = self.debouncer.drain()
+                        self._report(vault_index.apply_changes(paths))
+        finally:
+            backend.close()
+
+    def _report(self, stats: RefreshStats) -> None:
+        if self.on_update is not None and stats.changed:
+            self.on_update(stats)
+
+    def start(self) -> threading.Thread:
+        """Run the watcher in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="zk-watch", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        """Stop the watcher, waiting for a background thread to finish."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def watch(
+    config: Config,
+    poll: bool = False,
+    interval: float = POLL_INTERVAL,
+    on_update: Callable[[RefreshStats], None] | None = None,
+) -> None:
+    """
+    Watch the vault in the foreground until interrupted.
+
+    Args:
+        config: The configuration.
+        poll: If True, poll for changes instead of using inotify.
+        interval: Polling interval in seconds.
+        on_update: Called with the statistics of every batch that changed
+            the index.
+    """
+    # Treat `kill` like Ctrl-C so the index connection is closed cleanly
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    watcher = Watcher(config, poll=poll, interval=interval, on_update=on_update)
+    with suppress(KeyboardInterrupt):
+        watcher.run()